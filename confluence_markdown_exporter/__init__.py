@@ -1,9 +1,15 @@
 """Confluence Markdown Exporter package."""
 
-try:
-    from importlib.metadata import version
 
-    __version__ = version("confluence-markdown-exporter")
-except Exception:  # noqa: BLE001
-    # fallback if package not installed or metadata not available
-    __version__ = "unknown"
+def __getattr__(name: str) -> str:
+    # Resolve the version lazily, importlib.metadata is slow to import and rarely needed.
+    if name == "__version__":
+        try:
+            from importlib.metadata import version
+
+            return version("confluence-markdown-exporter")
+        except Exception:  # noqa: BLE001
+            # fallback if package not installed or metadata not available
+            return "unknown"
+    msg = f"module {__name__!r} has no attribute {name!r}"
+    raise AttributeError(msg)
@@ -1,24 +1,37 @@
+import hashlib
+import json
 import logging
 import os
+import time
+from collections.abc import Callable
 from functools import lru_cache
 from typing import Any
 
-import questionary
 import requests
 from atlassian import Confluence as ConfluenceApiSdk
 from atlassian import Jira as JiraApiSdk
-from questionary import Style
 
+from confluence_markdown_exporter.http_metrics import http_metrics
+from confluence_markdown_exporter.transport import TRANSPORT_OPTIONS
+from confluence_markdown_exporter.transport import HttpTransport
+from confluence_markdown_exporter.transport import get_transport
+from confluence_markdown_exporter.utils.app_data_store import APP_CONFIG_PATH
 from confluence_markdown_exporter.utils.app_data_store import ApiDetails
+from confluence_markdown_exporter.utils.app_data_store import ConnectionConfig
 from confluence_markdown_exporter.utils.app_data_store import get_settings
 from confluence_markdown_exporter.utils.app_data_store import set_setting
-from confluence_markdown_exporter.utils.config_interactive import main_config_menu_loop
+from confluence_markdown_exporter.utils.single_flight import single_flight
 from confluence_markdown_exporter.utils.type_converter import str_to_bool
 
 DEBUG: bool = str_to_bool(os.getenv("DEBUG", "False"))
 
 logger = logging.getLogger(__name__)
 
+PROBE_RECORD_PATH = APP_CONFIG_PATH.parent / "connection_probes.json"
+
+# Connection options handled by the exporter itself rather than passed to the SDK clients
+FACTORY_OPTIONS = frozenset({"probe_ttl_seconds", "max_concurrent_requests"}) | TRANSPORT_OPTIONS
+
 
 def response_hook(
     response: requests.Response, *_args: object, **_kwargs: object
@@ -32,11 +45,67 @@ def response_hook(
     return response
 
 
+def probe_key(service: str, auth: ApiDetails) -> str:
+    """Build a stable key for an auth scope without storing any secret in clear text."""
+    scope = "\n".join(
+        [
+            service,
+            str(auth.url),
+            auth.username.get_secret_value(),
+            auth.api_token.get_secret_value(),
+            auth.pat.get_secret_value(),
+        ]
+    )
+    return hashlib.sha256(scope.encode()).hexdigest()
+
+
+def _load_probe_records() -> dict[str, float]:
+    try:
+        records = json.loads(PROBE_RECORD_PATH.read_text())
+    except (OSError, ValueError):
+        return {}
+    return records if isinstance(records, dict) else {}
+
+
+def is_probe_fresh(key: str, ttl_seconds: int) -> bool:
+    """Check whether the auth scope was successfully probed within the last ttl_seconds."""
+    if ttl_seconds <= 0:
+        return False
+    last_success = _load_probe_records().get(key)
+    return isinstance(last_success, int | float) and time.time() - last_success < ttl_seconds
+
+
+def record_probe(key: str) -> None:
+    """Record a successful connection probe for the given auth scope."""
+    records = _load_probe_records()
+    records[key] = time.time()
+    tmp_path = PROBE_RECORD_PATH.with_suffix(".tmp")
+    try:
+        tmp_path.write_text(json.dumps(records, indent=2))
+        tmp_path.replace(PROBE_RECORD_PATH)
+    except OSError:
+        logger.debug("Could not write connection probe record.", exc_info=True)
+
+
 class ApiClientFactory:
-    """Factory for creating authenticated Confluence and Jira API clients with retry config."""
+    """Factory for creating authenticated Confluence and Jira API clients with retry config.
 
-    def __init__(self, connection_config: dict[str, Any]) -> None:
+    All clients created from the same connection config share one `HttpTransport`.
+    """
+
+    def __init__(
+        self, connection_config: dict[str, Any], transport: HttpTransport | None = None
+    ) -> None:
         self.connection_config = connection_config
+        self.transport = transport or get_transport(ConnectionConfig(**connection_config))
+
+    @property
+    def sdk_options(self) -> dict[str, Any]:
+        return {k: v for k, v in self.connection_config.items() if k not in FACTORY_OPTIONS}
+
+    @property
+    def probe_ttl_seconds(self) -> int:
+        return int(self.connection_config.get("probe_ttl_seconds", 0))
 
     def create_confluence(self, auth: ApiDetails) -> ConfluenceApiSdk:
         try:
@@ -45,9 +114,11 @@ class ApiClientFactory:
                 username=auth.username.get_secret_value() if auth.api_token else None,
                 password=auth.api_token.get_secret_value() if auth.api_token else None,
                 token=auth.pat.get_secret_value() if auth.pat else None,
-                **self.connection_config,
+                **self.sdk_options,
             )
-            instance.get_all_spaces(limit=1)
+            self.transport.mount(instance._session)
+            instance._session.hooks["response"].append(http_metrics.response_hook("confluence"))
+            self._probe("confluence", auth, lambda: instance.get("rest/api/user/current"))
         except Exception as e:
             msg = f"Confluence connection failed: {e}"
             raise ConnectionError(msg) from e
@@ -60,17 +131,37 @@ class ApiClientFactory:
                 username=auth.username.get_secret_value() if auth.api_token else None,
                 password=auth.api_token.get_secret_value() if auth.api_token else None,
                 token=auth.pat.get_secret_value() if auth.pat else None,
-                **self.connection_config,
+                **self.sdk_options,
             )
-            instance.get_all_projects()
+            self.transport.mount(instance._session)
+            instance._session.hooks["response"].append(http_metrics.response_hook("jira"))
+            self._probe("jira", auth, instance.myself)
         except Exception as e:
             msg = f"Jira connection failed: {e}"
             raise ConnectionError(msg) from e
         return instance
 
+    def _probe(self, service: str, auth: ApiDetails, probe: Callable[[], object]) -> None:
+        """Validate the credentials via a cheap identity endpoint.
+
+        The probe is skipped if the same auth scope was probed successfully within
+        `probe_ttl_seconds`.
+        """
+        key = probe_key(service, auth)
+        if is_probe_fresh(key, self.probe_ttl_seconds):
+            return
+        probe()
+        if self.probe_ttl_seconds > 0:
+            record_probe(key)
 
+
+@lru_cache(maxsize=1)
+@single_flight
 def get_confluence_instance() -> ConfluenceApiSdk:
-    """Get authenticated Confluence API client using current settings."""
+    """Get authenticated Confluence API client using current settings.
+
+    The client is created on first use and cached for the rest of the process.
+    """
     settings = get_settings()
     auth = settings.auth
     connection_config = settings.connection_config.model_dump()
@@ -80,6 +171,11 @@ def get_confluence_instance() -> ConfluenceApiSdk:
             confluence = ApiClientFactory(connection_config).create_confluence(auth.confluence)
             break
         except ConnectionError:
+            # The interactive menu is only needed to recover from a failed connection
+            import questionary
+
+            from confluence_markdown_exporter.utils.config_interactive import main_config_menu_loop
+
             questionary.print(
                 "Confluence connection failed: Redirecting to Confluence authentication config...",
                 style="fg:red bold",
@@ -89,12 +185,13 @@ def get_confluence_instance() -> ConfluenceApiSdk:
             auth = settings.auth
 
     if DEBUG:
-        confluence.session.hooks["response"] = [response_hook]
+        confluence.session.hooks["response"].append(response_hook)
 
     return confluence
 
 
 @lru_cache(maxsize=1)
+@single_flight
 def get_jira_instance() -> JiraApiSdk:
     """Get authenticated Jira API client using current settings with required authentication."""
     settings = get_settings()
@@ -106,6 +203,11 @@ def get_jira_instance() -> JiraApiSdk:
             jira = ApiClientFactory(connection_config).create_jira(auth.jira)
             break
         except ConnectionError:
+            import questionary
+            from questionary import Style
+
+            from confluence_markdown_exporter.utils.config_interactive import main_config_menu_loop
+
             # Ask if user wants to use Confluence credentials for Jira
             use_confluence = questionary.confirm(
                 "Jira connection failed. Use the same authentication as for Confluence?",
@@ -127,6 +229,6 @@ def get_jira_instance() -> JiraApiSdk:
             auth = settings.auth
 
     if DEBUG:
-        jira.session.hooks["response"] = [response_hook]
+        jira.session.hooks["response"].append(response_hook)
 
     return jira
@@ -3,23 +3,35 @@
 https://developer.atlassian.com/cloud/confluence/rest/v1/intro
 """
 
+import asyncio
 import functools
 import logging
 import mimetypes
 import os
 import re
+import threading
 import urllib.parse
+from collections.abc import Awaitable
+from collections.abc import Callable
+from collections.abc import Generator
+from collections.abc import Iterable
+from collections.abc import Iterator
 from collections.abc import Set
+from collections.abc import Sized
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
 from os import PathLike
 from pathlib import Path
 from string import Template
+from typing import Any
 from typing import Literal
 from typing import TypeAlias
+from typing import TypeVar
 from typing import cast
 from urllib.parse import unquote
 from urllib.parse import urlparse
 
-import yaml
 from atlassian.errors import ApiError
 from atlassian.errors import ApiNotFoundError
 from bs4 import BeautifulSoup
@@ -27,30 +39,42 @@ from bs4 import Tag
 from markdownify import ATX
 from markdownify import MarkdownConverter
 from pydantic import BaseModel
+from pydantic import PrivateAttr
 from requests import HTTPError
 from tqdm import tqdm
 
 from confluence_markdown_exporter.api_clients import get_confluence_instance
 from confluence_markdown_exporter.api_clients import get_jira_instance
+from confluence_markdown_exporter.fetch_engine import FetchEngine
+from confluence_markdown_exporter.manifest import ExportManifest
+from confluence_markdown_exporter.manifest import ManifestAttachment
+from confluence_markdown_exporter.manifest import load_manifest
+from confluence_markdown_exporter.space_index import SpaceIndexer
+from confluence_markdown_exporter.space_index import attachments_indexed
+from confluence_markdown_exporter.space_index import find_indexed_attachments
+from confluence_markdown_exporter.space_index import find_indexed_page
+from confluence_markdown_exporter.space_index import load_attachment_index
 from confluence_markdown_exporter.utils.app_data_store import get_settings
 from confluence_markdown_exporter.utils.app_data_store import set_setting
 from confluence_markdown_exporter.utils.drawio_converter import load_and_parse_drawio
 from confluence_markdown_exporter.utils.export import sanitize_filename
 from confluence_markdown_exporter.utils.export import sanitize_key
 from confluence_markdown_exporter.utils.export import save_file
+from confluence_markdown_exporter.utils.interrupt import graceful_interrupt
+from confluence_markdown_exporter.utils.interrupt import stop_requested
+from confluence_markdown_exporter.utils.single_flight import single_flight
+from confluence_markdown_exporter.utils.sized_cache import SizedCache
 from confluence_markdown_exporter.utils.table_converter import TableConverter
 from confluence_markdown_exporter.utils.type_converter import str_to_bool
 
 JsonResponse: TypeAlias = dict
 StrPath: TypeAlias = str | PathLike[str]
+T = TypeVar("T")
 
 DEBUG: bool = str_to_bool(os.getenv("DEBUG", "False"))
 
 logger = logging.getLogger(__name__)
 
-settings = get_settings()
-confluence = get_confluence_instance()
-
 
 class JiraIssue(BaseModel):
     key: str
@@ -70,6 +94,7 @@ class JiraIssue(BaseModel):
 
     @classmethod
     @functools.lru_cache(maxsize=100)
+    @single_flight
     def from_key(cls, issue_key: str) -> "JiraIssue":
         issue_data = cast("JsonResponse", get_jira_instance().get_issue(issue_key))
         return cls.from_json(issue_data)
@@ -94,21 +119,26 @@ class User(BaseModel):
 
     @classmethod
     @functools.lru_cache(maxsize=100)
+    @single_flight
     def from_username(cls, username: str) -> "User":
         return cls.from_json(
-            cast("JsonResponse", confluence.get_user_details_by_username(username))
+            cast("JsonResponse", get_confluence_instance().get_user_details_by_username(username))
         )
 
     @classmethod
     @functools.lru_cache(maxsize=100)
+    @single_flight
     def from_userkey(cls, userkey: str) -> "User":
-        return cls.from_json(cast("JsonResponse", confluence.get_user_details_by_userkey(userkey)))
+        return cls.from_json(
+            cast("JsonResponse", get_confluence_instance().get_user_details_by_userkey(userkey))
+        )
 
     @classmethod
     @functools.lru_cache(maxsize=100)
+    @single_flight
     def from_accountid(cls, accountid: str) -> "User":
         return cls.from_json(
-            cast("JsonResponse", confluence.get_user_details_by_accountid(accountid))
+            cast("JsonResponse", get_confluence_instance().get_user_details_by_accountid(accountid))
         )
 
 
@@ -132,11 +162,51 @@ class Organization(BaseModel):
     spaces: list["Space"]
 
     @property
-    def pages(self) -> list[int]:
-        return [page for space in self.spaces for page in space.pages]
+    def pages(self) -> "PageListing":
+        return PageListing(spaces=[space.key for space in self.spaces])
 
     def export(self) -> None:
-        export_pages(self.pages)
+        with graceful_interrupt():
+            asyncio.run(self.export_async())
+
+    async def export_async(self) -> None:
+        """Export the spaces, up to `export.concurrent_spaces` of them at the same time.
+
+        All spaces share one budget of `connection_config.max_concurrent_requests` API
+        calls. Every space in progress has its own progress bar.
+        """
+        # Create the client up front so a failed connection is handled before any worker starts
+        get_confluence_instance()
+        settings = get_settings()
+        # Lines of the progress bars of the spaces in progress, below the overall bar
+        positions: asyncio.Queue[int] = asyncio.Queue()
+        for position in range(1, settings.export.concurrent_spaces + 1):
+            positions.put_nowait(position)
+
+        with tqdm(total=len(self.spaces), desc="Spaces", position=0) as pbar:
+
+            async def export_space(space: Space) -> None:
+                if stop_requested():
+                    return
+                position = await positions.get()
+                try:
+                    await engine.run(space.load_indexes)
+                    await export_pages_async(
+                        space.pages, engine, description=space.key, position=position
+                    )
+                finally:
+                    positions.put_nowait(position)
+                    pbar.update()
+
+            async with FetchEngine(settings.connection_config.max_concurrent_requests) as engine:
+                results = await asyncio.gather(
+                    *(export_space(space) for space in self.spaces), return_exceptions=True
+                )
+
+        for space, result in zip(self.spaces, results, strict=True):
+            if isinstance(result, BaseException):
+                logger.error(f"Export of space {space.key} failed: {result}")
+        _raise_first_error(results)
 
     @classmethod
     def from_json(cls, data: JsonResponse) -> "Organization":
@@ -146,15 +216,28 @@ class Organization(BaseModel):
 
     @classmethod
     @functools.lru_cache(maxsize=100)
+    @single_flight
     def from_api(cls) -> "Organization":
-        return cls.from_json(
-            cast(
+        """List all current global spaces, following the pagination."""
+        spaces = []
+        start = 0
+        while True:
+            response = cast(
                 "JsonResponse",
-                confluence.get_all_spaces(
-                    space_type="global", space_status="current", expand="homepage"
+                get_confluence_instance().get_all_spaces(
+                    start=start,
+                    limit=100,
+                    space_type="global",
+                    space_status="current",
+                    expand="homepage",
                 ),
             )
-        )
+            results = response.get("results", [])
+            spaces.extend(results)
+            if not results or not response.get("_links", {}).get("next"):
+                break
+            start += len(results)
+        return cls.from_json({"results": spaces})
 
 
 class Space(BaseModel):
@@ -164,13 +247,21 @@ class Space(BaseModel):
     homepage: int
 
     @property
-    def pages(self) -> list[int]:
-        homepage = Page.from_id(self.homepage)
-        return [self.homepage, *homepage.descendants]
+    def pages(self) -> "PageListing":
+        return PageListing(spaces=[self.key])
 
     def export(self) -> None:
+        self.load_indexes()
         export_pages(self.pages)
 
+    def load_indexes(self) -> None:
+        """Index the attachments of the space up front if configured.
+
+        The page tree of the space is indexed while its pages are listed, see `pages`.
+        """
+        if get_settings().export.attachment_listing == "space":
+            load_attachment_index(self.key)
+
     @classmethod
     def from_json(cls, data: JsonResponse) -> "Space":
         return cls(
@@ -182,9 +273,10 @@ class Space(BaseModel):
 
     @classmethod
     @functools.lru_cache(maxsize=100)
+    @single_flight
     def from_key(cls, space_key: str) -> "Space":
         return cls.from_json(
-            cast("JsonResponse", confluence.get_space(space_key, expand="homepage"))
+            cast("JsonResponse", get_confluence_instance().get_space(space_key, expand="homepage"))
         )
 
 
@@ -213,10 +305,10 @@ class Document(BaseModel):
             "space_key": sanitize_filename(self.space.key),
             "space_name": sanitize_filename(self.space.name),
             "homepage_id": str(self.space.homepage),
-            "homepage_title": sanitize_filename(Page.from_id(self.space.homepage).title),
+            "homepage_title": sanitize_filename(PageStub.from_id(self.space.homepage).title),
             "ancestor_ids": "/".join(str(a) for a in self.ancestors),
             "ancestor_titles": "/".join(
-                sanitize_filename(Page.from_id(a).title) for a in self.ancestors
+                sanitize_filename(PageStub.from_id(a).title) for a in self.ancestors
             ),
         }
 
@@ -246,9 +338,9 @@ class Attachment(Document):
         return f"{self.file_id}{self.extension}"
 
     @property
-    def _template_vars(self) -> dict[str, str]:
+    def path_vars(self) -> dict[str, str]:
+        """Template variables of the attachment itself, without those of its page."""
         return {
-            **super()._template_vars,
             "attachment_id": str(self.id),
             "attachment_title": sanitize_filename(self.title),
             # file_id is a GUID and does not need sanitized.
@@ -256,11 +348,43 @@ class Attachment(Document):
             "attachment_extension": self.extension,
         }
 
+    @property
+    def _template_vars(self) -> dict[str, str]:
+        return {**super()._template_vars, **self.path_vars}
+
     @property
     def export_path(self) -> Path:
-        filepath_template = Template(settings.export.attachment_path.replace("{", "${"))
+        filepath_template = Template(get_settings().export.attachment_path.replace("{", "${"))
         return Path(filepath_template.safe_substitute(self._template_vars))
 
+    @staticmethod
+    def container_ancestors(container: JsonResponse) -> list[int]:
+        """Get the ancestors of an attachment from its page, expanded with `ancestors`.
+
+        Like pages, attachments skip the top-level ancestor, but they include their page.
+        """
+        return [
+            *[int(ancestor["id"]) for ancestor in container.get("ancestors", [])],
+            int(container["id"]),
+        ][1:]
+
+    @staticmethod
+    def export_path_below(container: JsonResponse, path_vars: dict[str, str]) -> Path:
+        """Compute the export path of an attachment of a page from its `path_vars`.
+
+        Args:
+            container: Content result of the page, expanded with `ancestors`.
+            path_vars: Template variables of the attachment itself, see `path_vars`.
+        """
+        page = PageStub.from_json(container)
+        document = Document(
+            title=page.title,
+            space=page.space,
+            ancestors=Attachment.container_ancestors(container),
+        )
+        filepath_template = Template(get_settings().export.attachment_path.replace("{", "${"))
+        return Path(filepath_template.safe_substitute({**document._template_vars, **path_vars}))
+
     @classmethod
     def from_json(cls, data: JsonResponse) -> "Attachment":
         extensions = data.get("extensions", {})
@@ -276,13 +400,34 @@ class Attachment(Document):
             collection_name=extensions.get("collectionName", ""),
             download_link=data.get("_links", {}).get("download", ""),
             comment=extensions.get("comment", ""),
-            ancestors=[
-                *[ancestor.get("id") for ancestor in container.get("ancestors", [])],
-                container.get("id"),
-            ][1:],
+            ancestors=cls.container_ancestors(container) if "id" in container else [],
             version=Version.from_json(data.get("version", {})),
         )
 
+    @classmethod
+    def from_listing(
+        cls, results: list[JsonResponse], container: JsonResponse
+    ) -> list["Attachment"]:
+        """Build attachments of a listing that did not expand their container or space.
+
+        Args:
+            results: Attachment results of the listing.
+            container: The page the attachments belong to, used where results lack it.
+        """
+        return [
+            cls.from_json(
+                {
+                    "container": container,
+                    **result,
+                    "_expandable": {
+                        **container.get("_expandable", {}),
+                        **result.get("_expandable", {}),
+                    },
+                }
+            )
+            for result in results
+        ]
+
     @classmethod
     def from_page_id(cls, page_id: int) -> list["Attachment"]:
         attachments = []
@@ -293,7 +438,7 @@ class Attachment(Document):
         while size >= paging_limit:
             response = cast(
                 "JsonResponse",
-                confluence.get_attachments_from_content(
+                get_confluence_instance().get_attachments_from_content(
                     page_id,
                     start=start,
                     limit=paging_limit,
@@ -309,11 +454,12 @@ class Attachment(Document):
         return attachments
 
     def export(self) -> None:
-        filepath = settings.export.output_path / self.export_path
+        filepath = get_settings().export.output_path / self.export_path
         if filepath.exists():
             return
 
         try:
+            confluence = get_confluence_instance()
             response = confluence._session.get(str(confluence.url + self.download_link))
             response.raise_for_status()  # Raise error if request fails
         except HTTPError:
@@ -326,47 +472,14 @@ class Attachment(Document):
         )
 
 
-class Page(Document):
-    id: int
-    body: str
-    body_export: str
-    editor2: str
-    labels: list["Label"]
-    attachments: list["Attachment"]
+class PageStub(Document):
+    """Title and position of a page, enough to compute its export path and links.
 
-    @property
-    def descendants(self) -> list[int]:
-        url = "rest/api/content/search"
-        params = {
-            "cql": f"type=page AND ancestor={self.id}",
-            "limit": 100,
-        }
-        results = []
-
-        try:
-            response = confluence.get(url, params=params)
-            results.extend(response.get("results", []))
-            next_path = response.get("_links").get("next")
-
-            while next_path:
-                response = confluence.get(next_path)
-                results.extend(response.get("results", []))
-                next_path = response.get("_links").get("next")
-
-        except HTTPError as e:
-            if e.response.status_code == 404:  # noqa: PLR2004
-                logger.warning(
-                    f"Content with ID {self.id} not found (404) when fetching descendants."
-                )
-                return []
-            return []
-        except Exception:
-            logger.exception(
-                f"Unexpected error when fetching descendants for content ID {self.id}."
-            )
-            return []
+    Fetching a stub is a single request without bodies, labels or attachments, use
+    `Page` only for pages that are exported.
+    """
 
-        return [result["id"] for result in results]
+    id: int
 
     @property
     def _template_vars(self) -> dict[str, str]:
@@ -384,17 +497,170 @@ class Page(Document):
     # fix relative path
     @property
     def export_path(self) -> Path:
-        filepath_template = Template(settings.export.page_path.replace("{", "${"))
-        
+        filepath_template = Template(get_settings().export.page_path.replace("{", "${"))
+
         raw_path = Path(filepath_template.safe_substitute(self._template_vars))
-      
+
         if raw_path.is_absolute():
             return Path(*raw_path.parts[1:])
         return raw_path
 
+    @classmethod
+    def from_json(cls, data: JsonResponse) -> "PageStub":
+        return cls(
+            id=data.get("id", 0),
+            title=data.get("title", ""),
+            space=Space.from_key(data.get("_expandable", {}).get("space", "").split("/")[-1]),
+            ancestors=[ancestor.get("id") for ancestor in data.get("ancestors", [])][1:],
+        )
+
+    @property
+    def approximate_size(self) -> int:
+        """Rough number of bytes the page takes in memory."""
+        return 512 + len(self.title) + 8 * len(self.ancestors)
+
+    @classmethod
+    def from_id(cls, page_id: int) -> "PageStub":
+        """Get a page stub, or the full page if that is cached already."""
+        if (page := page_cache.get(page_id, PageStub)) is None:
+            page = cls._fetch(page_id)
+            page_cache.put(page_id, page)
+        return page
+
+    @classmethod
+    @single_flight
+    def _fetch(cls, page_id: int) -> "PageStub":
+        if found := find_indexed_page(page_id):
+            index, indexed_page = found
+            return cls(
+                id=page_id,
+                title=indexed_page.title,
+                space=Space.from_key(index.space_key),
+                ancestors=index.ancestors(page_id)[1:],
+            )
+        try:
+            return cls.from_json(
+                cast(
+                    "JsonResponse",
+                    get_confluence_instance().get_page_by_id(page_id, expand="ancestors"),
+                )
+            )
+        except (ApiError, HTTPError):
+            logger.warning(f"Could not access page with ID {page_id}")
+            return cls(
+                id=page_id,
+                title="Page not accessible",
+                space=Space(key="", name="", description="", homepage=0),
+                ancestors=[],
+            )
+
+
+# Markup of attachment links, embedded files and macros that render attachments
+_ATTACHMENT_REFERENCE = re.compile(
+    r'data-linked-resource-type="attachment"|data-media-id|/download/(?:attachments|thumbnails)/'
+    r'|diagramName=|data-macro-name="(?:attachments|drawio)"'
+)
+
+
+# Markup in the view representation that is converted with the help of another representation
+_REPRESENTATION_MARKERS = {
+    "export_view": re.compile(
+        r'data-macro-name="(?:jira|toc|drawio)"|metadata-summary-macro|\.drawio'
+    ),
+    "editor2": re.compile(r"createpage\.action|createlink"),
+}
+
+
+# Expansions of a page that is exported, including the first page of its attachments
+PAGE_EXPAND = "body.view,metadata.labels,ancestors,version,children.attachment.version"
+
+
+def page_expand(page_ids: Iterable[int]) -> str:
+    """Get the expansions of the given exported pages.
+
+    Attachments are not expanded if the attachments of all pages are taken from the
+    attachment index of their space, see `export.attachment_listing`. Pages of spaces
+    without a loaded attachment index keep the attachments embedded in the page.
+    """
+    if all(attachments_indexed(page_id) for page_id in page_ids):
+        return PAGE_EXPAND.replace(",children.attachment.version", "")
+    return PAGE_EXPAND
+
+
+class Page(PageStub):
+    body: str
+    labels: list["Label"]
+    version: Version | None = None
+    _attachments: list["Attachment"] | None = PrivateAttr(default=None)
+    _representations: dict[str, str] = PrivateAttr(default_factory=dict)
+
+    @property
+    def body_export(self) -> str:
+        return self._representation("export_view")
+
+    @property
+    def editor2(self) -> str:
+        return self._representation("editor2")
+
+    def _representation(self, name: str) -> str:
+        """Get a body representation other than the view, fetching it on first access.
+
+        Representations that the view needs as well are fetched in the same request.
+        """
+        if name not in self._representations:
+            missing = [
+                other
+                for other, marker in _REPRESENTATION_MARKERS.items()
+                if other not in self._representations
+                and (other == name or marker.search(self.body))
+            ]
+            try:
+                data = cast(
+                    "JsonResponse",
+                    get_confluence_instance().get_page_by_id(
+                        self.id, expand=",".join(f"body.{other}" for other in missing)
+                    ),
+                )
+            except (ApiError, HTTPError):
+                logger.warning(f"Could not fetch the {name} representation of page {self.id}")
+                data = {}
+            for other in missing:
+                self._representations[other] = data.get("body", {}).get(other, {}).get("value", "")
+        return self._representations[name]
+
+    @property
+    def attachments(self) -> list["Attachment"]:
+        """Attachments of the page, listed on first access.
+
+        The listing is skipped if only referenced attachments are exported and the
+        page body does not reference any. Attachments of spaces with an attachment index,
+        see `export.attachment_listing`, are taken from the index.
+        """
+        if self._attachments is None:
+            if not (get_settings().export.attachment_export_all or self.references_attachments):
+                self._attachments = []
+            elif (indexed := find_indexed_attachments(self.space.key, self.id)) is not None:
+                container = {
+                    "id": self.id,
+                    "_expandable": {"space": f"/rest/api/space/{self.space.key}"},
+                }
+                self._attachments = Attachment.from_listing(indexed, container)
+            else:
+                self._attachments = Attachment.from_page_id(self.id)
+        return self._attachments
+
+    @property
+    def references_attachments(self) -> bool:
+        return _ATTACHMENT_REFERENCE.search(self.body) is not None
+
+    @property
+    def descendants(self) -> "PageListing":
+        """IDs of all pages below this page, listed while they are iterated."""
+        return PageListing(roots=[self.id])
+
     @property
     def html(self) -> str:
-        if settings.export.include_document_title:
+        if get_settings().export.include_document_title:
             return f"<h1>{self.title}</h1>{self.body}"
         return self.body
 
@@ -412,59 +678,88 @@ class Page(Document):
         # Export attachments first so the files can be utilized during markdown conversion
         self.export_attachments()
         self.export_markdown()
+        self.release()
+        load_manifest(get_settings().export.output_path).save()
 
     def export_with_descendants(self) -> None:
-        export_pages([self.id, *self.descendants])
+        export_pages(PageListing([self.id], roots=[self.id]))
 
     def export_body(self) -> None:
         soup = BeautifulSoup(self.html, "html.parser")
         save_file(
-            settings.export.output_path
+            get_settings().export.output_path
             / self.export_path.parent
             / f"{self.export_path.stem}_body_view.html",
             str(soup.prettify()),
         )
         soup = BeautifulSoup(self.body_export, "html.parser")
         save_file(
-            settings.export.output_path
+            get_settings().export.output_path
             / self.export_path.parent
             / f"{self.export_path.stem}_body_export_view.html",
             str(soup.prettify()),
         )
         save_file(
-            settings.export.output_path
+            get_settings().export.output_path
             / self.export_path.parent
             / f"{self.export_path.stem}_body_editor2.xml",
             str(self.editor2),
         )
 
     def export_markdown(self) -> None:
-        save_file(
-            settings.export.output_path / self.export_path,
-            self.markdown,
+        """Write the Markdown file and record it in the manifest of the output path.
+
+        A file that the manifest records with the same content is not written again.
+        """
+        output_path = get_settings().export.output_path
+        manifest = load_manifest(output_path)
+        markdown = self.markdown
+        if not manifest.is_written(self.id, self.export_path, markdown):
+            save_file(output_path / self.export_path, markdown)
+        manifest.record(
+            self.id,
+            self.version.number if self.version else 0,
+            self.export_path,
+            markdown,
+            [
+                ManifestAttachment(
+                    export_path=attachment.export_path.as_posix(),
+                    template_vars=attachment.path_vars,
+                )
+                for attachment in self.attachments_to_export()
+            ],
         )
 
     def export_attachments(self) -> None:
-        if settings.export.attachment_export_all:
-            for attachment in self.attachments:
-                attachment.export()
-        else:
-            for attachment in self.attachments:
-                if (
-                    attachment.filename.endswith(".drawio")
-                    and f"diagramName={attachment.title}" in self.body
-                ):
-                    attachment.export()
-                    continue
-                if (
-                    attachment.filename.endswith(".drawio.png")
-                    or attachment.filename.endswith(".drawio")
-                ) and attachment.title.replace(" ", "%20") in self.body_export:
-                    attachment.export()
-                    continue
-                if attachment.file_id in self.body:
-                    attachment.export()
-                    continue
+        for attachment in self.attachments_to_export():
+            attachment.export()
+
+    def attachments_to_export(self) -> list[Attachment]:
+        """Select the attachments that are exported along with the page.
+
+        Unless all attachments are exported, only those referenced in the page body are.
+        """
+        if get_settings().export.attachment_export_all:
+            return list(self.attachments)
+
+        selected = []
+        for attachment in self.attachments:
+            if (
+                attachment.filename.endswith(".drawio")
+                and f"diagramName={attachment.title}" in self.body
+            ):
+                selected.append(attachment)
+                continue
+            if (
+                attachment.filename.endswith(".drawio.png")
+                or attachment.filename.endswith(".drawio")
+            ) and attachment.title.replace(" ", "%20") in self.body_export:
+                selected.append(attachment)
+                continue
+            if attachment.file_id in self.body:
+                selected.append(attachment)
+                continue
+        return selected
 
     def get_attachment_by_id(self, attachment_id: str) -> Attachment | None:
         """Get the Attachment object by its ID.
@@ -490,59 +785,88 @@ class Page(Document):
 
     @classmethod
     def from_json(cls, data: JsonResponse) -> "Page":
-        return cls(
+        body = data.get("body", {})
+        page = cls(
             id=data.get("id", 0),
             title=data.get("title", ""),
             space=Space.from_key(data.get("_expandable", {}).get("space", "").split("/")[-1]),
-            body=data.get("body", {}).get("view", {}).get("value", ""),
-            body_export=data.get("body", {}).get("export_view", {}).get("value", ""),
-            editor2=data.get("body", {}).get("editor2", {}).get("value", ""),
+            body=body.get("view", {}).get("value", ""),
             labels=[
                 Label.from_json(label)
                 for label in data.get("metadata", {}).get("labels", {}).get("results", [])
             ],
-            attachments=Attachment.from_page_id(data.get("id", 0)),
             ancestors=[ancestor.get("id") for ancestor in data.get("ancestors", [])][1:],
+            version=Version.from_json(data["version"]) if "version" in data else None,
         )
+        # Keep other representations that were expanded already
+        for name in _REPRESENTATION_MARKERS:
+            if name in body:
+                page._representations[name] = body[name].get("value", "")
+        embedded = data.get("children", {}).get("attachment")
+        # A truncated list is left to the paginated listing on first access
+        if embedded is not None and not embedded.get("_links", {}).get("next"):
+            page._attachments = Attachment.from_listing(embedded.get("results", []), data)
+        return page
+
+    @property
+    def approximate_size(self) -> int:
+        return (
+            super().approximate_size
+            + len(self.body)
+            + sum(len(value) for value in self._representations.values())
+            + 256 * len(self.labels)
+            + 1024 * len(self._attachments or [])
+        )
+
+    def to_stub(self) -> PageStub:
+        return PageStub(id=self.id, title=self.title, space=self.space, ancestors=self.ancestors)
+
+    def release(self) -> None:
+        """Keep only the stub of an exported page in the page cache, dropping its content."""
+        page_cache.put(self.id, self.to_stub())
 
     @classmethod
-    @functools.lru_cache(maxsize=1000)
     def from_id(cls, page_id: int) -> "Page":
+        if (page := page_cache.get(page_id, Page)) is None:
+            page = cls._fetch(page_id)
+            page_cache.put(page_id, page)
+        return cast("Page", page)
+
+    @classmethod
+    @single_flight
+    def _fetch(cls, page_id: int) -> "Page":
         try:
             return cls.from_json(
                 cast(
                     "JsonResponse",
-                    confluence.get_page_by_id(
-                        page_id,
-                        expand="body.view,body.export_view,body.editor2,metadata.labels,"
-                        "metadata.properties,ancestors",
+                    get_confluence_instance().get_page_by_id(
+                        page_id, expand=page_expand([page_id])
                     ),
                 )
             )
         except (ApiError, HTTPError):
             logger.warning(f"Could not access page with ID {page_id}")
             # Return a minimal page object with error information
-            return cls(
+            page = cls(
                 id=page_id,
                 title="Page not accessible",
                 space=Space(key="", name="", description="", homepage=0),
                 body="",
-                body_export="",
-                editor2="",
                 labels=[],
-                attachments=[],
                 ancestors=[],
             )
+            page._attachments = []
+            page._representations = {"export_view": "", "editor2": ""}
+            return page
 
     @classmethod
     def from_url(cls, page_url: str) -> "Page":
         """Retrieve a Page object given a Confluence page URL."""
         url = urllib.parse.urlparse(page_url)
         hostname = url.hostname
-        if hostname and hostname not in str(settings.auth.confluence.url):
-            global confluence  # noqa: PLW0603
+        if hostname and hostname not in str(get_settings().auth.confluence.url):
             set_setting("auth.confluence.url", f"{url.scheme}://{hostname}/")
-            confluence = get_confluence_instance()  # Refresh instance with new URL
+            get_confluence_instance.cache_clear()  # Refresh instance with new URL
 
         path = url.path.rstrip("/")
         if match := re.search(r"/wiki/.+?/pages/(\d+)", path):
@@ -554,7 +878,9 @@ class Page(Document):
             page_title = urllib.parse.unquote_plus(match.group(2))
             page_data = cast(
                 "JsonResponse",
-                confluence.get_page_by_title(space=space_key, title=page_title, expand="version"),
+                get_confluence_instance().get_page_by_title(
+                    space=space_key, title=page_title, expand="version"
+                ),
             )
             return Page.from_id(page_data["id"])
 
@@ -579,7 +905,7 @@ class Page(Document):
         def markdown(self) -> str:
             md_body = self.convert(self.page.html)
             markdown = f"{self.front_matter}\n"
-            if settings.export.page_breadcrumbs:
+            if get_settings().export.page_breadcrumbs:
                 markdown += f"{self.breadcrumbs}\n"
             markdown += f"{md_body}\n"
             return markdown
@@ -592,6 +918,8 @@ class Page(Document):
             if not self.page_properties:
                 return ""
 
+            import yaml
+
             yml = yaml.dump(self.page_properties, indent=indent).strip()
             # Indent the root level list items
             yml = re.sub(r"^( *)(- )", r"\1" + " " * indent + r"\2", yml, flags=re.MULTILINE)
@@ -718,7 +1046,7 @@ class Page(Document):
             modified_header_text = modified_header.text.strip() if modified_header else "Modified"
 
             def _get_path(p: Path) -> str:
-                attachment_path = self._get_path_for_href(p, settings.export.attachment_href)
+                attachment_path = self._get_path_for_href(p, get_settings().export.attachment_href)
                 return attachment_path.replace(" ", "%20")
 
             rows = [
@@ -852,8 +1180,8 @@ class Page(Document):
                 msg = "Page link does not have valid page_id."
                 raise ValueError(msg)
 
-            page = Page.from_id(page_id)
-            page_path = self._get_path_for_href(page.export_path, settings.export.page_href)
+            page = PageStub.from_id(page_id)
+            page_path = self._get_path_for_href(page.export_path, get_settings().export.page_href)
 
             return f"[{page.title}]({page_path.replace(' ', '%20')})"
 
@@ -877,7 +1205,9 @@ class Page(Document):
                 href = el.get("href") or text
                 return f"[{text}]({href})"
 
-            path = self._get_path_for_href(attachment.export_path, settings.export.attachment_href)
+            path = self._get_path_for_href(
+                attachment.export_path, get_settings().export.attachment_href
+            )
             return f"[{attachment.title}]({path.replace(' ', '%20')})"
 
         def convert_time(self, el: BeautifulSoup, text: str, parent_tags: list[str]) -> str:
@@ -938,7 +1268,9 @@ class Page(Document):
                     return f"![{text}]({url_src})"
                 return text
 
-            path = self._get_path_for_href(attachment.export_path, settings.export.attachment_href)
+            path = self._get_path_for_href(
+                attachment.export_path, get_settings().export.attachment_href
+            )
             el["src"] = path.replace(" ", "%20")
             if "_inline" in parent_tags:
                 parent_tags.remove("_inline")  # Always show images.
@@ -959,7 +1291,7 @@ class Page(Document):
             if len(drawio_attachments) == 0:
                 return None
 
-            drawio_filepath = settings.export.output_path / drawio_attachments[0].export_path
+            drawio_filepath = get_settings().export.output_path / drawio_attachments[0].export_path
             if not drawio_filepath.exists():
                 return None
 
@@ -977,10 +1309,10 @@ class Page(Document):
                     return f"\n<!-- Drawio diagram `{drawio_name}` not found -->\n\n"
 
                 drawio_path = self._get_path_for_href(
-                    drawio_attachments[0].export_path, settings.export.attachment_href
+                    drawio_attachments[0].export_path, get_settings().export.attachment_href
                 )
                 preview_path = self._get_path_for_href(
-                    preview_attachments[0].export_path, settings.export.attachment_href
+                    preview_attachments[0].export_path, get_settings().export.attachment_href
                 )
 
                 drawio_image_embedding = f"![{drawio_name}]({preview_path.replace(' ', '%20')})"
@@ -1020,6 +1352,12 @@ class Page(Document):
             return result
 
 
+# Pages and page stubs by ID. Exported pages are replaced by their stubs to free the memory.
+page_cache: SizedCache[int, PageStub] = SizedCache(
+    max_size=256 * 1024 * 1024, sizeof=lambda page: page.approximate_size
+)
+
+
 def export_page(page_id: int) -> None:
     """Export a Confluence page to Markdown.
 
@@ -1031,13 +1369,569 @@ def export_page(page_id: int) -> None:
     page.export()
 
 
-def export_pages(page_ids: list[int]) -> None:
-    """Export a list of Confluence pages to Markdown.
+class PageBatchLoader:
+    """Fetch pages in batches with one CQL `id in (...)` search per batch.
+
+    The batch size adapts to the response sizes seen so far, so that a batch of pages
+    with large bodies stays around `target_bytes`.
+    """
+
+    def __init__(self, max_batch_size: int, target_bytes: int = 2 * 1024 * 1024) -> None:
+        self.max_batch_size = max_batch_size
+        self.target_bytes = target_bytes
+        self._bytes_per_page: float | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def batch_size(self) -> int:
+        with self._lock:
+            if self._bytes_per_page is None:
+                # Start small until the size of the pages is known
+                return min(self.max_batch_size, 10)
+            return max(1, min(self.max_batch_size, int(self.target_bytes / self._bytes_per_page)))
+
+    def next_batch(self, pending: list[int]) -> list[int]:
+        """Remove the next batch from the pending page IDs and return it."""
+        batch = pending[: self.batch_size]
+        del pending[: len(batch)]
+        return batch
+
+    def record(self, payload_bytes: int, page_count: int) -> None:
+        if page_count == 0:
+            return
+        sample = payload_bytes / page_count
+        with self._lock:
+            if self._bytes_per_page is None:
+                self._bytes_per_page = sample
+            else:
+                self._bytes_per_page = (self._bytes_per_page + sample) / 2
+
+    def load(self, page_ids: list[int]) -> list[Page]:
+        """Fetch the pages of a batch in the given order.
+
+        Pages in the page cache, e.g. the root page of an export, are not searched again
+        and the searched pages are added to it. Pages missing from the search results,
+        e.g. because they are not accessible, and all pages of a failed search are fetched
+        one by one with `Page.from_id`.
+        """
+        found: dict[int, Page] = {}
+        for page_id in page_ids:
+            if (cached := page_cache.get(page_id, Page)) is not None:
+                found[page_id] = cast("Page", cached)
+        missing = [page_id for page_id in page_ids if page_id not in found]
+        if not missing:
+            return [found[page_id] for page_id in page_ids]
+
+        confluence = get_confluence_instance()
+        try:
+            response = confluence.get(
+                "rest/api/content/search",
+                params={
+                    "cql": f"id in ({','.join(str(page_id) for page_id in missing)})",
+                    "expand": page_expand(missing),
+                    "limit": len(missing),
+                },
+                advanced_mode=True,
+            )
+            while True:
+                response.raise_for_status()
+                data = response.json()
+                results = data.get("results", [])
+                self.record(len(response.content), len(results))
+                for result in results:
+                    page = Page.from_json(result)
+                    page_cache.put(page.id, page)
+                    found[page.id] = page
+                next_path = data.get("_links", {}).get("next")
+                if not next_path:
+                    break
+                response = confluence.get(next_path, advanced_mode=True)
+        except (ApiError, HTTPError):
+            logger.warning(f"Could not search a batch of {len(missing)} pages. Fetching each.")
+        return [found.get(page_id) or Page.from_id(page_id) for page_id in page_ids]
+
+
+class PageTreeWalker:
+    """List the pages below a page breadth first, listing the children of a level in parallel.
+
+    An alternative to the CQL `ancestor` search, see `export.descendant_listing`. Pages
+    are yielded in page order: level by level, the children of each level in the order of
+    their parents and in their order in Confluence. The version numbers of the discovered
+    pages are kept in `versions` and their listing results, with the ancestors filled in
+    from the hierarchy, in `results`. Stubs of the discovered pages are cached so their
+    export paths resolve without requests.
 
     Args:
-        page_ids: List of pages to export.
-        output_path: The output path.
+        root_id: Page whose descendants are listed.
+        max_workers: Child listings running at the same time, if `submit` is not given.
+        submit: Run the child listings with this function instead of a thread pool of
+            the walker, e.g. `FetchEngine.submit` to stay within the budget of an export.
     """
-    for page_id in (pbar := tqdm(page_ids, smoothing=0.05)):
-        pbar.set_postfix_str(f"Exporting page {page_id}")
-        export_page(page_id)
+
+    def __init__(
+        self,
+        root_id: int,
+        max_workers: int = 1,
+        submit: Callable[..., "Future[list[tuple[int, str, int]]]"] | None = None,
+    ) -> None:
+        self.root_id = root_id
+        self.max_workers = max_workers
+        self.submit = submit
+        self.versions: dict[int, int] = {}
+        self.results: dict[int, JsonResponse] = {}
+
+    def __iter__(self) -> Iterator[int]:
+        root = cast(
+            "JsonResponse",
+            get_confluence_instance().get_page_by_id(self.root_id, expand="ancestors"),
+        )
+        space = PageStub.from_json(root).space
+        # Full ancestor chains, including the page itself, of the current level
+        chains = {self.root_id: [*(int(a["id"]) for a in root.get("ancestors", [])), self.root_id]}
+
+        with ExitStack() as stack:
+            submit = self.submit
+            if submit is None:
+                executor = stack.enter_context(ThreadPoolExecutor(max_workers=self.max_workers))
+                submit = executor.submit
+            while chains:
+                futures = {parent: submit(self._list_children, parent) for parent in chains}
+                next_chains: dict[int, list[int]] = {}
+                for parent, future in futures.items():
+                    children = future.result()
+                    chain = chains[parent]
+                    # Shared by the results of all children of the parent
+                    ancestors = [{"id": ancestor} for ancestor in chain]
+                    for child_id, title, version in children:
+                        self.versions[child_id] = version
+                        self.results[child_id] = {
+                            "id": child_id,
+                            "title": title,
+                            "ancestors": ancestors,
+                            "_expandable": {"space": f"/rest/api/space/{space.key}"},
+                        }
+                        next_chains[child_id] = [*chain, child_id]
+                        page_cache.add(
+                            child_id,
+                            PageStub(id=child_id, title=title, space=space, ancestors=chain[1:]),
+                        )
+                        yield child_id
+                chains = next_chains
+
+    @staticmethod
+    def _list_children(page_id: int) -> list[tuple[int, str, int]]:
+        confluence = get_confluence_instance()
+        response = cast(
+            "JsonResponse",
+            confluence.get(
+                f"rest/api/content/{page_id}/child/page",
+                params={"expand": "version", "limit": 200},
+            ),
+        )
+        children = []
+        while True:
+            children.extend(
+                (
+                    int(result["id"]),
+                    result.get("title", ""),
+                    result.get("version", {}).get("number", 0),
+                )
+                for result in response["results"]
+            )
+            next_path = response.get("_links", {}).get("next")
+            if not next_path:
+                return children
+            response = cast("JsonResponse", confluence.get(next_path))
+
+
+class PageListing:
+    """Page IDs that are listed lazily, e.g. all pages of a space.
+
+    Iterating yields the given page IDs, the descendants of each root page and all pages
+    of each space, as they are listed. `total` grows as the listings report their sizes.
+    Descendants are listed as configured with `export.descendant_listing`.
+
+    For incremental exports, see `export.incremental`, listed pages are skipped if the
+    manifest of the output path records them in their listed version. Files of pages that
+    were moved or renamed since are moved along on disk, and the links to them rewritten
+    once the listing ends, or is closed because the export stopped early.
+    To resume an export, see `export.resume`, pages that the unfinished export completed
+    are skipped.
+
+    An export sets `engine` to the engine it iterates the listing on, so a tree walk
+    shares the request budget of the export.
+    """
+
+    def __init__(
+        self,
+        page_ids: Iterable[int] = (),
+        roots: Iterable[int] = (),
+        spaces: Iterable[str] = (),
+    ) -> None:
+        self.page_ids = list(page_ids)
+        self.roots = list(roots)
+        self.spaces = list(spaces)
+        self.versions: dict[int, int | None] = {}
+        self.skipped = 0
+        self.engine: FetchEngine | None = None
+        self._totals: dict[int | str, int] = {}
+
+    @property
+    def total(self) -> int:
+        """Number of given page IDs plus the sizes reported by the listings started so far."""
+        return len(self.page_ids) + sum(self._totals.values()) - self.skipped
+
+    def __iter__(self) -> Iterator[int]:
+        export_settings = get_settings().export
+        if not (export_settings.incremental or export_settings.resume):
+            yield from (page_id for page_id, _ in self._list())
+            return
+
+        manifest = load_manifest(export_settings.output_path)
+        moved: dict[Path, Path] = {}
+        # Content hashes of the listed pages, to tell the pages an export recorded since
+        listed_hashes: dict[int, str | None] = {}
+        # The listed pages get fresh links once they are exported
+        exported: Set[int] = listed_hashes.keys()
+        try:
+            for page_id, result in self._list():
+                if export_settings.incremental:
+                    # Move the files first, so exports of changed pages find their attachments
+                    moved.update(_relocate_page(manifest, page_id, result))
+                if self._is_skipped(manifest, page_id):
+                    self.skipped += 1
+                    continue
+                listed_hashes[page_id] = _content_hash(manifest, page_id)
+                yield page_id
+        except GeneratorExit:
+            # The export stopped early, the pages it did not record keep their previous links
+            exported = {
+                page_id
+                for page_id, content_hash in listed_hashes.items()
+                if _content_hash(manifest, page_id) != content_hash
+            }
+            raise
+        finally:
+            manifest.rewrite_links(moved, skip=exported)
+            logger.info(f"Skipped {self.skipped} pages, moved {len(moved)} files.")
+
+    def _is_skipped(self, manifest: ExportManifest, page_id: int) -> bool:
+        export_settings = get_settings().export
+        if export_settings.resume and manifest.is_completed(page_id):
+            return True
+        return export_settings.incremental and manifest.is_current(
+            page_id, self.versions.get(page_id)
+        )
+
+    def _list(self) -> Iterator[tuple[int, JsonResponse | None]]:
+        """Yield the listed page IDs with their listing results, if the listing has them.
+
+        The results are expanded with `ancestors`, so they place the pages in the tree
+        without looking them up elsewhere.
+        """
+        yield from ((page_id, None) for page_id in self.page_ids)
+        for root in self.roots:
+            try:
+                if get_settings().export.descendant_listing == "tree":
+                    yield from self._walk(root)
+                else:
+                    yield from self._search(root)
+            except HTTPError as e:
+                if e.response is None or e.response.status_code != 404:  # noqa: PLR2004
+                    raise
+                logger.warning(f"Content with ID {root} not found (404) when listing descendants.")
+        for space_key in self.spaces:
+            indexer = SpaceIndexer(space_key)
+            for page_id in indexer:
+                self._totals[space_key] = indexer.total or 0
+                self.versions[page_id] = indexer.version(page_id)
+                yield page_id, indexer.result(page_id)
+
+    def _walk(self, root: int) -> Iterator[tuple[int, JsonResponse | None]]:
+        if self.engine is None:
+            walker = PageTreeWalker(root, get_settings().connection_config.max_concurrent_requests)
+        elif self.engine.max_concurrency > 1:
+            walker = PageTreeWalker(root, submit=self.engine.submit)
+        else:
+            # The listing holds the only slot of the engine, list the children in it
+            walker = PageTreeWalker(root, submit=_call_now)
+        for listed, page_id in enumerate(walker, start=1):
+            self._totals[root] = listed
+            self.versions[page_id] = walker.versions.get(page_id)
+            yield page_id, walker.results.get(page_id)
+
+    def _search(self, root: int) -> Iterator[tuple[int, JsonResponse | None]]:
+        confluence = get_confluence_instance()
+        response = confluence.get(
+            "rest/api/content/search",
+            params={
+                "cql": f"type=page AND ancestor={root}",
+                "expand": "ancestors,version",
+                "limit": 100,
+            },
+        )
+        listed = 0
+        while True:
+            results = response.get("results", [])
+            listed += len(results)
+            self._totals[root] = max(response.get("totalSize", 0), listed)
+            for result in results:
+                page_id = int(result["id"])
+                self.versions[page_id] = result.get("version", {}).get("number")
+                if "space" in result.get("_expandable", {}):
+                    # Export paths of the listed pages and their descendants need no requests
+                    page_cache.add(page_id, PageStub.from_json(result))
+                yield page_id, result
+            next_path = response.get("_links", {}).get("next")
+            if not next_path:
+                break
+            response = confluence.get(next_path)
+
+
+def _call_now(func: Callable[..., T], /, *args: Any) -> "Future[T]":  # noqa: ANN401
+    """Run a function in the calling thread and return its outcome as a done future."""
+    future: Future[T] = Future()
+    try:
+        future.set_result(func(*args))
+    except Exception as e:  # noqa: BLE001
+        future.set_exception(e)
+    return future
+
+
+def _content_hash(manifest: ExportManifest, page_id: int) -> str | None:
+    entry = manifest.entry(page_id)
+    return None if entry is None else entry.content_hash
+
+
+def _relocate_page(
+    manifest: ExportManifest, page_id: int, result: JsonResponse | None
+) -> dict[Path, Path]:
+    """Move the exported files of a page that was moved or renamed since its last export.
+
+    The current paths are computed from the listing result of the page, so they do not
+    depend on which pages were listed before it. Pages listed without a result, e.g.
+    given by ID, are fetched with their ancestors.
+    """
+    if (entry := manifest.entry(page_id)) is None:
+        return {}
+    if result is None or "space" not in result.get("_expandable", {}):
+        try:
+            result = cast(
+                "JsonResponse",
+                get_confluence_instance().get_page_by_id(page_id, expand="ancestors"),
+            )
+        except (ApiError, HTTPError):
+            logger.warning(f"Could not access page with ID {page_id}, not moving its files.")
+            return {}
+    attachment_paths = [
+        Attachment.export_path_below(result, attachment.template_vars)
+        for attachment in entry.attachments
+    ]
+    return manifest.relocate(page_id, PageStub.from_json(result).export_path, attachment_paths)
+
+
+def export_pages(page_ids: Iterable[int]) -> None:
+    """Export Confluence pages to Markdown.
+
+    Pages and their attachments are fetched concurrently, see `export_pages_async`. On
+    Ctrl+C the pages in progress are completed before `KeyboardInterrupt` is raised,
+    so `export.resume` can skip them later.
+
+    Args:
+        page_ids: Pages to export, e.g. a list or a `PageListing`.
+    """
+    with graceful_interrupt():
+        asyncio.run(export_pages_async(page_ids))
+
+
+def finish_exports() -> None:
+    """Drop the journal of the output path once a command finished all of its exports.
+
+    Until then the pages of the earlier exports of the command, e.g. of the first space
+    of several, stay completed for `export.resume` if the command is interrupted.
+    """
+    load_manifest(get_settings().export.output_path).finish()
+
+
+async def export_pages_async(
+    page_ids: Iterable[int],
+    engine: FetchEngine | None = None,
+    *,
+    description: str | None = None,
+    position: int | None = None,
+) -> None:
+    """Export Confluence pages to Markdown with concurrent API calls.
+
+    At most `connection_config.max_concurrent_requests` API calls run at the same time.
+    Pages are fetched in batches of up to `export.page_batch_size` pages. The page IDs
+    are consumed while pages are exported, so a `PageListing` is exported while it is
+    still being listed. Errors of the listing are raised once the listed pages are
+    exported. The first page that fails to export stops the export: the listing stops, the
+    other workers finish their pages in flight and the error is raised. Once a stop is
+    requested with Ctrl+C, no further pages are started.
+
+    Args:
+        page_ids: Pages to export, e.g. a list or a `PageListing`.
+        engine: Engine to share the API call budget with other exports. If not given,
+            the export uses an engine of its own.
+        description: Label of the progress bar.
+        position: Line of the progress bar if several exports run at the same time.
+    """
+    if engine is None:
+        # Create the client up front so a failed connection is handled before any worker starts
+        get_confluence_instance()
+        max_concurrency = get_settings().connection_config.max_concurrent_requests
+        async with FetchEngine(max_concurrency) as own_engine:
+            await export_pages_async(
+                page_ids, own_engine, description=description, position=position
+            )
+        return
+
+    max_concurrency = get_settings().connection_config.max_concurrent_requests
+    batch_size = get_settings().export.page_batch_size
+    loader = PageBatchLoader(batch_size) if batch_size > 0 else None
+
+    _share_engine(page_ids, engine)
+    page_iter = iter(page_ids)
+    pending: list[int] = []
+    listed = asyncio.Condition()
+    listing_done = failed = False
+
+    with tqdm(
+        total=_total(page_ids),
+        smoothing=0.05,
+        desc=description,
+        position=position,
+        leave=position is None,
+    ) as pbar:
+
+        async def list_pages() -> None:
+            nonlocal listing_done
+            try:
+                while (
+                    not stop_requested()
+                    and not failed
+                    and (page_id := await engine.run(next, page_iter, None)) is not None
+                ):
+                    async with listed:
+                        pending.append(int(page_id))
+                        listed.notify_all()
+                    if pbar.total != (count := _total(page_ids)):
+                        pbar.total = count
+                        pbar.refresh()
+            finally:
+                async with listed:
+                    listing_done = True
+                    listed.notify_all()
+
+        async def next_batch() -> list[int]:
+            async with listed:
+                await listed.wait_for(lambda: bool(pending) or listing_done or failed)
+                return [] if failed else _take_batch(pending, loader)
+
+        async def export_and_report(page: Page) -> None:
+            await _export_page_async(engine, page)
+            pbar.set_postfix_str(f"Exported page {page.id}")
+            pbar.update()
+
+        async def export_batches() -> None:
+            nonlocal failed
+            try:
+                while batch := await next_batch():
+                    await _export_batch(engine, batch, loader, export_and_report)
+            except Exception:
+                # Stop the listing and the other workers once their pages in flight are done
+                async with listed:
+                    failed = True
+                    listed.notify_all()
+                raise
+
+        # With batches, a few in flight keep the workers busy while bounding memory use
+        workers = max_concurrency if loader is None else min(max_concurrency, 4)
+        results = await asyncio.gather(
+            list_pages(), *(export_batches() for _ in range(workers)), return_exceptions=True
+        )
+    await engine.run(_finish_export, results, page_iter)
+
+
+async def _export_batch(
+    engine: FetchEngine,
+    batch: list[int],
+    loader: PageBatchLoader | None,
+    export: Callable[[Page], Awaitable[None]],
+) -> None:
+    """Fetch the pages of a batch and export them, raising the first error once all are done."""
+    if loader is None:
+        pages = [await engine.run(Page.from_id, batch[0])]
+    else:
+        pages = await engine.run(loader.load, batch)
+    _raise_first_error(
+        await asyncio.gather(*(export(page) for page in pages), return_exceptions=True)
+    )
+
+
+def _share_engine(page_ids: Iterable[int], engine: FetchEngine) -> None:
+    """Let a listing that is iterated on the engine run its tree walks within its budget."""
+    if isinstance(page_ids, PageListing):
+        page_ids.engine = engine
+
+
+def _take_batch(pending: list[int], loader: PageBatchLoader | None) -> list[int]:
+    """Take the next pages to export off the pending pages, or none after Ctrl+C."""
+    if stop_requested():
+        pending.clear()
+    elif loader is not None:
+        return loader.next_batch(pending)
+    batch = pending[:1]
+    del pending[:1]
+    return batch
+
+
+def _finish_export(results: list[object], page_iter: Iterator[int]) -> None:
+    """Save the manifest, even if the export failed part way, and raise the first error.
+
+    A listing that the export stopped early is closed first, so it completes its work on
+    the output directory, see `PageListing`.
+    """
+    if isinstance(page_iter, Generator):
+        page_iter.close()
+    logger.debug(f"Page cache after export: {page_cache.info()}")
+    load_manifest(get_settings().export.output_path).save()
+    _raise_first_error(results)
+
+
+def _raise_first_error(results: list[object]) -> None:
+    """Raise the first exception of results gathered with `return_exceptions=True`.
+
+    Cancellations are skipped, they are the consequence of an error raised elsewhere.
+    """
+    for result in results:
+        if isinstance(result, BaseException) and not isinstance(result, asyncio.CancelledError):
+            raise result
+
+
+def _total(page_ids: Iterable[int]) -> int | None:
+    """Number of pages to export, as far as it is known yet."""
+    if isinstance(page_ids, PageListing):
+        return page_ids.total
+    return len(page_ids) if isinstance(page_ids, Sized) else None
+
+
+async def _export_page_async(engine: FetchEngine, page: Page) -> None:
+    """Export a single page like `Page.export`, downloading its attachments in parallel."""
+    if page.title == "Page not accessible":
+        logger.warning(f"Skipping export for inaccessible page with ID {page.id}")
+        return
+
+    if DEBUG:
+        await engine.run(page.export_body)
+    # Export attachments first so the files can be utilized during markdown conversion
+    attachments = await engine.run(page.attachments_to_export)
+    _raise_first_error(
+        await asyncio.gather(
+            *(engine.run(attachment.export) for attachment in attachments),
+            return_exceptions=True,
+        )
+    )
+    await engine.run(page.export_markdown)
+    page.release()
@@ -0,0 +1,76 @@
+"""Concurrent execution of blocking Confluence and Jira API calls from asyncio."""
+
+import asyncio
+import functools
+from collections.abc import Callable
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+from types import TracebackType
+from typing import Any
+from typing import TypeVar
+
+T = TypeVar("T")
+
+
+class FetchEngine:
+    """Run blocking API calls on a bounded thread pool and await them from asyncio.
+
+    The SDK clients are synchronous, so every call runs in a worker thread. At most
+    `max_concurrency` calls are in flight at any time, all other calls wait their turn.
+
+    Usage:
+        async with FetchEngine(16) as engine:
+            pages = await asyncio.gather(*(engine.run(Page.from_id, i) for i in ids))
+    """
+
+    def __init__(self, max_concurrency: int) -> None:
+        if max_concurrency < 1:
+            msg = f"max_concurrency must be at least 1, got {max_concurrency}"
+            raise ValueError(msg)
+        self.max_concurrency = max_concurrency
+        self._executor: ThreadPoolExecutor | None = None
+        self._semaphore: asyncio.Semaphore | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    async def __aenter__(self) -> "FetchEngine":
+        self._loop = asyncio.get_running_loop()
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_concurrency, thread_name_prefix="cme-fetch"
+        )
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        if self._executor is not None:
+            # Calls that are already running cannot be interrupted, wait for them to finish
+            self._executor.shutdown(wait=True, cancel_futures=True)
+        self._executor = None
+        self._semaphore = None
+        self._loop = None
+
+    async def run(self, func: Callable[..., T], /, *args: Any, **kwargs: Any) -> T:  # noqa: ANN401
+        """Run a blocking function in a worker thread once a slot is free."""
+        if self._executor is None or self._semaphore is None:
+            msg = "FetchEngine must be used as an async context manager"
+            raise RuntimeError(msg)
+        async with self._semaphore:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self._executor, functools.partial(func, *args, **kwargs)
+            )
+
+    def submit(self, func: Callable[..., T], /, *args: Any, **kwargs: Any) -> "Future[T]":  # noqa: ANN401
+        """Run a blocking function from another thread within the budget of the engine.
+
+        The call waits for a free slot like `run`. A call that runs on the engine holds a
+        slot itself, so it must not wait for the submitted calls if `max_concurrency` is 1.
+        """
+        if self._loop is None:
+            msg = "FetchEngine must be used as an async context manager"
+            raise RuntimeError(msg)
+        return asyncio.run_coroutine_threadsafe(self.run(func, *args, **kwargs), self._loop)
@@ -0,0 +1,196 @@
+"""Persistent HTTP cache that revalidates responses with conditional requests."""
+
+import contextlib
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+from pathlib import Path
+
+import requests
+from pydantic import BaseModel
+from pydantic import ValidationError
+
+from confluence_markdown_exporter.utils.app_data_store import APP_CONFIG_PATH
+
+logger = logging.getLogger(__name__)
+
+HTTP_CACHE_PATH = APP_CONFIG_PATH.parent / "http_cache"
+HTTP_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+# Headers that describe the transfer of the original response rather than its content
+_TRANSFER_HEADERS = frozenset(
+    {
+        "connection",
+        "content-encoding",
+        "content-length",
+        "keep-alive",
+        "set-cookie",
+        "transfer-encoding",
+    }
+)
+
+
+class CacheEntry(BaseModel):
+    """Validators and headers of a cached response, the body is stored next to it."""
+
+    url: str
+    etag: str | None = None
+    last_modified: str | None = None
+    headers: dict[str, str] = {}
+
+
+class CachedResponse:
+    """A cache entry with its body, used to revalidate and answer a single request."""
+
+    def __init__(self, entry: CacheEntry, body: bytes) -> None:
+        self.entry = entry
+        self.body = body
+
+    def conditional_request(self, request: requests.PreparedRequest) -> requests.PreparedRequest:
+        """Copy the request and add the validators of the cached response to it.
+
+        The original request is left untouched, so redirects do not carry the validators
+        to other URLs.
+        """
+        request = request.copy()
+        if self.entry.etag:
+            request.headers["If-None-Match"] = self.entry.etag
+        if self.entry.last_modified:
+            request.headers["If-Modified-Since"] = self.entry.last_modified
+        return request
+
+    def fill(self, response: requests.Response) -> requests.Response:
+        """Turn a 304 Not Modified response into the cached 200 response."""
+        response.status_code = 200
+        response.reason = "OK"
+        response.headers.pop("Content-Length", None)
+        response.headers.update(self.entry.headers)
+        response._content = self.body
+        return response
+
+
+class HttpCache:
+    """On-disk cache of GET responses keyed on URL and auth scope.
+
+    Only responses with an `ETag` or `Last-Modified` header are stored, unless the server
+    marks them `no-store` or `private`. Cached responses are revalidated with
+    `If-None-Match`/`If-Modified-Since` on every request, so the server answers unchanged
+    resources with a cheap 304 and no body. Once the bodies exceed `max_bytes`, the least
+    recently used responses are evicted.
+    """
+
+    def __init__(
+        self, directory: Path = HTTP_CACHE_PATH, max_bytes: int = HTTP_CACHE_MAX_BYTES
+    ) -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._size: int | None = None
+
+    @staticmethod
+    def key(request: requests.PreparedRequest) -> str:
+        """Build the cache key from URL and auth scope without storing the credentials."""
+        auth_scope = hashlib.sha256(
+            str(request.headers.get("Authorization", "")).encode()
+        ).hexdigest()
+        return hashlib.sha256(f"{request.url}\n{auth_scope}".encode()).hexdigest()
+
+    def _paths(self, key: str) -> tuple[Path, Path]:
+        directory = self.directory / key[:2]
+        return directory / f"{key}.json", directory / f"{key}.body"
+
+    def lookup(self, request: requests.PreparedRequest) -> CachedResponse | None:
+        entry_path, body_path = self._paths(self.key(request))
+        try:
+            entry = CacheEntry.model_validate_json(entry_path.read_text())
+            body = body_path.read_bytes()
+        except (OSError, ValidationError):
+            return None
+        if entry.url != request.url:
+            return None
+        # Mark the body as recently used for the eviction
+        with contextlib.suppress(OSError):
+            os.utime(body_path)
+        return CachedResponse(entry, body)
+
+    def store(self, request: requests.PreparedRequest, response: requests.Response) -> None:
+        """Store a successful response if it carries validators and may be stored."""
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if response.status_code != 200 or not (etag or last_modified):  # noqa: PLR2004
+            return
+        cache_control = {
+            directive.split("=", 1)[0].strip().lower()
+            for directive in response.headers.get("Cache-Control", "").split(",")
+        }
+        if cache_control & {"no-store", "private"}:
+            return
+
+        entry = CacheEntry(
+            url=str(request.url),
+            etag=etag,
+            last_modified=last_modified,
+            headers={
+                name: value
+                for name, value in response.headers.items()
+                if name.lower() not in _TRANSFER_HEADERS
+            },
+        )
+        entry_path, body_path = self._paths(self.key(request))
+        try:
+            entry_path.parent.mkdir(parents=True, exist_ok=True)
+            replaced = body_path.stat().st_size if body_path.exists() else 0
+            # Write the body first, the entry makes the body visible to lookups
+            _atomic_write(body_path, response.content)
+            _atomic_write(entry_path, entry.model_dump_json().encode())
+        except OSError:
+            logger.debug(f"Could not write HTTP cache entry for {request.url}.", exc_info=True)
+            return
+        self._account(len(response.content) - replaced)
+
+    def _bodies(self) -> list[tuple[float, int, Path]]:
+        bodies = []
+        for body_path in self.directory.glob("*/*.body"):
+            try:
+                stat = body_path.stat()
+            except OSError:
+                continue
+            bodies.append((stat.st_mtime, stat.st_size, body_path))
+        return bodies
+
+    def _account(self, added: int) -> None:
+        """Track the size of the stored bodies and evict the oldest beyond `max_bytes`.
+
+        The size is taken from disk on the first store and tracked from then on. Eviction
+        goes down to 90% of `max_bytes`, so it does not run again on every store.
+        """
+        with self._lock:
+            if self._size is None:
+                self._size = sum(size for _, size, _ in self._bodies())
+            else:
+                self._size += added
+            if self._size <= self.max_bytes:
+                return
+            for _, size, body_path in sorted(self._bodies()):
+                if self._size <= self.max_bytes * 0.9:
+                    break
+                try:
+                    # Remove the entry first, it makes the body visible to lookups
+                    body_path.with_suffix(".json").unlink(missing_ok=True)
+                    body_path.unlink()
+                except OSError:
+                    continue
+                self._size -= size
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(data)
+        Path(tmp_name).replace(path)
+    except OSError:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
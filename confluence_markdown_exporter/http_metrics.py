@@ -0,0 +1,211 @@
+"""Per-endpoint metrics of the HTTP requests sent to Confluence and Jira."""
+
+import json
+import math
+import random
+import re
+import threading
+from collections import Counter
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+from urllib.parse import urlparse
+
+import requests
+
+_API_PREFIX = re.compile(r"^.*?/rest/api/(?:\d+/|latest/)?")
+_ID_SEGMENT = re.compile(r"^(\d+|[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12})$")
+_ISSUE_KEY_SEGMENT = re.compile(r"^[A-Z][A-Z0-9_]+-\d+$")
+# Segments that are followed by a key rather than by a sub-resource
+_KEY_PARENTS = frozenset({"space", "project"})
+_QUANTILES = {"p50": "0.5", "p95": "0.95", "p99": "0.99"}
+# Latency samples kept per endpoint for the percentiles
+LATENCY_SAMPLES = 1024
+
+
+def endpoint_template(url: str) -> str:
+    """Reduce a request URL to its endpoint template.
+
+    IDs and keys are replaced by placeholders, the API prefix and query are dropped, e.g.
+    `https://x.atlassian.net/wiki/rest/api/content/123/child/attachment?start=50`
+    becomes `content/{id}/child/attachment`.
+    """
+    path = urlparse(url).path
+    api_path = _API_PREFIX.sub("", path, count=1)
+    if api_path == path:
+        # Downloads are outside of the REST API, keep the path below the context root
+        api_path = re.sub(r"^/wiki/", "", path).lstrip("/")
+
+    template: list[str] = []
+    for segment in api_path.split("/"):
+        if not segment:
+            continue
+        if template[-3:-1] == ["download", "attachments"]:
+            template.append("{filename}")
+            break
+        if _ID_SEGMENT.match(segment):
+            template.append("{id}")
+        elif _ISSUE_KEY_SEGMENT.match(segment) or (template and template[-1] in _KEY_PARENTS):
+            template.append("{key}")
+        else:
+            template.append(segment)
+    return "/".join(template)
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(fraction * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+
+class EndpointStats:
+    """Counters and latencies of all requests to one endpoint template.
+
+    Count, total and maximum of the latencies are exact. The percentiles are taken from
+    a uniform random sample of at most `LATENCY_SAMPLES` latencies, so the memory does
+    not grow with the number of requests.
+    """
+
+    def __init__(self) -> None:
+        self.latencies: list[float] = []
+        self.count = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+        self.status_codes: Counter[int] = Counter()
+        self.bytes = 0
+        self.retries = 0
+
+    def add_latency(self, seconds: float) -> None:
+        self.count += 1
+        self.total_latency += seconds
+        self.max_latency = max(self.max_latency, seconds)
+        if len(self.latencies) < LATENCY_SAMPLES:
+            self.latencies.append(seconds)
+        # Reservoir sampling, every latency is kept with the same probability
+        elif (slot := random.randrange(self.count)) < LATENCY_SAMPLES:  # noqa: S311
+            self.latencies[slot] = seconds
+
+    def summary(self) -> dict[str, Any]:
+        latencies = sorted(self.latencies)
+        return {
+            "count": self.count,
+            "status_codes": {str(code): n for code, n in sorted(self.status_codes.items())},
+            "latency_seconds": {
+                "p50": percentile(latencies, 0.5),
+                "p95": percentile(latencies, 0.95),
+                "p99": percentile(latencies, 0.99),
+                "max": self.max_latency,
+                "total": self.total_latency,
+            },
+            "bytes": self.bytes,
+            "retries": self.retries,
+        }
+
+
+class HttpMetrics:
+    """Collect request metrics grouped by service, method and endpoint template.
+
+    Install the collector on a session with `session.hooks["response"].append(...)`
+    using the hook returned by `response_hook`.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._stats: dict[tuple[str, str, str], EndpointStats] = {}
+
+    def response_hook(self, service: str) -> Callable[..., requests.Response]:
+        def hook(response: requests.Response, *_args: object, **kwargs: Any) -> requests.Response:  # noqa: ANN401
+            self.record(service, response, streamed=bool(kwargs.get("stream")))
+            return response
+
+        return hook
+
+    def record(self, service: str, response: requests.Response, *, streamed: bool = False) -> None:
+        if streamed:
+            # Reading a streamed body here would consume it before the caller gets to it
+            size = int(response.headers.get("Content-Length") or 0)
+        else:
+            size = len(response.content or b"")
+        retry_state = getattr(response.raw, "retries", None)
+        retries = len(retry_state.history) if retry_state is not None else 0
+        key = (service, response.request.method or "", endpoint_template(response.url))
+
+        with self._lock:
+            stats = self._stats.setdefault(key, EndpointStats())
+            stats.add_latency(response.elapsed.total_seconds())
+            stats.status_codes[response.status_code] += 1
+            stats.bytes += size
+            stats.retries += retries
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+    def summary(self) -> list[dict[str, Any]]:
+        """Summarize all endpoints, the endpoint with the most total latency first."""
+        with self._lock:
+            rows = [
+                {"service": service, "method": method, "endpoint": endpoint, **stats.summary()}
+                for (service, method, endpoint), stats in self._stats.items()
+            ]
+        return sorted(rows, key=lambda row: row["latency_seconds"]["total"], reverse=True)
+
+    def write_json(self, path: Path) -> None:
+        _write_atomic(path, json.dumps({"endpoints": self.summary()}, indent=2))
+
+    def write_prometheus(self, path: Path) -> None:
+        """Write the metrics in the Prometheus text format, e.g. for the textfile collector."""
+        lines = [
+            "# HELP cme_http_requests_total HTTP requests by endpoint and status code.",
+            "# TYPE cme_http_requests_total counter",
+        ]
+        summary = self.summary()
+        for row in summary:
+            for status, count in row["status_codes"].items():
+                lines.append(
+                    f"cme_http_requests_total{{{_labels(row)},status={_quote(status)}}} {count}"
+                )
+        lines += [
+            "# HELP cme_http_request_duration_seconds Time until the response headers arrived.",
+            "# TYPE cme_http_request_duration_seconds summary",
+        ]
+        for row in summary:
+            latency = row["latency_seconds"]
+            for name, quantile in _QUANTILES.items():
+                lines.append(
+                    f"cme_http_request_duration_seconds{{{_labels(row)},"
+                    f"quantile={_quote(quantile)}}} {latency[name]}"
+                )
+            lines += [
+                f"cme_http_request_duration_seconds_sum{{{_labels(row)}}} {latency['total']}",
+                f"cme_http_request_duration_seconds_count{{{_labels(row)}}} {row['count']}",
+            ]
+        for name, field, help_text in (
+            ("cme_http_response_bytes_total", "bytes", "Bytes of response bodies received."),
+            ("cme_http_retries_total", "retries", "Requests retried by the retry policy."),
+        ):
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+            lines += [f"{name}{{{_labels(row)}}} {row[field]}" for row in summary]
+        _write_atomic(path, "\n".join(lines) + "\n")
+
+
+def _quote(value: str) -> str:
+    escaped = value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return f'"{escaped}"'
+
+
+def _labels(row: dict[str, Any]) -> str:
+    return ",".join(f"{name}={_quote(row[name])}" for name in ("service", "method", "endpoint"))
+
+
+def _write_atomic(path: Path, text: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    tmp_path.write_text(text)
+    tmp_path.replace(path)
+
+
+# Metrics of all API clients of this process
+http_metrics = HttpMetrics()
@@ -4,22 +4,64 @@ from typing import Annotated
 
 import typer
 
-from confluence_markdown_exporter import __version__
-from confluence_markdown_exporter.utils.app_data_store import get_settings
-from confluence_markdown_exporter.utils.app_data_store import set_setting
-from confluence_markdown_exporter.utils.config_interactive import main_config_menu_loop
-from confluence_markdown_exporter.utils.measure_time import measure
 from confluence_markdown_exporter.utils.type_converter import str_to_bool
 
+# Heavy dependencies (pydantic, atlassian, questionary, bs4, ...) are imported inside the
+# commands that need them to keep the CLI startup time low.
+
 DEBUG: bool = str_to_bool(os.getenv("DEBUG", "False"))
 
 app = typer.Typer()
 
 
+@app.callback()
+def main(
+    ctx: typer.Context,
+    metrics_file: Annotated[
+        Path | None,
+        typer.Option(
+            envvar="CME_METRICS_FILE",
+            help="Write a JSON summary of all HTTP requests per endpoint to this file.",
+        ),
+    ] = None,
+    prometheus_file: Annotated[
+        Path | None,
+        typer.Option(
+            envvar="CME_PROMETHEUS_FILE",
+            help="Write the HTTP request metrics in the Prometheus text format to this file.",
+        ),
+    ] = None,
+) -> None:
+    if metrics_file is None and prometheus_file is None:
+        return
+
+    def write_metrics() -> None:
+        from confluence_markdown_exporter.http_metrics import http_metrics
+
+        if metrics_file is not None:
+            http_metrics.write_json(metrics_file)
+        if prometheus_file is not None:
+            http_metrics.write_prometheus(prometheus_file)
+
+    ctx.call_on_close(write_metrics)
+
+
 def override_output_path_config(value: Path | None) -> None:
-    """Override the default output path if provided."""
+    """Override the configured output path for this run if provided."""
     if value is not None:
-        set_setting("export.output_path", value)
+        from confluence_markdown_exporter.utils.app_data_store import override_setting
+
+        override_setting("export.output_path", value)
+
+
+def override_export_mode_config(*, incremental: bool, resume: bool) -> None:
+    """Enable incremental or resumed exports for this run if requested."""
+    from confluence_markdown_exporter.utils.app_data_store import override_setting
+
+    if incremental:
+        override_setting("export.incremental", incremental)
+    if resume:
+        override_setting("export.resume", resume)
 
 
 @app.command(help="Export one or more Confluence pages by ID or URL to Markdown.")
@@ -33,6 +75,7 @@ def pages(
     ] = None,
 ) -> None:
     from confluence_markdown_exporter.confluence import Page
+    from confluence_markdown_exporter.utils.measure_time import measure
 
     with measure(f"Export pages {', '.join(pages)}"):
         for page in pages:
@@ -50,14 +93,29 @@ def pages_with_descendants(
             help="Directory to write exported Markdown files to. Overrides config if set."
         ),
     ] = None,
+    *,
+    incremental: Annotated[
+        bool,
+        typer.Option(
+            help="Only export pages that changed since their last export to the output path."
+        ),
+    ] = False,
+    resume: Annotated[
+        bool,
+        typer.Option(help="Skip the pages an interrupted export to the output path completed."),
+    ] = False,
 ) -> None:
     from confluence_markdown_exporter.confluence import Page
+    from confluence_markdown_exporter.confluence import finish_exports
+    from confluence_markdown_exporter.utils.measure_time import measure
 
     with measure(f"Export pages {', '.join(pages)} with descendants"):
         for page in pages:
             override_output_path_config(output_path)
+            override_export_mode_config(incremental=incremental, resume=resume)
             _page = Page.from_id(int(page)) if page.isdigit() else Page.from_url(page)
             _page.export_with_descendants()
+        finish_exports()
 
 
 @app.command(help="Export all Confluence pages of one or more spaces to Markdown.")
@@ -69,14 +127,29 @@ def spaces(
             help="Directory to write exported Markdown files to. Overrides config if set."
         ),
     ] = None,
+    *,
+    incremental: Annotated[
+        bool,
+        typer.Option(
+            help="Only export pages that changed since their last export to the output path."
+        ),
+    ] = False,
+    resume: Annotated[
+        bool,
+        typer.Option(help="Skip the pages an interrupted export to the output path completed."),
+    ] = False,
 ) -> None:
     from confluence_markdown_exporter.confluence import Space
+    from confluence_markdown_exporter.confluence import finish_exports
+    from confluence_markdown_exporter.utils.measure_time import measure
 
     with measure(f"Export spaces {', '.join(space_keys)}"):
         for space_key in space_keys:
             override_output_path_config(output_path)
+            override_export_mode_config(incremental=incremental, resume=resume)
             space = Space.from_key(space_key)
             space.export()
+        finish_exports()
 
 
 @app.command(help="Export all Confluence pages across all spaces to Markdown.")
@@ -87,13 +160,28 @@ def all_spaces(
             help="Directory to write exported Markdown files to. Overrides config if set."
         ),
     ] = None,
+    *,
+    incremental: Annotated[
+        bool,
+        typer.Option(
+            help="Only export pages that changed since their last export to the output path."
+        ),
+    ] = False,
+    resume: Annotated[
+        bool,
+        typer.Option(help="Skip the pages an interrupted export to the output path completed."),
+    ] = False,
 ) -> None:
     from confluence_markdown_exporter.confluence import Organization
+    from confluence_markdown_exporter.confluence import finish_exports
+    from confluence_markdown_exporter.utils.measure_time import measure
 
     with measure("Export all spaces"):
         override_output_path_config(output_path)
+        override_export_mode_config(incremental=incremental, resume=resume)
         org = Organization.from_api()
         org.export()
+        finish_exports()
 
 
 @app.command(help="Open the interactive configuration menu or display current configuration.")
@@ -113,16 +201,22 @@ def config(
 ) -> None:
     """Interactive configuration menu or display current configuration."""
     if show:
+        from confluence_markdown_exporter.utils.app_data_store import get_settings
+
         current_settings = get_settings()
         json_output = current_settings.model_dump_json(indent=2)
         typer.echo(f"```json\n{json_output}\n```")
     else:
+        from confluence_markdown_exporter.utils.config_interactive import main_config_menu_loop
+
         main_config_menu_loop(jump_to)
 
 
 @app.command(help="Show the current version of confluence-markdown-exporter.")
 def version() -> None:
     """Display the current version."""
+    from confluence_markdown_exporter import __version__
+
     typer.echo(f"confluence-markdown-exporter {__version__}")
 
 
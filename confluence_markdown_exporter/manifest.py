@@ -0,0 +1,314 @@
+"""Manifest of the pages exported to an output directory, to export only changed pages."""
+
+import hashlib
+import logging
+import os
+import re
+import threading
+from collections.abc import Iterable
+from collections.abc import Sequence
+from collections.abc import Set
+from pathlib import Path
+from typing import TextIO
+from urllib.parse import unquote
+
+from pydantic import BaseModel
+from pydantic import PrivateAttr
+from pydantic import ValidationError
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILENAME = ".cme-manifest.json"
+JOURNAL_FILENAME = ".cme-journal.jsonl"
+
+# Target of a Markdown link or image, up to an optional title, with balanced parentheses
+_LINK_TARGET = re.compile(r"(?<=\]\()(?:[^()\s]|\([^()\s]*\))+")
+
+
+class ManifestAttachment(BaseModel):
+    """An exported attachment file and its own template variables to compute its path."""
+
+    export_path: str
+    template_vars: dict[str, str] = {}
+
+
+class ManifestEntry(BaseModel):
+    version: int
+    export_path: str
+    content_hash: str
+    attachments: list[ManifestAttachment] = []
+
+
+class JournalRecord(BaseModel):
+    """A page completed by an export, appended to the journal as one line."""
+
+    id: int
+    entry: ManifestEntry
+
+
+class ExportManifest(BaseModel):
+    """Version, export path and content hash of every page exported to a directory.
+
+    The manifest is stored in the output directory, so it describes the files next to it.
+    A page whose listed version matches its entry and whose file still exists is unchanged.
+    Pages that were moved or renamed since are relocated on disk, see `relocate`.
+
+    Every recorded page is also appended to a journal next to the manifest right away.
+    The journal is replayed when the manifest is loaded, so an export that died before
+    it saved the manifest is not lost, and dropped once a command finished all of its
+    exports, see `finish`.
+    """
+
+    pages: dict[int, ManifestEntry] = {}
+    _directory: Path = PrivateAttr(default_factory=Path)
+    _lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+    _journal: TextIO | None = PrivateAttr(default=None)
+    _completed: set[int] = PrivateAttr(default_factory=set)
+
+    @classmethod
+    def load(cls, directory: Path) -> "ExportManifest":
+        """Read the manifest of an output directory, or start an empty one."""
+        try:
+            manifest = cls.model_validate_json((directory / MANIFEST_FILENAME).read_text())
+        except FileNotFoundError:
+            manifest = cls()
+        except (OSError, ValidationError):
+            logger.warning(f"Ignoring unreadable export manifest in {directory}.")
+            manifest = cls()
+        manifest._directory = directory
+        manifest._replay_journal()
+        return manifest
+
+    def _replay_journal(self) -> None:
+        """Add the pages of an unfinished export, see `is_completed`."""
+        try:
+            lines = (self._directory / JOURNAL_FILENAME).read_text(encoding="utf-8").splitlines()
+        except OSError:
+            return
+        for line in lines:
+            try:
+                record = JournalRecord.model_validate_json(line)
+            except ValidationError:
+                # The last line is cut off if the export was killed while writing it
+                continue
+            self.pages[record.id] = record.entry
+            self._completed.add(record.id)
+
+    def is_current(self, page_id: int, version: int | None) -> bool:
+        """Whether the page was exported in this version and its file still exists."""
+        with self._lock:
+            entry = self.pages.get(page_id)
+        return (
+            version is not None
+            and entry is not None
+            and entry.version == version
+            and (self._directory / entry.export_path).exists()
+        )
+
+    def is_completed(self, page_id: int) -> bool:
+        """Whether an unfinished export completed the page and its file still exists."""
+        with self._lock:
+            entry = self.pages.get(page_id) if page_id in self._completed else None
+        return entry is not None and (self._directory / entry.export_path).exists()
+
+    def entry(self, page_id: int) -> ManifestEntry | None:
+        with self._lock:
+            return self.pages.get(page_id)
+
+    def is_written(self, page_id: int, export_path: Path, content: str) -> bool:
+        """Whether the page was recorded with this content at this path and its file exists.
+
+        The file is not read, so it is not rewritten if it was edited since it was recorded.
+        """
+        with self._lock:
+            entry = self.pages.get(page_id)
+        return (
+            entry is not None
+            and entry.export_path == export_path.as_posix()
+            and entry.content_hash == _content_hash(content)
+            and (self._directory / export_path).exists()
+        )
+
+    def record(
+        self,
+        page_id: int,
+        version: int,
+        export_path: Path,
+        content: str,
+        attachments: Iterable[ManifestAttachment] = (),
+    ) -> None:
+        entry = ManifestEntry(
+            version=version,
+            export_path=export_path.as_posix(),
+            content_hash=_content_hash(content),
+            attachments=list(attachments),
+        )
+        with self._lock:
+            self.pages[page_id] = entry
+            self._append(JournalRecord(id=page_id, entry=entry))
+
+    def _append(self, record: JournalRecord) -> None:
+        try:
+            if self._journal is None:
+                self._journal = (self._directory / JOURNAL_FILENAME).open("a", encoding="utf-8")
+            self._journal.write(f"{record.model_dump_json()}\n")
+            self._journal.flush()
+        except OSError:
+            logger.warning(f"Could not write to the export journal in {self._directory}.")
+
+    def relocate(
+        self, page_id: int, export_path: Path, attachment_paths: Sequence[Path]
+    ) -> dict[Path, Path]:
+        """Move the files of a recorded page to its current paths with renames.
+
+        Args:
+            page_id: ID of a page in the manifest.
+            export_path: Current export path of the page.
+            attachment_paths: Current export paths of the recorded attachments, in order.
+
+        Returns:
+            Previous and current paths of the moved files, relative to the output directory.
+        """
+        with self._lock:
+            entry = self.pages[page_id].model_copy(deep=True)
+        moves: list[tuple[ManifestEntry | ManifestAttachment, Path]] = [
+            (entry, export_path),
+            *zip(entry.attachments, attachment_paths, strict=True),
+        ]
+        moved: dict[Path, Path] = {}
+        for item, path in moves:
+            old_path = Path(item.export_path)
+            if old_path != path and self._move_file(old_path, path):
+                moved[old_path] = path
+                item.export_path = path.as_posix()
+        with self._lock:
+            self.pages[page_id] = entry
+        return moved
+
+    def rewrite_links(self, moved: dict[Path, Path], skip: Set[int] = frozenset()) -> None:
+        """Rewrite the links of the recorded pages that break because files were moved.
+
+        Links to moved files are pointed at their new paths, and relative links of moved
+        pages are rebased on their new directory.
+
+        Args:
+            moved: Previous and current paths of the moved files, see `relocate`.
+            skip: Pages that are exported again and get fresh links anyway.
+        """
+        if not moved:
+            return
+        previous = {new: old for old, new in moved.items()}
+        with self._lock:
+            entries = [
+                (page_id, entry) for page_id, entry in self.pages.items() if page_id not in skip
+            ]
+        for page_id, entry in entries:
+            path = Path(entry.export_path)
+            file = self._directory / path
+            try:
+                content = file.read_text(encoding="utf-8")
+            except OSError:
+                continue
+
+            def rewrite(match: re.Match[str], path: Path = path) -> str:
+                return _rewrite_target(match.group(), path, previous.get(path, path), moved)
+
+            rewritten = _LINK_TARGET.sub(rewrite, content)
+            if rewritten == content:
+                continue
+            try:
+                file.write_text(rewritten, encoding="utf-8")
+            except OSError:
+                logger.warning(f"Could not rewrite the links of {file}.", exc_info=True)
+                continue
+            with self._lock:
+                if page_id in self.pages:
+                    self.pages[page_id].content_hash = _content_hash(rewritten)
+
+    def _move_file(self, old_path: Path, new_path: Path) -> bool:
+        source, target = self._directory / old_path, self._directory / new_path
+        if not source.is_file() or target.exists():
+            return False
+        try:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            source.replace(target)
+        except OSError:
+            logger.warning(f"Could not move {source} to {target}.", exc_info=True)
+            return False
+        # Drop the directories the move left empty
+        directory = source.parent
+        while directory != self._directory and self._directory in directory.parents:
+            try:
+                directory.rmdir()
+            except OSError:
+                break
+            directory = directory.parent
+        return True
+
+    def save(self) -> bool:
+        """Write the manifest atomically, replacing the previous one.
+
+        Returns:
+            Whether the manifest was written.
+        """
+        path = self._directory / MANIFEST_FILENAME
+        with self._lock:
+            data = self.model_dump_json(indent=2)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(".tmp")
+            tmp_path.write_text(data)
+            tmp_path.replace(path)
+        except OSError:
+            logger.warning(f"Could not write the export manifest {path}.", exc_info=True)
+            return False
+        return True
+
+    def finish(self) -> None:
+        """Save the manifest once all exports of a command finished and drop the journal."""
+        if not self.save():
+            return
+        with self._lock:
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
+            self._completed.clear()
+            (self._directory / JOURNAL_FILENAME).unlink(missing_ok=True)
+
+
+def _content_hash(content: str) -> str:
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
+def _rewrite_target(target: str, path: Path, previous_path: Path, moved: dict[Path, Path]) -> str:
+    """Point a link target of the page at `path`, formerly at `previous_path`, at moved files."""
+    if "://" in target or target.startswith(("#", "mailto:")):
+        return target
+    link, separator, fragment = target.partition("#")
+    if link.startswith("/"):
+        linked = Path(unquote(link).lstrip("/"))
+        if linked not in moved:
+            return target
+        return f"/{moved[linked].as_posix()}".replace(" ", "%20") + separator + fragment
+    linked = Path(os.path.normpath(previous_path.parent / unquote(link)))
+    if linked not in moved and path == previous_path:
+        return target
+    rebased = os.path.relpath(moved.get(linked, linked), path.parent)
+    return Path(rebased).as_posix().replace(" ", "%20") + separator + fragment
+
+
+_lock = threading.Lock()
+_manifests: dict[Path, ExportManifest] = {}
+
+
+def load_manifest(directory: Path) -> ExportManifest:
+    """Get the manifest of an output directory, reading it on first use."""
+    with _lock:
+        if directory not in _manifests:
+            _manifests[directory] = ExportManifest.load(directory)
+        return _manifests[directory]
+
+
+def clear_manifests() -> None:
+    with _lock:
+        _manifests.clear()
@@ -0,0 +1,119 @@
+"""Client-side rate limiting shared by all API workers."""
+
+import math
+import threading
+import time
+from collections.abc import Callable
+from collections.abc import Mapping
+from datetime import datetime
+from datetime import timezone
+from email.utils import parsedate_to_datetime
+
+# Status codes Atlassian uses to signal that a client is sending too many requests
+RATE_LIMIT_STATUS_CODES = frozenset({429, 503})
+
+# X-RateLimit-Reset values above this are epoch timestamps rather than a number of seconds
+_EPOCH_THRESHOLD = 1_000_000_000
+
+
+def _parse_timestamp(value: str) -> datetime | None:
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        try:
+            parsed = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def _parse_delay(value: str, now: float) -> float | None:
+    """Parse a header value given either in seconds, as epoch timestamp or as date."""
+    value = value.strip()
+    try:
+        number = float(value)
+    except ValueError:
+        timestamp = _parse_timestamp(value)
+        return None if timestamp is None else timestamp.timestamp() - now
+    if not math.isfinite(number):
+        return None
+    return number - now if number > _EPOCH_THRESHOLD else number
+
+
+def retry_delay(headers: Mapping[str, str], now: float | None = None) -> float | None:
+    """Get the number of seconds the server asks the client to wait.
+
+    `Retry-After` takes precedence over `X-RateLimit-Reset`. Returns None if the
+    response carries neither header.
+    """
+    now = time.time() if now is None else now
+    for header in ("Retry-After", "X-RateLimit-Reset"):
+        value = headers.get(header)
+        if value is None:
+            continue
+        delay = _parse_delay(value, now)
+        if delay is not None:
+            return max(delay, 0.0)
+    return None
+
+
+class RateLimiter:
+    """Token bucket shared by all threads that send API requests.
+
+    Every request takes one token, tokens are refilled at `requests_per_second` up to a
+    burst of one second worth of requests. A `pause` stops all threads until it expires,
+    e.g. when the server answers with 429 and a `Retry-After` header.
+
+    A `requests_per_second` of 0 disables the token bucket, pauses still apply.
+    """
+
+    def __init__(
+        self,
+        requests_per_second: float,
+        max_pause_seconds: float = 60,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.requests_per_second = requests_per_second
+        self.max_pause_seconds = max_pause_seconds
+        self._capacity = max(1.0, requests_per_second)
+        self._tokens = self._capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._updated_at = clock()
+        self._paused_until = 0.0
+
+    def acquire(self) -> None:
+        """Block until a request may be sent."""
+        while True:
+            wait = self._try_acquire()
+            if wait <= 0:
+                return
+            self._sleep(wait)
+
+    def pause(self, seconds: float) -> None:
+        """Stop all threads from sending requests for the given number of seconds."""
+        seconds = min(max(seconds, 0.0), self.max_pause_seconds)
+        with self._lock:
+            self._paused_until = max(self._paused_until, self._clock() + seconds)
+            # Restart slowly after the pause instead of sending a full burst at once
+            self._tokens = min(self._tokens, 1.0)
+
+    def _try_acquire(self) -> float:
+        """Take a token if possible, otherwise return the number of seconds to wait."""
+        with self._lock:
+            now = self._clock()
+            if now < self._paused_until:
+                return self._paused_until - now
+            if self.requests_per_second <= 0:
+                return 0
+            elapsed = now - max(self._updated_at, self._paused_until)
+            self._tokens = min(
+                self._capacity, self._tokens + max(elapsed, 0.0) * self.requests_per_second
+            )
+            self._updated_at = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0
+            return (1 - self._tokens) / self.requests_per_second
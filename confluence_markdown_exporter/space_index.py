@@ -0,0 +1,317 @@
+"""In-memory index of the page tree of a space to compute export paths without API calls."""
+
+import hashlib
+import logging
+import threading
+import time
+from collections.abc import Iterable
+from collections.abc import Iterator
+from pathlib import Path
+from typing import cast
+
+from pydantic import BaseModel
+from pydantic import ValidationError
+
+from confluence_markdown_exporter.api_clients import get_confluence_instance
+from confluence_markdown_exporter.utils.app_data_store import APP_CONFIG_PATH
+from confluence_markdown_exporter.utils.app_data_store import get_settings
+
+logger = logging.getLogger(__name__)
+
+SPACE_INDEX_PATH = APP_CONFIG_PATH.parent / "space_index"
+
+
+class IndexedPage(BaseModel):
+    id: int
+    title: str
+    ancestors: list[int]
+    parent_id: int | None = None
+    children: list[int] = []
+    depth: int = 0
+    version: int = 0
+
+
+class SpaceTreeIndex(BaseModel):
+    """Title and position of every page of a space.
+
+    Built from one paginated listing of all pages in the space, after which titles
+    and ancestors of any page in the space are resolved without further requests.
+    """
+
+    space_key: str
+    built_at: float
+    pages: dict[int, IndexedPage]
+
+    def __contains__(self, page_id: int) -> bool:
+        return page_id in self.pages
+
+    def ancestors(self, page_id: int) -> list[int]:
+        """Get the ancestor IDs of a page, starting at the root of the tree.
+
+        The ancestors are taken from the listing result of the page itself, so they are
+        complete even while its ancestors are not listed yet.
+        """
+        return list(self.pages[page_id].ancestors)
+
+    def result(self, page_id: int) -> dict:
+        """Rebuild the listing result of an indexed page, expanded with `ancestors`."""
+        page = self.pages[page_id]
+        return {
+            "id": page_id,
+            "title": page.title,
+            "ancestors": [{"id": ancestor} for ancestor in page.ancestors],
+            "version": {"number": page.version},
+            "_expandable": {"space": f"/rest/api/space/{self.space_key}"},
+        }
+
+    def add(self, result: dict) -> IndexedPage:
+        """Add a content result that was expanded with `ancestors` and `version`.
+
+        Call `link_children` once all pages are added.
+        """
+        ancestors = [int(ancestor["id"]) for ancestor in result.get("ancestors", [])]
+        page_id = int(result["id"])
+        page = self.pages[page_id] = IndexedPage(
+            id=page_id,
+            title=result.get("title", ""),
+            ancestors=ancestors,
+            parent_id=ancestors[-1] if ancestors else None,
+            depth=len(ancestors),
+            version=result.get("version", {}).get("number", 0),
+        )
+        return page
+
+    def link_children(self) -> None:
+        for page in self.pages.values():
+            page.children.clear()
+        for page in self.pages.values():
+            if page.parent_id in self.pages:
+                self.pages[page.parent_id].children.append(page.id)
+
+    @classmethod
+    def from_listing(cls, space_key: str, results: Iterable[dict]) -> "SpaceTreeIndex":
+        """Build the index from content results that were expanded with `ancestors`."""
+        index = cls(space_key=space_key, built_at=time.time(), pages={})
+        for result in results:
+            index.add(result)
+        index.link_children()
+        return index
+
+    @classmethod
+    def from_api(cls, space_key: str) -> "SpaceTreeIndex":
+        """List all current pages of the space."""
+        results = [
+            result
+            for response in _paginate(*_space_pages_search(space_key))
+            for result in response.get("results", [])
+        ]
+        return cls.from_listing(space_key, results)
+
+
+class SpaceIndexer:
+    """List the IDs of all pages of a space, indexing the pages while they are listed.
+
+    The pages are always listed, the index is registered up front and pages are added
+    as the search results arrive, so titles and ancestors of listed pages resolve without
+    requests. `total` is the number of pages of the space once the first results arrived.
+
+    Until the listing is complete, the previous index of the space, registered in this
+    run or persisted within `export.space_index_ttl_seconds`, resolves the titles and
+    ancestors of pages that are not listed yet. It never decides which pages are listed.
+    """
+
+    def __init__(self, space_key: str) -> None:
+        self.space_key = space_key
+        self.total: int | None = None
+
+    def result(self, page_id: int) -> dict | None:
+        """Get the listing result of a listed page, see `SpaceTreeIndex.result`."""
+        with _lock:
+            index = _indexes.get(self.space_key)
+        if index is None or page_id not in index:
+            return None
+        return index.result(page_id)
+
+    def version(self, page_id: int) -> int | None:
+        """Get the version of a listed page, or None if it is unknown."""
+        with _lock:
+            index = _indexes.get(self.space_key)
+        if index is None or page_id not in index:
+            return None
+        return index.pages[page_id].version or None
+
+    def __iter__(self) -> Iterator[int]:
+        ttl_seconds = get_settings().export.space_index_ttl_seconds
+        with _lock:
+            previous = _indexes.get(self.space_key)
+        if previous is None and ttl_seconds > 0:
+            previous = _load_persisted(self.space_key, ttl_seconds)
+
+        index = SpaceTreeIndex(space_key=self.space_key, built_at=time.time(), pages={})
+        with _lock:
+            _indexes[self.space_key] = index
+            if previous is not None:
+                _previous_indexes[self.space_key] = previous
+        complete = False
+        try:
+            for response in _paginate(*_space_pages_search(self.space_key)):
+                results = response.get("results", [])
+                self.total = max(response.get("totalSize", 0), len(index.pages) + len(results))
+                for result in results:
+                    yield index.add(result).id
+            complete = True
+        finally:
+            with _lock:
+                _previous_indexes.pop(self.space_key, None)
+                if not complete:
+                    # Lookups fall back to requests rather than trusting a partial index
+                    _indexes.pop(self.space_key, None)
+        index.link_children()
+        if ttl_seconds > 0:
+            _persist(index)
+
+
+class SpaceAttachmentIndex(BaseModel):
+    """Attachments of all pages of a space, grouped by the ID of their page.
+
+    Built from a paginated CQL search for all attachments in the space, which replaces
+    listing the attachments page by page.
+    """
+
+    space_key: str
+    attachments: dict[int, list[dict]]
+
+    @classmethod
+    def from_listing(cls, space_key: str, results: Iterable[dict]) -> "SpaceAttachmentIndex":
+        """Build the index from attachment results that were expanded with `container`."""
+        attachments: dict[int, list[dict]] = {}
+        for result in results:
+            container_id = result.get("container", {}).get("id")
+            if container_id is not None:
+                attachments.setdefault(int(container_id), []).append(result)
+        return cls(space_key=space_key, attachments=attachments)
+
+    @classmethod
+    def from_api(cls, space_key: str) -> "SpaceAttachmentIndex":
+        """Search all current attachments of the space."""
+        params = {
+            "cql": f'type=attachment AND space="{space_key}"',
+            "expand": "container.ancestors,version",
+            "limit": 100,
+        }
+        results = [
+            result
+            for response in _paginate("rest/api/content/search", params)
+            for result in response.get("results", [])
+        ]
+        return cls.from_listing(space_key, results)
+
+
+def _space_pages_search(space_key: str) -> tuple[str, dict]:
+    return (
+        "rest/api/content/search",
+        {
+            "cql": f'space="{space_key}" AND type=page',
+            "expand": "ancestors,version",
+            "limit": 100,
+        },
+    )
+
+
+def _paginate(path: str, params: dict) -> Iterator[dict]:
+    """Yield the responses of a paginated listing, following the pagination links."""
+    confluence = get_confluence_instance()
+    response = cast("dict", confluence.get(path, params=params))
+    yield response
+    while next_path := response.get("_links", {}).get("next"):
+        response = cast("dict", confluence.get(next_path))
+        yield response
+
+
+_lock = threading.Lock()
+_indexes: dict[str, SpaceTreeIndex] = {}
+_previous_indexes: dict[str, SpaceTreeIndex] = {}
+_attachment_indexes: dict[str, SpaceAttachmentIndex] = {}
+
+
+def _index_file(space_key: str) -> Path:
+    scope = f"{get_settings().auth.confluence.url}\n{space_key}"
+    return SPACE_INDEX_PATH / f"{hashlib.sha256(scope.encode()).hexdigest()}.json"
+
+
+def _load_persisted(space_key: str, ttl_seconds: int) -> SpaceTreeIndex | None:
+    try:
+        index = SpaceTreeIndex.model_validate_json(_index_file(space_key).read_text())
+    except (OSError, ValidationError):
+        return None
+    return index if time.time() - index.built_at < ttl_seconds else None
+
+
+def _persist(index: SpaceTreeIndex) -> None:
+    path = _index_file(index.space_key)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(index.model_dump_json())
+        tmp_path.replace(path)
+    except OSError:
+        logger.debug(f"Could not persist the page index of space {index.space_key}.", exc_info=True)
+
+
+def load_space_index(space_key: str) -> SpaceTreeIndex:
+    """Build the index of a space, or reuse the registered one, and register it for lookups."""
+    with _lock:
+        if space_key in _indexes:
+            return _indexes[space_key]
+    for _ in SpaceIndexer(space_key):
+        pass
+    with _lock:
+        return _indexes[space_key]
+
+
+def find_indexed_page(page_id: int) -> tuple[SpaceTreeIndex, IndexedPage] | None:
+    """Find a page in the registered space indexes.
+
+    Pages that are not listed yet are looked up in the previous index of their space.
+    """
+    with _lock:
+        for indexes in (_indexes, _previous_indexes):
+            for index in indexes.values():
+                if page_id in index:
+                    return index, index.pages[page_id]
+    return None
+
+
+def load_attachment_index(space_key: str) -> SpaceAttachmentIndex:
+    """Build the attachment index of a space, or reuse it, and register it for lookups."""
+    with _lock:
+        if space_key in _attachment_indexes:
+            return _attachment_indexes[space_key]
+
+    index = SpaceAttachmentIndex.from_api(space_key)
+
+    with _lock:
+        return _attachment_indexes.setdefault(space_key, index)
+
+
+def find_indexed_attachments(space_key: str, page_id: int) -> list[dict] | None:
+    """Get the attachment results of a page, or None if its space is not indexed."""
+    with _lock:
+        index = _attachment_indexes.get(space_key)
+    return None if index is None else index.attachments.get(page_id, [])
+
+
+def attachments_indexed(page_id: int) -> bool:
+    """Whether the page is in a space index whose space also has an attachment index."""
+    with _lock:
+        for index in _indexes.values():
+            if page_id in index:
+                return index.space_key in _attachment_indexes
+    return False
+
+
+def clear_space_indexes() -> None:
+    with _lock:
+        _indexes.clear()
+        _previous_indexes.clear()
+        _attachment_indexes.clear()
@@ -0,0 +1,203 @@
+"""Shared HTTP connection pools for the Confluence and Jira API sessions."""
+
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.response import BaseHTTPResponse
+from urllib3.util import Retry
+
+from confluence_markdown_exporter.http_cache import HttpCache
+from confluence_markdown_exporter.rate_limiter import RATE_LIMIT_STATUS_CODES
+from confluence_markdown_exporter.rate_limiter import RateLimiter
+from confluence_markdown_exporter.rate_limiter import retry_delay
+from confluence_markdown_exporter.utils.app_data_store import ConnectionConfig
+
+# Hosts that serve attachment downloads after a redirect from the Confluence API
+MEDIA_HOST_PREFIXES = ("https://api.media.atlassian.com/",)
+
+# Connection options used to build the transport rather than passed to the SDK clients
+TRANSPORT_OPTIONS = frozenset(
+    {
+        "pool_connections",
+        "pool_maxsize",
+        "pool_block",
+        "media_pool_maxsize",
+        "keep_alive",
+        "connect_timeout",
+        "read_timeout",
+        "requests_per_second",
+        "http_cache",
+    }
+)
+
+
+class SharedRetry(Retry):
+    """Retry policy that pauses all workers together when the server rate limits.
+
+    On 429 and 503 the delay from `Retry-After`/`X-RateLimit-Reset`, or the exponential
+    backoff if neither is sent, is applied to the shared rate limiter instead of only
+    the thread that received the response.
+    """
+
+    def __init__(self, *args: Any, rate_limiter: RateLimiter | None = None, **kwargs: Any) -> None:  # noqa: ANN401
+        super().__init__(*args, **kwargs)
+        self.rate_limiter = rate_limiter
+
+    def new(self, **kw: Any) -> "SharedRetry":  # noqa: ANN401
+        retry = super().new(**kw)
+        retry.rate_limiter = self.rate_limiter
+        return retry
+
+    def sleep(self, response: BaseHTTPResponse | None = None) -> None:
+        if (
+            self.rate_limiter is None
+            or response is None
+            or response.status not in RATE_LIMIT_STATUS_CODES
+        ):
+            super().sleep(response)
+            return
+        delay = retry_delay(response.headers)
+        self.rate_limiter.pause(self.get_backoff_time() if delay is None else delay)
+        self.rate_limiter.acquire()
+
+
+class PooledHTTPAdapter(HTTPAdapter):
+    """HTTP adapter with a sized connection pool and fixed connect/read timeouts.
+
+    The SDK clients only support a single integer timeout, so the configured
+    timeouts replace whatever timeout is passed with the request. If a rate limiter
+    is given, every request waits for it before being sent. If a cache is given,
+    GET requests are revalidated against it.
+    """
+
+    def __init__(
+        self,
+        timeout: tuple[float, float],
+        rate_limiter: RateLimiter | None = None,
+        cache: HttpCache | None = None,
+        **kwargs: Any,  # noqa: ANN401
+    ) -> None:
+        self.timeout = timeout
+        self.rate_limiter = rate_limiter
+        self.cache = cache
+        super().__init__(**kwargs)
+
+    def send(
+        self,
+        request: requests.PreparedRequest,
+        stream: bool = False,  # noqa: FBT001, FBT002
+        timeout: object = None,
+        verify: bool | str = True,  # noqa: FBT001, FBT002
+        cert: Any = None,  # noqa: ANN401
+        proxies: Any = None,  # noqa: ANN401
+    ) -> requests.Response:
+        # Streamed responses are consumed by the caller and cannot be stored
+        cache = self.cache if request.method == "GET" and not stream else None
+        cached = cache.lookup(request) if cache is not None else None
+
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+        response = super().send(
+            cached.conditional_request(request) if cached is not None else request,
+            stream=stream,
+            timeout=self.timeout,
+            verify=verify,
+            cert=cert,
+            proxies=proxies,
+        )
+        # Retries are exhausted or disabled, still hold back the other workers
+        if self.rate_limiter is not None and response.status_code in RATE_LIMIT_STATUS_CODES:
+            delay = retry_delay(response.headers)
+            if delay is not None:
+                self.rate_limiter.pause(delay)
+
+        if cached is not None and response.status_code == 304:  # noqa: PLR2004
+            return cached.fill(response)
+        if cache is not None:
+            cache.store(request, response)
+        return response
+
+
+def build_retry(config: ConnectionConfig, rate_limiter: RateLimiter | None = None) -> Retry | int:
+    """Build the retry policy from the connection config, mirroring the SDK's own retries."""
+    if not config.backoff_and_retry:
+        return 0
+    return SharedRetry(
+        total=None,
+        status=config.max_backoff_retries,
+        allowed_methods=None,
+        status_forcelist=config.retry_status_codes,
+        backoff_factor=config.backoff_factor,
+        backoff_max=config.max_backoff_seconds,
+        respect_retry_after_header=True,
+        rate_limiter=rate_limiter,
+    )
+
+
+class HttpTransport:
+    """Connection pools shared by every API session of the process.
+
+    API requests go through one pool per host, attachment downloads redirected to the
+    Atlassian media host get a separate pool so they do not starve API requests.
+    API requests are throttled by one rate limiter shared by all sessions. If the HTTP
+    cache is enabled, GET responses of the API pool are cached on disk. Downloads from the
+    media host are not cached, they would fill the cache with attachment bodies.
+    """
+
+    def __init__(self, config: ConnectionConfig) -> None:
+        self.keep_alive = config.keep_alive
+        self.rate_limiter = RateLimiter(
+            config.requests_per_second, max_pause_seconds=config.max_backoff_seconds
+        )
+        self.cache = HttpCache() if config.http_cache else None
+        timeout = (config.connect_timeout, config.read_timeout)
+        self.api_adapter = PooledHTTPAdapter(
+            timeout=timeout,
+            rate_limiter=self.rate_limiter,
+            cache=self.cache,
+            pool_connections=config.pool_connections,
+            pool_maxsize=config.pool_maxsize,
+            pool_block=config.pool_block,
+            max_retries=build_retry(config, self.rate_limiter),
+        )
+        self.media_adapter = PooledHTTPAdapter(
+            timeout=timeout,
+            pool_connections=len(MEDIA_HOST_PREFIXES),
+            pool_maxsize=config.media_pool_maxsize,
+            pool_block=config.pool_block,
+            max_retries=build_retry(config),
+        )
+
+    def mount(self, session: requests.Session) -> requests.Session:
+        """Route all requests of the session through the shared pools.
+
+        Adapters mounted before, e.g. the SDK's per-URL retry adapter, are replaced.
+        """
+        session.adapters = OrderedDict()
+        session.mount("https://", self.api_adapter)
+        session.mount("http://", self.api_adapter)
+        for prefix in MEDIA_HOST_PREFIXES:
+            session.mount(prefix, self.media_adapter)
+        if not self.keep_alive:
+            session.headers["Connection"] = "close"
+        return session
+
+    def close(self) -> None:
+        self.api_adapter.close()
+        self.media_adapter.close()
+
+
+@lru_cache(maxsize=1)
+def _transport_for(config_json: str) -> HttpTransport:
+    return HttpTransport(ConnectionConfig.model_validate_json(config_json))
+
+
+def get_transport(config: ConnectionConfig) -> HttpTransport:
+    """Get the transport for the given connection config.
+
+    Clients created from the same config share one transport and thus one set of pools.
+    """
+    return _transport_for(config.model_dump_json())
@@ -2,6 +2,7 @@
 
 import json
 import os
+import threading
 from pathlib import Path
 from typing import Literal
 
@@ -69,6 +70,85 @@ class ConnectionConfig(BaseModel):
             "Set to False only if you are sure about the security of your connection."
         ),
     )
+    pool_connections: int = Field(
+        default=10,
+        title="Pooled Hosts",
+        description="Number of hosts for which a pool of open connections is kept.",
+    )
+    pool_maxsize: int = Field(
+        default=16,
+        title="Connections per Host",
+        description="Maximum number of open connections kept alive per host.",
+    )
+    pool_block: bool = Field(
+        default=False,
+        title="Limit Connections per Host",
+        description=(
+            "Wait for a free pooled connection instead of opening additional connections "
+            "when all connections to a host are in use."
+        ),
+    )
+    media_pool_maxsize: int = Field(
+        default=8,
+        title="Attachment Download Connections",
+        description=(
+            "Maximum number of open connections to the Atlassian media host "
+            "that serves attachment downloads."
+        ),
+    )
+    keep_alive: bool = Field(
+        default=True,
+        title="Keep-Alive",
+        description="Reuse connections across requests instead of closing them after each.",
+    )
+    connect_timeout: float = Field(
+        default=10,
+        title="Connect Timeout",
+        description="Seconds to wait for a connection to be established.",
+    )
+    read_timeout: float = Field(
+        default=75,
+        title="Read Timeout",
+        description="Seconds to wait for the server to send data.",
+    )
+    requests_per_second: float = Field(
+        default=0,
+        title="Requests per Second",
+        description=(
+            "Maximum number of API requests per second shared by all parallel workers. "
+            "Set to 0 for no limit. Independent of this setting, all workers pause together "
+            "when the server responds with 429 or 503 and a Retry-After or "
+            "X-RateLimit-Reset header."
+        ),
+        ge=0,
+    )
+    http_cache: bool = Field(
+        default=False,
+        title="HTTP Cache",
+        description=(
+            "Keep API responses in a cache of up to 256 MB in the app directory. Cached "
+            "responses are revalidated with the server on every request, unchanged "
+            "resources are then answered without transferring them again."
+        ),
+    )
+    max_concurrent_requests: int = Field(
+        default=16,
+        title="Concurrent Requests",
+        description=(
+            "Maximum number of API requests and downloads running in parallel during an export. "
+            "Set to 1 to export pages one after another."
+        ),
+        ge=1,
+    )
+    probe_ttl_seconds: int = Field(
+        default=0,
+        title="Connection Probe TTL",
+        description=(
+            "Number of seconds a successful credential check is remembered on disk. "
+            "Within this time new processes skip the connection check request. "
+            "Set to 0 to check the connection on every run."
+        ),
+    )
 
 
 class ApiDetails(BaseModel):
@@ -213,6 +293,75 @@ class ExportConfig(BaseModel):
         title="Page Breadcrumbs",
         description="Whether to include breadcrumb links at the top of the page.",
     )
+    space_index_ttl_seconds: int = Field(
+        default=0,
+        title="Space Index TTL",
+        description=(
+            "When exporting whole spaces, the titles and hierarchy of all pages are indexed "
+            "while the pages are listed. Number of seconds this index is kept on disk, so "
+            "later runs resolve the paths of pages that are not listed yet without requests. "
+            "The pages of a space are listed on every run. Set to 0 to not keep the index."
+        ),
+        ge=0,
+    )
+    descendant_listing: Literal["cql", "tree"] = Field(
+        default="cql",
+        title="Descendant Listing",
+        description=(
+            "How the pages below a page are listed. Options: cql, tree.\n"
+            "  - `cql` searches all descendants with CQL `ancestor=<page>`\n"
+            "  - `tree` lists the children level by level with parallel requests within "
+            "max_concurrent_requests, for instances where the CQL search is slow or truncated"
+        ),
+    )
+    attachment_listing: Literal["page", "space"] = Field(
+        default="page",
+        title="Attachment Listing",
+        description=(
+            "How attachments are listed when exporting whole spaces. Options: page, space.\n"
+            "  - `page` lists the attachments of each page with the page\n"
+            "  - `space` searches all attachments of the space up front with a few "
+            "bulk requests, which pays off with many attachments or `attachment_export_all`"
+        ),
+    )
+    concurrent_spaces: int = Field(
+        default=4,
+        title="Concurrent Spaces",
+        description=(
+            "Number of spaces exported at the same time when exporting all spaces. "
+            "The spaces share the `max_concurrent_requests` of the connection."
+        ),
+        ge=1,
+    )
+    page_batch_size: int = Field(
+        default=50,
+        title="Page Batch Size",
+        description=(
+            "Maximum number of pages fetched with a single search request when exporting "
+            "several pages. Smaller batches are used for pages with large bodies. "
+            "Set to 0 to fetch every page with its own request."
+        ),
+        ge=0,
+        le=250,
+    )
+    incremental: bool = Field(
+        default=False,
+        title="Incremental Export",
+        description=(
+            "Whether to skip listed pages whose version is unchanged since they were last "
+            "exported to the output path. Exported versions are kept in the manifest file "
+            "`.cme-manifest.json` in the output path."
+        ),
+    )
+    resume: bool = Field(
+        default=False,
+        title="Resume Export",
+        description=(
+            "Whether to skip listed pages that an interrupted export to the output path "
+            "completed already. Completed pages are journaled in `.cme-journal.jsonl` in the "
+            "output path until an export finishes."
+        ),
+    )
     filename_encoding: str = Field(
         default='"<":"_",">":"_",":":"_","\\"":"_","/":"_","\\\\":"_","|":"_","?":"_","*":"_","\\u0000":"_","[":"_","]":"_"',
         title="Filename Encoding",
@@ -251,30 +400,97 @@ class ConfigModel(BaseModel):
     auth: AuthConfig = Field(default_factory=AuthConfig, title="Authentication")
 
 
-def load_app_data() -> dict[str, dict]:
-    """Load application data from the config file, returning a validated dict."""
+class _SettingsSnapshot:
+    """Process-wide settings cache.
+
+    The config file is parsed and validated once and only reloaded when its modification time
+    or size changes. In-memory overrides are layered on top of the persisted settings and are
+    never written to disk.
+    """
+
+    def __init__(self) -> None:
+        self.lock = threading.RLock()
+        self.persisted: ConfigModel | None = None
+        self.effective: ConfigModel | None = None
+        self.file_stamp: tuple[int, int] | None = None
+        self.overrides: dict[str, object] = {}
+
+    def invalidate(self) -> None:
+        with self.lock:
+            self.persisted = None
+            self.effective = None
+            self.file_stamp = None
+
+
+_snapshot = _SettingsSnapshot()
+
+
+def _config_file_stamp() -> tuple[int, int] | None:
+    try:
+        stat = APP_CONFIG_PATH.stat()
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _read_config_file() -> ConfigModel:
     data = json.loads(APP_CONFIG_PATH.read_text()) if APP_CONFIG_PATH.exists() else {}
     try:
-        return ConfigModel(**data).model_dump()
+        return ConfigModel.model_validate(data)
     except ValidationError:
-        return ConfigModel().model_dump()
+        return ConfigModel()
+
+
+def _apply_overrides(config_model: ConfigModel, overrides: dict[str, object]) -> ConfigModel:
+    if not overrides:
+        return config_model
+    data = config_model.model_dump()
+    for path, value in overrides.items():
+        _set_by_path(data, path, value)
+    try:
+        return ConfigModel.model_validate(data)
+    except ValidationError as e:
+        raise ValueError(str(e)) from e
+
+
+def _persisted_settings() -> ConfigModel:
+    """Return the settings stored in the config file, reloading them if the file changed."""
+    with _snapshot.lock:
+        stamp = _config_file_stamp()
+        if _snapshot.persisted is None or stamp != _snapshot.file_stamp:
+            _snapshot.persisted = _read_config_file()
+            _snapshot.effective = None
+            _snapshot.file_stamp = stamp
+        return _snapshot.persisted
+
+
+def load_app_data() -> dict[str, dict]:
+    """Load application data from the config file, returning a validated dict."""
+    return _persisted_settings().model_dump()
 
 
 def save_app_data(config_model: ConfigModel) -> None:
     """Save application data to the config file using Pydantic serialization."""
     # Use Pydantic's model_dump_json which properly handles SecretStr serialization
     json_str = config_model.model_dump_json(indent=2)
-    APP_CONFIG_PATH.write_text(json_str)
+    with _snapshot.lock:
+        APP_CONFIG_PATH.write_text(json_str)
+        _snapshot.persisted = config_model
+        _snapshot.effective = None
+        _snapshot.file_stamp = _config_file_stamp()
 
 
 def get_settings() -> ConfigModel:
-    """Get the current application settings as a ConfigModel instance."""
-    data = load_app_data()
-    return ConfigModel(
-        export=ExportConfig(**data.get("export", {})),
-        connection_config=ConnectionConfig(**data.get("connection_config", {})),
-        auth=AuthConfig(**data.get("auth", {})),
-    )
+    """Get the current application settings as a ConfigModel instance.
+
+    The returned instance is shared across the process and includes in-memory overrides.
+    Treat it as read-only; use `set_setting` or `override_setting` to change values.
+    """
+    with _snapshot.lock:
+        persisted = _persisted_settings()
+        if _snapshot.effective is None:
+            _snapshot.effective = _apply_overrides(persisted, _snapshot.overrides)
+        return _snapshot.effective
 
 
 def _set_by_path(obj: dict, path: str, value: object) -> None:
@@ -299,6 +515,21 @@ def set_setting(path: str, value: object) -> None:
     save_app_data(settings)
 
 
+def override_setting(path: str, value: object) -> None:
+    """Override a setting by dot-path for the current process without saving it."""
+    with _snapshot.lock:
+        overrides = {**_snapshot.overrides, path: value}
+        _snapshot.effective = _apply_overrides(_persisted_settings(), overrides)
+        _snapshot.overrides = overrides
+
+
+def clear_overrides() -> None:
+    """Drop all in-memory setting overrides."""
+    with _snapshot.lock:
+        _snapshot.overrides = {}
+        _snapshot.effective = None
+
+
 def get_default_value_by_path(path: str | None = None) -> object:
     """Get the default value for a given config path, or the whole config if path is None."""
     model = ConfigModel()
@@ -1,12 +1,10 @@
 import json
 import re
+import uuid
 from pathlib import Path
 
 from confluence_markdown_exporter.utils.app_data_store import get_settings
 
-settings = get_settings()
-export_options = settings.export
-
 
 def parse_encode_setting(encode_setting: str) -> dict[str, str]:
     """Parse encoding setting containing character mapping.
@@ -47,17 +45,24 @@ def parse_encode_setting(encode_setting: str) -> dict[str, str]:
 
 
 def save_file(file_path: Path, content: str | bytes) -> None:
-    """Save content to a file, creating parent directories as needed."""
-    file_path.parent.mkdir(parents=True, exist_ok=True)
-    if isinstance(content, bytes):
-        with file_path.open("wb") as file:
-            file.write(content)
-    elif isinstance(content, str):
-        with file_path.open("w", encoding="utf-8") as file:
-            file.write(content)
-    else:
+    """Save content to a file, creating parent directories as needed.
+
+    The content is written to a temporary file that then replaces the file, so an
+    interrupted export never leaves a partially written file behind.
+    """
+    if isinstance(content, str):
+        content = content.encode("utf-8")
+    elif not isinstance(content, bytes):
         msg = "Content must be either a string or bytes."
         raise TypeError(msg)
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = file_path.with_name(f".cme-{uuid.uuid4().hex}.tmp")
+    try:
+        tmp_path.write_bytes(content)
+        tmp_path.replace(file_path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
 
 
 def sanitize_filename(filename: str) -> str:
@@ -72,6 +77,7 @@ def sanitize_filename(filename: str) -> str:
     Returns:
         A sanitized filename string.
     """
+    export_options = get_settings().export
     sanitized = filename
 
     if export_options.filename_encoding:
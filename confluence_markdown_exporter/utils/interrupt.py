@@ -0,0 +1,47 @@
+"""Stop long exports gracefully on Ctrl+C."""
+
+import logging
+import signal
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from types import FrameType
+
+logger = logging.getLogger(__name__)
+
+_stop = threading.Event()
+
+
+def stop_requested() -> bool:
+    """Whether Ctrl+C was pressed once and no new work should be started."""
+    return _stop.is_set()
+
+
+@contextmanager
+def graceful_interrupt() -> Iterator[None]:
+    """Let the work in progress finish when Ctrl+C is pressed.
+
+    The first Ctrl+C only sets `stop_requested`, so pages in progress are written and
+    recorded, and `KeyboardInterrupt` is raised once the block is done. A second Ctrl+C
+    raises `KeyboardInterrupt` right away. Outside the main thread signals cannot be
+    handled and the block runs unchanged.
+    """
+    if threading.current_thread() is not threading.main_thread():
+        yield
+        return
+
+    def handle(_signum: int, _frame: FrameType | None) -> None:
+        if _stop.is_set():
+            raise KeyboardInterrupt
+        _stop.set()
+        logger.warning("Interrupted, finishing the pages in progress. Press Ctrl+C again to abort.")
+
+    _stop.clear()
+    previous = signal.signal(signal.SIGINT, handle)
+    try:
+        yield
+    finally:
+        signal.signal(signal.SIGINT, previous)
+    if _stop.is_set():
+        _stop.clear()
+        raise KeyboardInterrupt
@@ -0,0 +1,76 @@
+"""Coalesce concurrent calls for the same key into a single call."""
+
+import functools
+import threading
+from collections.abc import Callable
+from collections.abc import Hashable
+from typing import Generic
+from typing import ParamSpec
+from typing import TypeVar
+from typing import cast
+
+P = ParamSpec("P")
+T = TypeVar("T")
+
+
+class _Call(Generic[T]):
+    def __init__(self) -> None:
+        self.owner = threading.get_ident()
+        self.done = threading.Event()
+        self.result: T | None = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight(Generic[T]):
+    """Make concurrent callers with the same key share the result of one call.
+
+    The first caller for a key runs the function, callers arriving while it is running
+    wait for it and receive the same result or exception. Results are not kept once the
+    call has finished, combine it with a cache for that.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, _Call[T]] = {}
+
+    def do(self, key: Hashable, func: Callable[[], T]) -> T:
+        with self._lock:
+            call = self._calls.get(key)
+            is_leader = call is None
+            if call is None:
+                call = self._calls[key] = _Call()
+
+        if not is_leader:
+            if call.owner == threading.get_ident():
+                # A nested call for the same key in the same thread would wait for itself
+                return func()
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return cast("T", call.result)
+
+        try:
+            call.result = func()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+
+def single_flight(func: Callable[P, T]) -> Callable[P, T]:
+    """Decorate a function so concurrent calls with equal arguments run it only once.
+
+    Place it below `functools.lru_cache` so concurrent cache misses share one call.
+    """
+    group: SingleFlight[T] = SingleFlight()
+
+    @functools.wraps(func)
+    def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+        key = (args, tuple(sorted(kwargs.items())))
+        return group.do(key, lambda: func(*args, **kwargs))
+
+    return wrapper
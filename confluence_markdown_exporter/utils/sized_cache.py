@@ -0,0 +1,88 @@
+"""Least recently used cache bounded by the approximate size of its values."""
+
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from collections.abc import Hashable
+from typing import Generic
+from typing import NamedTuple
+from typing import TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    entries: int
+    size: int
+    max_size: int
+
+
+class SizedCache(Generic[K, V]):
+    """Cache that evicts the least recently used values once their total size exceeds a budget.
+
+    The size of a value is estimated with `sizeof` when it is put into the cache, a value
+    larger than the whole budget is not cached at all.
+    """
+
+    def __init__(self, max_size: int, sizeof: Callable[[V], int]) -> None:
+        self.max_size = max_size
+        self._sizeof = sizeof
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[K, tuple[V, int]] = OrderedDict()
+        self._size = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: K, kind: type | None = None) -> V | None:
+        """Get a cached value, counting a hit or a miss.
+
+        Args:
+            key: Key of the value.
+            kind: Only count values of this type as hit, others are treated as missing.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or (kind is not None and not isinstance(entry[0], kind)):
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: K, value: V) -> None:
+        size = self._sizeof(value)
+        with self._lock:
+            self._store(key, value, size)
+
+    def add(self, key: K, value: V) -> None:
+        """Put a value unless the key is cached already, without counting a lookup."""
+        size = self._sizeof(value)
+        with self._lock:
+            if key not in self._entries:
+                self._store(key, value, size)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+            self.hits = self.misses = 0
+
+    def info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, len(self._entries), self._size, self.max_size)
+
+    def _store(self, key: K, value: V, size: int) -> None:
+        self._remove(key)
+        if size > self.max_size:
+            return
+        self._entries[key] = (value, size)
+        self._size += size
+        while self._size > self.max_size:
+            self._remove(next(iter(self._entries)))
+
+    def _remove(self, key: K) -> None:
+        if (entry := self._entries.pop(key, None)) is not None:
+            self._size -= entry[1]
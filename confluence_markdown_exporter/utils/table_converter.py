@@ -3,7 +3,6 @@ from typing import cast
 from bs4 import BeautifulSoup
 from bs4 import Tag
 from markdownify import MarkdownConverter
-from tabulate import tabulate
 
 
 def _get_int_attr(cell: Tag, attr: str, default: str = "1") -> int:
@@ -57,6 +56,8 @@ class TableConverter(MarkdownConverter):
     """Custom MarkdownConverter for converting HTML tables to markdown tables."""
 
     def convert_table(self, el: BeautifulSoup, text: str, parent_tags: list[str]) -> str:
+        from tabulate import tabulate
+
         rows = [
             cast("list[Tag]", tr.find_all(["td", "th"]))
             for tr in cast("list[Tag]", el.find_all("tr"))
@@ -0,0 +1 @@
+"""Benchmarks for confluence-markdown-exporter."""
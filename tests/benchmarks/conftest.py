@@ -0,0 +1,39 @@
+"""Fixtures for collecting and reporting benchmark results."""
+
+import json
+import os
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+_RESULTS: list[dict[str, Any]] = []
+
+
+@pytest.fixture
+def benchmark_results() -> list[dict[str, Any]]:
+    """Rows appended here are reported at the end of the test session."""
+    return _RESULTS
+
+
+def pytest_terminal_summary(terminalreporter: pytest.TerminalReporter) -> None:
+    """Print the collected benchmark rows and optionally write them to a JSON report.
+
+    The JSON report is written to the path in `CME_BENCHMARK_REPORT` if set.
+    """
+    if not _RESULTS:
+        return
+
+    if report_path := os.getenv("CME_BENCHMARK_REPORT"):
+        Path(report_path).write_text(json.dumps(_RESULTS, indent=2))
+
+    columns = list(dict.fromkeys(key for row in _RESULTS for key in row))
+    terminalreporter.write_sep("-", "benchmark results (ms)")
+    terminalreporter.write_line(" | ".join(f"{column:>22}" for column in columns))
+    for row in _RESULTS:
+        cells = [row.get(column, "") for column in columns]
+        terminalreporter.write_line(
+            " | ".join(
+                f"{cell:>22.1f}" if isinstance(cell, float) else f"{cell!s:>22}" for cell in cells
+            )
+        )
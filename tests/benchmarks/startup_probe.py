@@ -0,0 +1,100 @@
+"""Measure the fixed cost of one cf-export invocation up to its first Confluence API call.
+
+Run as a script in a fresh interpreter, e.g. `python startup_probe.py pages 123`. The Confluence
+SDK is replaced by a stub that stops the process at the first real API call. The phase timings
+are written to stdout as JSON.
+"""
+
+import contextlib
+import io
+import json
+import sys
+import time
+from collections.abc import Generator
+from typing import Any
+
+START = time.perf_counter()
+
+EXPORT_COMMANDS = {"pages", "pages-with-descendants", "spaces", "all-spaces"}
+SETTINGS_COMMANDS = EXPORT_COMMANDS | {"config"}
+
+
+class FirstApiCall(BaseException):
+    """Raised by the stub client when a command reaches its first useful API call.
+
+    Derives from BaseException so the exporter's error handling does not swallow it.
+    """
+
+
+class StubConfluence:
+    """Stand-in for the Confluence SDK that answers the connection probe only."""
+
+    url = "https://bench.atlassian.net/"
+
+    def __init__(self, **_kwargs: object) -> None:
+        import requests
+
+        self.session = self._session = requests.Session()
+
+    def get(self, path: str, *_args: object, **_kwargs: object) -> dict[str, Any]:
+        if path == "rest/api/user/current":
+            return {"type": "known"}
+        msg = f"get {path}"
+        raise FirstApiCall(msg)
+
+    def __getattr__(self, name: str) -> Any:  # noqa: ANN401
+        def api_call(*_args: object, **_kwargs: object) -> None:
+            raise FirstApiCall(name)
+
+        return api_call
+
+
+@contextlib.contextmanager
+def phase(timings: dict[str, Any], name: str) -> Generator[None, None, None]:
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[f"{name}_ms"] = (time.perf_counter() - start) * 1000
+
+
+def run(argv: list[str]) -> dict[str, Any]:
+    timings: dict[str, Any] = {"command": argv[0], "first_api_call": None}
+
+    with phase(timings, "cli_import"):
+        import confluence_markdown_exporter.main as cli
+
+    if argv[0] in EXPORT_COMMANDS:
+        with phase(timings, "exporter_import"):
+            import confluence_markdown_exporter.confluence  # noqa: F401
+
+    if argv[0] in SETTINGS_COMMANDS:
+        from confluence_markdown_exporter.utils.app_data_store import get_settings
+
+        with phase(timings, "settings_load"):
+            get_settings()
+
+    if argv[0] in EXPORT_COMMANDS:
+        from unittest.mock import patch
+
+        from confluence_markdown_exporter import api_clients
+
+        # The cached client is reused by the command below
+        with (
+            patch.object(api_clients, "ConfluenceApiSdk", StubConfluence),
+            phase(timings, "client_construction"),
+        ):
+            api_clients.get_confluence_instance()
+
+    with phase(timings, "dispatch"), contextlib.redirect_stdout(io.StringIO()):
+        try:
+            cli.app(argv, standalone_mode=False)
+        except FirstApiCall as call:
+            timings["first_api_call"] = str(call)
+
+    timings["in_process_ms"] = (time.perf_counter() - START) * 1000
+    return timings
+
+
+if __name__ == "__main__":
+    sys.stdout.write(json.dumps(run(sys.argv[1:])))
@@ -0,0 +1,119 @@
+"""Benchmark listing the descendants of a page with CQL against the parallel tree walk.
+
+Both strategies run against a simulated Confluence instance that answers every request
+after a fixed latency. Set `CME_LISTING_LATENCY_MS` to model a slower instance and
+`CME_SEARCH_LATENCY_MS` to model CQL searches that are slower than plain listings.
+"""
+
+import os
+import threading
+import time
+from collections.abc import Generator
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+
+from confluence_markdown_exporter.confluence import PageListing
+from confluence_markdown_exporter.confluence import page_cache
+from confluence_markdown_exporter.utils.app_data_store import ConfigModel
+
+LATENCY_S = float(os.getenv("CME_LISTING_LATENCY_MS", "5")) / 1000
+SEARCH_LATENCY_S = float(os.getenv("CME_SEARCH_LATENCY_MS", "5")) / 1000
+BRANCHING = 6
+DEPTH = 3
+SEARCH_LIMIT = 100
+
+
+def build_tree() -> dict[int, list[int]]:
+    tree: dict[int, list[int]] = {}
+    level, next_id = [1], 2
+    for _ in range(DEPTH):
+        next_level = []
+        for parent in level:
+            tree[parent] = list(range(next_id, next_id + BRANCHING))
+            next_level += tree[parent]
+            next_id += BRANCHING
+        level = next_level
+    return tree
+
+
+class SimulatedConfluence:
+    """Answer page, child and CQL requests for a generated page tree after a fixed latency."""
+
+    def __init__(self, tree: dict[int, list[int]]) -> None:
+        self.tree = tree
+        self.descendants = sorted(child for children in tree.values() for child in children)
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    def _respond(self, latency_s: float = LATENCY_S) -> None:
+        with self._lock:
+            self.requests += 1
+        time.sleep(latency_s)
+
+    def get_page_by_id(self, page_id: int, **_: Any) -> dict[str, Any]:  # noqa: ANN401
+        self._respond()
+        return {"id": page_id, "title": f"Page {page_id}", "ancestors": []}
+
+    def get_space(self, space_key: str, **_: Any) -> dict[str, Any]:  # noqa: ANN401
+        return {"key": space_key, "name": space_key, "homepage": {"id": 1}}
+
+    def get(self, path: str, params: dict[str, Any] | None = None) -> dict[str, Any]:
+        if path.startswith("/search?start="):
+            self._respond(SEARCH_LATENCY_S)
+            return self._search_page(int(path.rsplit("=", maxsplit=1)[-1]))
+        if path == "rest/api/content/search":
+            self._respond(SEARCH_LATENCY_S)
+            return self._search_page(0)
+        self._respond()
+        page_id = int(path.split("/")[-3])
+        return {
+            "results": [
+                {"id": str(child), "title": f"Page {child}"} for child in self.tree.get(page_id, [])
+            ]
+        }
+
+    def _search_page(self, start: int) -> dict[str, Any]:
+        results = self.descendants[start : start + SEARCH_LIMIT]
+        links: dict[str, str] = {}
+        if start + SEARCH_LIMIT < len(self.descendants):
+            links["next"] = f"/search?start={start + SEARCH_LIMIT}"
+        return {
+            "results": [{"id": str(page_id)} for page_id in results],
+            "totalSize": len(self.descendants),
+            "_links": links,
+        }
+
+
+@pytest.fixture
+def simulated() -> Generator[SimulatedConfluence, None, None]:
+    client = SimulatedConfluence(build_tree())
+    page_cache.clear()
+    with patch(
+        "confluence_markdown_exporter.confluence.get_confluence_instance", return_value=client
+    ):
+        yield client
+    page_cache.clear()
+
+
+@pytest.mark.parametrize("strategy", ["cql", "tree"])
+def test_descendant_listing(
+    strategy: str, simulated: SimulatedConfluence, benchmark_results: list[dict[str, Any]]
+) -> None:
+    """Measure how long each strategy takes to list all descendants."""
+    settings = ConfigModel.model_validate({"export": {"descendant_listing": strategy}})
+    with patch("confluence_markdown_exporter.confluence.get_settings", return_value=settings):
+        start = time.perf_counter()
+        page_ids = list(PageListing(roots=[1]))
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+    benchmark_results.append(
+        {
+            "command": f"list descendants ({strategy})",
+            "pages": float(len(page_ids)),
+            "requests": float(simulated.requests),
+            "listing_ms": elapsed_ms,
+        }
+    )
+    assert sorted(page_ids) == simulated.descendants
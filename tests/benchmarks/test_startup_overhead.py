@@ -0,0 +1,81 @@
+"""Benchmark the fixed cost per cf-export invocation up to its first useful work.
+
+Every command runs in a fresh interpreter against a stubbed Confluence client, see
+`startup_probe.py`. The timings are reported at the end of the test session.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+PROBE_SCRIPT = Path(__file__).parent / "startup_probe.py"
+
+# Budget for the whole process, from spawning the interpreter to the first API call.
+WALL_TIME_BUDGET_MS = float(os.getenv("CME_STARTUP_BUDGET_MS", "5000"))
+
+
+@pytest.fixture(scope="module")
+def probe_config(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Create a config file with Confluence credentials so no interactive prompt is shown."""
+    config_path = tmp_path_factory.mktemp("config") / "app_data.json"
+    config_path.write_text(
+        json.dumps(
+            {
+                "auth": {
+                    "confluence": {
+                        "url": "https://bench.atlassian.net/",
+                        "username": "bench@example.com",
+                        "api_token": "bench-token",
+                    }
+                },
+                "export": {"output_path": str(config_path.parent / "output")},
+            }
+        )
+    )
+    return config_path
+
+
+def run_probe(args: list[str], config_path: Path) -> dict[str, Any]:
+    start = time.perf_counter()
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, str(PROBE_SCRIPT), *args],
+        capture_output=True,
+        text=True,
+        check=True,
+        timeout=60,
+        env={**os.environ, "CME_CONFIG_PATH": str(config_path)},
+    )
+    wall_ms = (time.perf_counter() - start) * 1000
+    return {**json.loads(result.stdout), "wall_ms": wall_ms}
+
+
+@pytest.mark.parametrize(
+    ("args", "first_api_call"),
+    [
+        (["pages", "123"], "get_page_by_id"),
+        (["pages-with-descendants", "123"], "get_page_by_id"),
+        (["spaces", "KEY"], "get_space"),
+        (["all-spaces"], "get_all_spaces"),
+        (["config", "--show"], None),
+        (["version"], None),
+    ],
+    ids=["pages", "pages-with-descendants", "spaces", "all-spaces", "config-show", "version"],
+)
+def test_command_startup_overhead(
+    args: list[str],
+    first_api_call: str | None,
+    probe_config: Path,
+    benchmark_results: list[dict[str, Any]],
+) -> None:
+    """Measure how long a command takes to reach its first useful work."""
+    timings = run_probe(args, probe_config)
+    benchmark_results.append(timings)
+
+    assert timings["first_api_call"] == first_api_call
+    assert timings["wall_ms"] < WALL_TIME_BUDGET_MS
@@ -0,0 +1,91 @@
+"""Cold start benchmarks for the CLI based on `python -X importtime`."""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+# Budget for the cumulative import time of the CLI module in milliseconds.
+# Before heavy dependencies were deferred this was ~330 ms on a developer machine.
+IMPORT_TIME_BUDGET_MS = float(os.getenv("CME_IMPORT_TIME_BUDGET_MS", "200"))
+
+# Modules that must not be loaded just to start the CLI.
+HEAVY_MODULES = [
+    "atlassian",
+    "bs4",
+    "markdownify",
+    "prompt_toolkit",
+    "pydantic",
+    "questionary",
+    "requests",
+    "tabulate",
+    "yaml",
+]
+
+
+def import_times(*args: str, env: dict[str, str] | None = None) -> dict[str, int]:
+    """Run python with `-X importtime` and return cumulative import times in microseconds."""
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-X", "importtime", *args],
+        capture_output=True,
+        text=True,
+        check=True,
+        timeout=30,
+        env={**os.environ, **(env or {})},
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = (part.strip() for part in line.split("|"))
+        times[name] = int(cumulative)
+    return times
+
+
+def top_level_modules(times: dict[str, int]) -> set[str]:
+    return {name.split(".")[0] for name in times}
+
+
+def test_cli_import_time_within_budget() -> None:
+    """Test that importing the CLI stays below the cold start budget."""
+    # Use the best of a few runs to reduce noise from the machine
+    best_ms = min(
+        import_times("-c", "import confluence_markdown_exporter.main")[
+            "confluence_markdown_exporter.main"
+        ]
+        / 1000
+        for _ in range(3)
+    )
+
+    assert best_ms < IMPORT_TIME_BUDGET_MS, (
+        f"Importing the CLI took {best_ms:.1f} ms, budget is {IMPORT_TIME_BUDGET_MS:.1f} ms"
+    )
+
+
+def test_cli_import_does_not_load_heavy_modules() -> None:
+    """Test that importing the CLI does not load heavy dependencies."""
+    loaded = top_level_modules(import_times("-c", "import confluence_markdown_exporter.main"))
+
+    assert not loaded & set(HEAVY_MODULES)
+
+
+def test_version_command_does_not_load_heavy_modules() -> None:
+    """Test that the version command only loads the CLI framework."""
+    loaded = top_level_modules(import_times("-m", "confluence_markdown_exporter.main", "version"))
+
+    assert not loaded & set(HEAVY_MODULES)
+
+
+def test_config_show_does_not_load_client_modules(tmp_path: Path) -> None:
+    """Test that showing the config does not load API clients or the interactive menu."""
+    loaded = top_level_modules(
+        import_times(
+            "-m",
+            "confluence_markdown_exporter.main",
+            "config",
+            "--show",
+            env={"CME_CONFIG_PATH": str(tmp_path / "app_data.json")},
+        )
+    )
+
+    assert not loaded & {"atlassian", "bs4", "prompt_toolkit", "questionary", "requests"}
@@ -1,5 +1,6 @@
 """Unit tests for api_clients module."""
 
+from pathlib import Path
 from unittest.mock import MagicMock
 from unittest.mock import patch
 
@@ -10,6 +11,9 @@ from atlassian.errors import ApiError
 from confluence_markdown_exporter.api_clients import ApiClientFactory
 from confluence_markdown_exporter.api_clients import get_confluence_instance
 from confluence_markdown_exporter.api_clients import get_jira_instance
+from confluence_markdown_exporter.api_clients import is_probe_fresh
+from confluence_markdown_exporter.api_clients import probe_key
+from confluence_markdown_exporter.api_clients import record_probe
 from confluence_markdown_exporter.api_clients import response_hook
 from confluence_markdown_exporter.utils.app_data_store import ApiDetails
 from confluence_markdown_exporter.utils.app_data_store import ConfigModel
@@ -62,7 +66,7 @@ class TestApiClientFactory:
     ) -> None:
         """Test successful Confluence client creation."""
         mock_instance = MagicMock()
-        mock_instance.get_all_spaces.return_value = [{"key": "TEST"}]
+        mock_instance.get.return_value = {"type": "known", "accountId": "abc"}
         mock_confluence_sdk.return_value = mock_instance
 
         config = {"timeout": 30}
@@ -78,7 +82,8 @@ class TestApiClientFactory:
             token=sample_api_details.pat.get_secret_value(),
             timeout=30,
         )
-        mock_instance.get_all_spaces.assert_called_once_with(limit=1)
+        mock_instance.get.assert_called_once_with("rest/api/user/current")
+        mock_instance.get_all_spaces.assert_not_called()
 
     @patch("confluence_markdown_exporter.api_clients.ConfluenceApiSdk")
     def test_create_confluence_connection_failure(
@@ -86,7 +91,7 @@ class TestApiClientFactory:
     ) -> None:
         """Test Confluence client creation with connection failure."""
         mock_instance = MagicMock()
-        mock_instance.get_all_spaces.side_effect = ApiError("Connection failed")
+        mock_instance.get.side_effect = ApiError("Connection failed")
         mock_confluence_sdk.return_value = mock_instance
 
         config = {"timeout": 30}
@@ -101,7 +106,7 @@ class TestApiClientFactory:
     ) -> None:
         """Test successful Jira client creation."""
         mock_instance = MagicMock()
-        mock_instance.get_all_projects.return_value = [{"key": "TEST"}]
+        mock_instance.myself.return_value = {"accountId": "abc"}
         mock_jira_sdk.return_value = mock_instance
 
         config = {"timeout": 30}
@@ -117,7 +122,23 @@ class TestApiClientFactory:
             token=sample_api_details.pat.get_secret_value(),
             timeout=30,
         )
-        mock_instance.get_all_projects.assert_called_once()
+        mock_instance.myself.assert_called_once()
+        mock_instance.get_all_projects.assert_not_called()
+
+    @patch("confluence_markdown_exporter.api_clients.JiraApiSdk")
+    def test_create_uses_shared_transport(
+        self, mock_jira_sdk: MagicMock, sample_api_details: ApiDetails
+    ) -> None:
+        """Test that transport options are not passed to the SDK and the session is pooled."""
+        mock_instance = MagicMock()
+        mock_jira_sdk.return_value = mock_instance
+        transport = MagicMock()
+
+        factory = ApiClientFactory({"timeout": 30, "pool_maxsize": 4}, transport=transport)
+        factory.create_jira(sample_api_details)
+
+        assert "pool_maxsize" not in mock_jira_sdk.call_args.kwargs
+        transport.mount.assert_called_once_with(mock_instance._session)
 
     @patch("confluence_markdown_exporter.api_clients.JiraApiSdk")
     def test_create_jira_connection_failure(
@@ -125,7 +146,7 @@ class TestApiClientFactory:
     ) -> None:
         """Test Jira client creation with connection failure."""
         mock_instance = MagicMock()
-        mock_instance.get_all_projects.side_effect = ApiError("Connection failed")
+        mock_instance.myself.side_effect = ApiError("Connection failed")
         mock_jira_sdk.return_value = mock_instance
 
         config = {"timeout": 30}
@@ -134,6 +155,80 @@ class TestApiClientFactory:
         with pytest.raises(ConnectionError, match="Jira connection failed"):
             factory.create_jira(sample_api_details)
 
+    @patch("confluence_markdown_exporter.api_clients.ConfluenceApiSdk")
+    def test_factory_options_not_passed_to_sdk(
+        self, mock_confluence_sdk: MagicMock, sample_api_details: ApiDetails
+    ) -> None:
+        """Test that options handled by the factory are not forwarded to the SDK."""
+        factory = ApiClientFactory({"timeout": 30, "probe_ttl_seconds": 0})
+
+        factory.create_confluence(sample_api_details)
+
+        assert "probe_ttl_seconds" not in mock_confluence_sdk.call_args.kwargs
+        assert mock_confluence_sdk.call_args.kwargs["timeout"] == 30
+
+
+class TestConnectionProbe:
+    """Test cases for the on-disk connection probe record."""
+
+    @patch("confluence_markdown_exporter.api_clients.ConfluenceApiSdk")
+    def test_probe_skipped_within_ttl(
+        self,
+        mock_confluence_sdk: MagicMock,
+        sample_api_details: ApiDetails,
+        tmp_path: Path,
+    ) -> None:
+        """Test that a recorded probe skips the identity request within the TTL."""
+        mock_instance = MagicMock()
+        mock_confluence_sdk.return_value = mock_instance
+        factory = ApiClientFactory({"probe_ttl_seconds": 3600})
+
+        with patch(
+            "confluence_markdown_exporter.api_clients.PROBE_RECORD_PATH",
+            tmp_path / "connection_probes.json",
+        ):
+            factory.create_confluence(sample_api_details)
+            factory.create_confluence(sample_api_details)
+
+        mock_instance.get.assert_called_once_with("rest/api/user/current")
+
+    @patch("confluence_markdown_exporter.api_clients.ConfluenceApiSdk")
+    def test_probe_always_runs_without_ttl(
+        self,
+        mock_confluence_sdk: MagicMock,
+        sample_api_details: ApiDetails,
+        tmp_path: Path,
+    ) -> None:
+        """Test that the probe runs on every creation when the TTL is disabled."""
+        mock_instance = MagicMock()
+        mock_confluence_sdk.return_value = mock_instance
+        factory = ApiClientFactory({"probe_ttl_seconds": 0})
+        record_path = tmp_path / "connection_probes.json"
+
+        with patch("confluence_markdown_exporter.api_clients.PROBE_RECORD_PATH", record_path):
+            factory.create_confluence(sample_api_details)
+            factory.create_confluence(sample_api_details)
+
+        assert mock_instance.get.call_count == 2
+        assert not record_path.exists()
+
+    def test_probe_record_does_not_store_secrets(
+        self, sample_api_details: ApiDetails, tmp_path: Path
+    ) -> None:
+        """Test that the probe record only contains hashed auth scopes."""
+        record_path = tmp_path / "connection_probes.json"
+
+        with patch("confluence_markdown_exporter.api_clients.PROBE_RECORD_PATH", record_path):
+            key = probe_key("confluence", sample_api_details)
+            record_probe(key)
+            assert is_probe_fresh(key, 60)
+            assert not is_probe_fresh(key, 0)
+            assert not is_probe_fresh(probe_key("jira", sample_api_details), 60)
+
+        content = record_path.read_text()
+        assert sample_api_details.api_token.get_secret_value() not in content
+        assert sample_api_details.pat.get_secret_value() not in content
+
 
 class TestGetConfluenceInstance:
     """Test cases for get_confluence_instance function."""
@@ -153,6 +248,9 @@ class TestGetConfluenceInstance:
         mock_factory.create_confluence.return_value = mock_confluence
         mock_factory_class.return_value = mock_factory
 
+        # Clear cache to ensure fresh call
+        get_confluence_instance.cache_clear()
+
         result = get_confluence_instance()
 
         assert result == mock_confluence
@@ -163,8 +261,8 @@ class TestGetConfluenceInstance:
 
     @patch("confluence_markdown_exporter.api_clients.get_settings")
     @patch("confluence_markdown_exporter.api_clients.ApiClientFactory")
-    @patch("confluence_markdown_exporter.api_clients.main_config_menu_loop")
-    @patch("confluence_markdown_exporter.api_clients.questionary.print")
+    @patch("confluence_markdown_exporter.utils.config_interactive.main_config_menu_loop")
+    @patch("questionary.print")
     def test_connection_failure_retry(
         self,
         mock_questionary_print: MagicMock,
@@ -186,6 +284,8 @@ class TestGetConfluenceInstance:
         ]
         mock_factory_class.return_value = mock_factory
 
+        get_confluence_instance.cache_clear()
+
         result = get_confluence_instance()
 
         assert result == mock_confluence
@@ -193,6 +293,27 @@ class TestGetConfluenceInstance:
         mock_questionary_print.assert_called_once()
         mock_config_menu.assert_called_once_with("auth.confluence")
 
+    @patch("confluence_markdown_exporter.api_clients.get_settings")
+    @patch("confluence_markdown_exporter.api_clients.ApiClientFactory")
+    def test_caching_behavior(
+        self,
+        mock_factory_class: MagicMock,
+        mock_get_settings: MagicMock,
+        sample_config_model: ConfigModel,
+    ) -> None:
+        """Test that the Confluence instance is created once and then reused."""
+        mock_get_settings.return_value = sample_config_model
+        mock_factory = MagicMock()
+        mock_factory_class.return_value = mock_factory
+
+        get_confluence_instance.cache_clear()
+
+        result1 = get_confluence_instance()
+        result2 = get_confluence_instance()
+
+        assert result1 is result2
+        assert mock_factory.create_confluence.call_count == 1
+
 
 class TestGetJiraInstance:
     """Test cases for get_jira_instance function."""
@@ -0,0 +1,836 @@
+"""Unit tests for confluence module."""
+
+import asyncio
+import threading
+import time
+from collections.abc import Generator
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+from unittest.mock import MagicMock
+from unittest.mock import patch
+
+import pytest
+from requests import HTTPError
+
+from confluence_markdown_exporter.confluence import PAGE_EXPAND
+from confluence_markdown_exporter.confluence import Attachment
+from confluence_markdown_exporter.confluence import Organization
+from confluence_markdown_exporter.confluence import Page
+from confluence_markdown_exporter.confluence import PageBatchLoader
+from confluence_markdown_exporter.confluence import PageListing
+from confluence_markdown_exporter.confluence import PageStub
+from confluence_markdown_exporter.confluence import PageTreeWalker
+from confluence_markdown_exporter.confluence import Space
+from confluence_markdown_exporter.confluence import export_pages
+from confluence_markdown_exporter.confluence import page_cache
+from confluence_markdown_exporter.manifest import clear_manifests
+from confluence_markdown_exporter.manifest import load_manifest
+from confluence_markdown_exporter.space_index import SpaceTreeIndex
+from confluence_markdown_exporter.utils.app_data_store import ConfigModel
+from confluence_markdown_exporter.utils.export import save_file
+
+SPACE_JSON = {"key": "TEST", "name": "Test Space", "homepage": {"id": 1}}
+
+
+def page_json(page_id: int, title: str, ancestors: list[int], **extra: Any) -> dict[str, Any]:  # noqa: ANN401
+    return {
+        "id": page_id,
+        "title": title,
+        "_expandable": {"space": "/rest/api/space/TEST"},
+        "ancestors": [{"id": ancestor} for ancestor in ancestors],
+        **extra,
+    }
+
+
+PAGES = {
+    1: page_json(1, "Home", []),
+    2: page_json(2, "Parent", [1]),
+    3: page_json(3, "Child", [1, 2], body={"view": {"value": "<p>Hello</p>"}}),
+    4: page_json(
+        4,
+        "Image",
+        [1],
+        body={"view": {"value": '<img src="/download/attachments/4/a.png" data-media-id="f1">'}},
+    ),
+    5: page_json(
+        5,
+        "Macros",
+        [1],
+        body={
+            "view": {
+                "value": '<div data-macro-name="toc"></div><a href="/createpage.action">New</a>'
+            }
+        },
+    ),
+}
+
+
+@pytest.fixture
+def confluence() -> Generator[MagicMock, None, None]:
+    """Patch the Confluence client with a small page tree and fresh caches."""
+    client = MagicMock()
+    client.get_space.return_value = SPACE_JSON
+    client.get_page_by_id.side_effect = lambda page_id, **_: PAGES[page_id]
+    client.get_attachments_from_content.return_value = {"results": [], "size": 0}
+    page_cache.clear()
+    Space.from_key.cache_clear()
+    with patch("confluence_markdown_exporter.confluence.get_confluence_instance") as get_client:
+        get_client.return_value = client
+        yield client
+    page_cache.clear()
+    Space.from_key.cache_clear()
+
+
+def fetched_expands(client: MagicMock) -> dict[int, str | None]:
+    return {
+        call.args[0]: call.kwargs.get("expand") for call in client.get_page_by_id.call_args_list
+    }
+
+
+class TestPageStub:
+    """Test cases for PageStub class."""
+
+    def test_from_id_fetches_no_content(self, confluence: MagicMock) -> None:
+        """Test that a stub is fetched with ancestors only and without attachments."""
+        stub = PageStub.from_id(2)
+
+        assert stub.title == "Parent"
+        assert stub.ancestors == []
+        confluence.get_page_by_id.assert_called_once_with(2, expand="ancestors")
+        confluence.get_attachments_from_content.assert_not_called()
+
+    def test_export_path_uses_stubs_for_ancestors(self, confluence: MagicMock) -> None:
+        """Test that only the exported page is hydrated, its ancestors are stubs."""
+        page = Page.from_id(3)
+
+        assert page.export_path == Path("Test Space/Home/Parent/Child.md")
+        expands = fetched_expands(confluence)
+        assert expands[1] == expands[2] == "ancestors"
+        assert "body.view" in str(expands[3])
+
+    def test_from_id_uses_space_index(self, confluence: MagicMock) -> None:
+        """Test that pages in a loaded space index are resolved without page requests."""
+        index = SpaceTreeIndex.from_listing("TEST", PAGES.values())
+        with patch(
+            "confluence_markdown_exporter.confluence.find_indexed_page",
+            side_effect=lambda page_id: (index, index.pages[page_id]),
+        ):
+            stub = PageStub.from_id(3)
+            stub_path = stub.export_path
+
+        assert stub_path == Path("Test Space/Home/Parent/Child.md")
+        confluence.get_page_by_id.assert_not_called()
+
+    def test_from_id_with_parent_not_indexed_yet(self, confluence: MagicMock) -> None:
+        """Test that a page listed before its parent gets the full ancestor chain."""
+        index = SpaceTreeIndex(space_key="TEST", built_at=0, pages={})
+        index.add(PAGES[1])
+        index.add(PAGES[3])
+        with patch(
+            "confluence_markdown_exporter.confluence.find_indexed_page",
+            side_effect=lambda page_id: (index, index.pages[page_id]) if page_id in index else None,
+        ):
+            stub_path = PageStub.from_id(3).export_path
+
+        assert stub_path == Path("Test Space/Home/Parent/Child.md")
+        assert list(fetched_expands(confluence)) == [2]
+
+    def test_inaccessible_page(self, confluence: MagicMock) -> None:
+        """Test that an inaccessible page yields a placeholder stub."""
+        confluence.get_page_by_id.side_effect = HTTPError("403")
+
+        stub = PageStub.from_id(99)
+
+        assert stub.title == "Page not accessible"
+        assert stub.ancestors == []
+
+
+class TestPage:
+    """Test cases for Page class."""
+
+    def test_from_id_is_cached(self, confluence: MagicMock) -> None:
+        """Test that a page is fetched once and counted as cache hit afterwards."""
+        assert Page.from_id(3) is Page.from_id(3)
+
+        assert confluence.get_page_by_id.call_count == 1
+        assert page_cache.info().hits == 1
+
+    def test_release_keeps_stub(self, confluence: MagicMock) -> None:
+        """Test that an exported page is demoted to a stub that still resolves links."""
+        page = Page.from_id(3)
+        size = page_cache.info().size
+
+        page.release()
+
+        stub = PageStub.from_id(3)
+        assert type(stub) is PageStub
+        assert stub.title == "Child"
+        assert page_cache.info().size < size
+        assert confluence.get_page_by_id.call_count == 1
+
+    def test_export_markdown_records_manifest(self, confluence: MagicMock, tmp_path: Path) -> None:
+        """Test that the exported version and file are recorded in the manifest."""
+        settings = ConfigModel.model_validate({"export": {"output_path": tmp_path}})
+        page = Page.from_json({**PAGES[3], "version": {"number": 7}})
+
+        with patch("confluence_markdown_exporter.confluence.get_settings", return_value=settings):
+            page.export_markdown()
+
+        entry = load_manifest(tmp_path).pages[3]
+        assert entry.version == 7
+        assert (tmp_path / entry.export_path).is_file()
+        clear_manifests()
+
+    def test_export_markdown_skips_unchanged_file(
+        self, confluence: MagicMock, tmp_path: Path
+    ) -> None:
+        """Test that a file recorded with the same content is not written again."""
+        settings = ConfigModel.model_validate({"export": {"output_path": tmp_path}})
+        page = Page.from_json({**PAGES[3], "version": {"number": 7}})
+
+        with (
+            patch("confluence_markdown_exporter.confluence.get_settings", return_value=settings),
+            patch(
+                "confluence_markdown_exporter.confluence.save_file", wraps=save_file
+            ) as mock_save,
+        ):
+            page.export_markdown()
+            page.export_markdown()
+
+        mock_save.assert_called_once()
+        clear_manifests()
+
+    def test_embedded_attachments(self, confluence: MagicMock) -> None:
+        """Test that attachments expanded with the page need no listing."""
+        attachment = {
+            "id": "att10",
+            "title": "a.png",
+            "extensions": {"fileId": "f1", "mediaType": "image/png"},
+            "_links": {"download": "/download/attachments/4/a.png"},
+        }
+        page = Page.from_json(
+            {**PAGES[4], "children": {"attachment": {"results": [attachment], "_links": {}}}}
+        )
+
+        assert [att.file_id for att in page.attachments] == ["f1"]
+        assert page.attachments[0].space.key == "TEST"
+        assert page.attachments[0].ancestors == [4]
+        confluence.get_attachments_from_content.assert_not_called()
+
+    def test_truncated_attachments_are_listed(self, confluence: MagicMock) -> None:
+        """Test that a truncated attachment expansion falls back to the listing."""
+        truncated = {"results": [], "_links": {"next": "/rest/api/content/4/child/attachment"}}
+        page = Page.from_json({**PAGES[4], "children": {"attachment": truncated}})
+
+        assert page.attachments == []
+        confluence.get_attachments_from_content.assert_called_once()
+
+    @patch("confluence_markdown_exporter.confluence.find_indexed_attachments")
+    def test_attachments_from_space_index(
+        self, mock_find: MagicMock, confluence: MagicMock
+    ) -> None:
+        """Test that attachments of an indexed space are not listed per page."""
+        mock_find.return_value = [
+            {
+                "id": "att10",
+                "title": "a.png",
+                "extensions": {"fileId": "f1"},
+                "container": {"id": "4", "ancestors": [{"id": "1"}]},
+            }
+        ]
+        page = Page.from_id(4)
+
+        assert [att.file_id for att in page.attachments] == ["f1"]
+        assert page.attachments[0].space.key == "TEST"
+        mock_find.assert_called_once_with("TEST", 4)
+        confluence.get_attachments_from_content.assert_not_called()
+
+    @pytest.mark.parametrize(
+        ("page_id", "expected"), [(1, "TEST/f1"), (3, "TEST/2/3/f1"), (7, "TEST/f1")]
+    )
+    def test_attachment_path_below_page(
+        self, confluence: MagicMock, page_id: int, expected: str
+    ) -> None:
+        """Test that attachment paths computed for relocation match those of the export."""
+        settings = ConfigModel.model_validate(
+            {"export": {"attachment_path": "{space_key}/{ancestor_ids}/{attachment_file_id}"}}
+        )
+        # Page 7 is a top-level page besides the homepage
+        container = {**PAGES.get(page_id, page_json(7, "Orphan", [])), "id": page_id}
+        attachment = {"id": "att10", "title": "a.png", "extensions": {"fileId": "f1"}}
+        with patch("confluence_markdown_exporter.confluence.get_settings", return_value=settings):
+            exported = Attachment.from_listing([attachment], container)[0]
+            path = Attachment.export_path_below(container, exported.path_vars)
+            exported_path = exported.export_path
+
+        assert path == exported_path == Path(expected)
+
+    def test_attachments_are_listed_on_first_access(self, confluence: MagicMock) -> None:
+        """Test that attachments are listed lazily and only once."""
+        page = Page.from_id(4)
+        confluence.get_attachments_from_content.assert_not_called()
+
+        assert page.attachments == []
+        assert page.attachments == []
+        confluence.get_attachments_from_content.assert_called_once()
+
+    @patch("confluence_markdown_exporter.confluence.get_settings")
+    def test_attachments_skipped_without_references(
+        self, mock_get_settings: MagicMock, confluence: MagicMock
+    ) -> None:
+        """Test that no listing is requested for a body without attachment references."""
+        mock_get_settings.return_value.export.attachment_export_all = False
+
+        page = Page.from_id(3)
+
+        assert page.attachments_to_export() == []
+        confluence.get_attachments_from_content.assert_not_called()
+
+    @patch("confluence_markdown_exporter.confluence.get_settings")
+    def test_attachments_listed_when_exporting_all(
+        self, mock_get_settings: MagicMock, confluence: MagicMock
+    ) -> None:
+        """Test that all attachments are listed regardless of the body."""
+        mock_get_settings.return_value.export.attachment_export_all = True
+
+        page = Page.from_id(3)
+
+        assert page.attachments == []
+        confluence.get_attachments_from_content.assert_called_once()
+
+    @patch("confluence_markdown_exporter.confluence.attachments_indexed", return_value=True)
+    def test_space_listing_skips_attachment_expansion(
+        self, mock_indexed: MagicMock, confluence: MagicMock
+    ) -> None:
+        """Test that attachments are not expanded when taken from the space index."""
+        Page.from_id(3)
+
+        assert "attachment" not in str(fetched_expands(confluence)[3])
+        mock_indexed.assert_called_once_with(3)
+
+    @patch("confluence_markdown_exporter.confluence.get_settings")
+    def test_attachments_expanded_without_space_index(
+        self, mock_get_settings: MagicMock, confluence: MagicMock
+    ) -> None:
+        """Test that pages outside an attachment-indexed space keep their attachments."""
+        mock_get_settings.return_value.export.attachment_listing = "space"
+
+        Page.from_id(3)
+
+        assert fetched_expands(confluence)[3] == PAGE_EXPAND
+
+    def test_from_id_fetches_view_only(self, confluence: MagicMock) -> None:
+        """Test that only the view representation is fetched with the page."""
+        Page.from_id(3)
+
+        confluence.get_page_by_id.assert_called_once_with(3, expand=PAGE_EXPAND)
+
+    def test_representations_fetched_together_on_demand(self, confluence: MagicMock) -> None:
+        """Test that all representations the view needs are fetched in one request."""
+        page = Page.from_id(5)
+        confluence.get_page_by_id.side_effect = None
+        confluence.get_page_by_id.return_value = {
+            "body": {"export_view": {"value": "<p>export</p>"}, "editor2": {"value": "<p>ed</p>"}}
+        }
+
+        assert page.body_export == "<p>export</p>"
+        assert page.editor2 == "<p>ed</p>"
+        confluence.get_page_by_id.assert_called_with(5, expand="body.export_view,body.editor2")
+        assert confluence.get_page_by_id.call_count == 2
+
+    def test_representation_from_json(self, confluence: MagicMock) -> None:
+        """Test that expanded representations are not fetched again."""
+        page = Page.from_json(page_json(6, "Full", [], body={"export_view": {"value": "<p>x</p>"}}))
+
+        assert page.body_export == "<p>x</p>"
+        confluence.get_page_by_id.assert_not_called()
+
+
+def search_response(results: list[dict[str, Any]], size: int = 1000) -> MagicMock:
+    response = MagicMock()
+    response.json.return_value = {"results": results, "_links": {}}
+    response.content = b"x" * size
+    return response
+
+
+class TestPageBatchLoader:
+    """Test cases for PageBatchLoader class."""
+
+    def test_load_searches_batch(self, confluence: MagicMock) -> None:
+        """Test that a batch is fetched with one search, keeping the requested order."""
+        confluence.get.return_value = search_response([PAGES[3], PAGES[2]])
+
+        pages = PageBatchLoader(50).load([2, 3])
+
+        assert [page.id for page in pages] == [2, 3]
+        assert confluence.get.call_args.kwargs["params"]["cql"] == "id in (2,3)"
+        assert "body.view" in confluence.get.call_args.kwargs["params"]["expand"]
+        confluence.get_page_by_id.assert_not_called()
+
+    def test_cached_pages_are_not_searched(self, confluence: MagicMock) -> None:
+        """Test that pages in the page cache are reused and searched pages are cached."""
+        cached = Page.from_json(PAGES[2])
+        page_cache.put(2, cached)
+        confluence.get.return_value = search_response([PAGES[3]])
+
+        pages = PageBatchLoader(50).load([2, 3])
+
+        assert pages[0] is cached
+        assert confluence.get.call_args.kwargs["params"]["cql"] == "id in (3)"
+        assert page_cache.get(3, Page) is pages[1]
+
+    def test_fully_cached_batch_is_not_searched(self, confluence: MagicMock) -> None:
+        """Test that no search is made when all pages of a batch are cached."""
+        page_cache.put(2, Page.from_json(PAGES[2]))
+
+        assert [page.id for page in PageBatchLoader(50).load([2])] == [2]
+        confluence.get.assert_not_called()
+
+    def test_missing_pages_fetched_one_by_one(self, confluence: MagicMock) -> None:
+        """Test that pages missing from the results are fetched individually."""
+        confluence.get.return_value = search_response([PAGES[2]])
+
+        pages = PageBatchLoader(50).load([2, 3])
+
+        assert [page.title for page in pages] == ["Parent", "Child"]
+        assert fetched_expands(confluence)[3] == PAGE_EXPAND
+
+    def test_failed_search_falls_back(self, confluence: MagicMock) -> None:
+        """Test that all pages are fetched individually when the search fails."""
+        confluence.get.return_value.raise_for_status.side_effect = HTTPError("500")
+
+        pages = PageBatchLoader(50).load([2, 3])
+
+        assert [page.title for page in pages] == ["Parent", "Child"]
+
+    def test_batch_size_adapts_to_payload(self) -> None:
+        """Test that the batch size follows the observed bytes per page."""
+        loader = PageBatchLoader(100, target_bytes=100_000)
+        assert loader.batch_size == 10
+
+        loader.record(10 * 20_000, 10)
+        assert loader.batch_size == 5
+
+        loader.record(10 * 200, 10)
+        assert loader.batch_size == 9
+
+    def test_next_batch_consumes_pending(self) -> None:
+        """Test that batches are taken from the front of the pending IDs."""
+        loader = PageBatchLoader(3)
+        pending = [1, 2, 3, 4]
+
+        assert loader.next_batch(pending) == [1, 2, 3]
+        assert loader.next_batch(pending) == [4]
+        assert pending == []
+
+
+class TestPageListing:
+    """Test cases for PageListing class."""
+
+    def test_yields_pages_as_results_arrive(self, confluence: MagicMock) -> None:
+        """Test that search results are yielded before the next page of results is fetched."""
+        confluence.get.side_effect = [
+            {"results": [{"id": "2"}], "totalSize": 2, "_links": {"next": "/search?cursor=x"}},
+            {"results": [{"id": "3"}], "_links": {}},
+        ]
+        listing = PageListing([1], roots=[1])
+        page_ids = iter(listing)
+
+        assert [next(page_ids), next(page_ids)] == [1, 2]
+        assert confluence.get.call_count == 1
+        assert listing.total == 3
+        assert list(page_ids) == [3]
+
+    def test_not_found_yields_nothing(self, confluence: MagicMock) -> None:
+        """Test that a search for missing content is skipped with a warning."""
+        confluence.get.side_effect = HTTPError("404", response=MagicMock(status_code=404))
+
+        assert list(PageListing(roots=[99])) == []
+
+    def test_errors_are_raised(self, confluence: MagicMock) -> None:
+        """Test that other errors are not swallowed."""
+        confluence.get.side_effect = HTTPError("500", response=MagicMock(status_code=500))
+
+        with pytest.raises(HTTPError):
+            list(PageListing(roots=[1]))
+
+    @patch("confluence_markdown_exporter.confluence.get_settings")
+    def test_tree_listing(self, mock_get_settings: MagicMock, confluence: MagicMock) -> None:
+        """Test that descendants are listed with the tree walker if configured."""
+        mock_get_settings.return_value.export.descendant_listing = "tree"
+        mock_get_settings.return_value.export.incremental = False
+        mock_get_settings.return_value.connection_config.max_concurrent_requests = 2
+        confluence.get.side_effect = child_listing(TREE)
+        listing = PageListing([1], roots=[1])
+
+        assert sorted(listing) == [1, 2, 3, 5]
+        assert listing.total == 4
+
+    def test_incremental_skips_unchanged_pages(self, confluence: MagicMock, tmp_path: Path) -> None:
+        """Test that pages listed in the version recorded in the manifest are skipped."""
+        settings = ConfigModel.model_validate(
+            {"export": {"incremental": True, "output_path": tmp_path}}
+        )
+        manifest = load_manifest(tmp_path)
+        manifest.record(2, 4, Path("Test Space/Home/Parent.md"), "# Parent")
+        manifest.record(3, 1, Path("Test Space/Home/Parent/Child.md"), "# Child")
+        (tmp_path / "Test Space/Home/Parent").mkdir(parents=True)
+        (tmp_path / "Test Space/Home/Parent.md").write_text("# Parent")
+        (tmp_path / "Test Space/Home/Parent/Child.md").write_text("# Child")
+        confluence.get.return_value = {
+            "results": [
+                {"id": "2", "version": {"number": 4}},
+                {"id": "3", "version": {"number": 2}},
+            ],
+            "totalSize": 2,
+        }
+        listing = PageListing([1], roots=[1])
+
+        with patch("confluence_markdown_exporter.confluence.get_settings", return_value=settings):
+            assert list(listing) == [1, 3]
+        assert listing.skipped == 1
+        assert listing.total == 2
+        assert confluence.get.call_args.kwargs["params"]["expand"] == "ancestors,version"
+        clear_manifests()
+
+    def test_resume_skips_completed_pages(self, confluence: MagicMock, tmp_path: Path) -> None:
+        """Test that pages completed by an unfinished export are skipped when resuming."""
+        settings = ConfigModel.model_validate({"export": {"resume": True, "output_path": tmp_path}})
+        load_manifest(tmp_path).record(2, 1, Path("Parent.md"), "# Parent")
+        (tmp_path / "Parent.md").write_text("# Parent")
+        clear_manifests()
+        confluence.get.return_value = {"results": [{"id": "2"}, {"id": "3"}], "totalSize": 2}
+        listing = PageListing([1], roots=[1])
+
+        with patch("confluence_markdown_exporter.confluence.get_settings", return_value=settings):
+            assert list(listing) == [1, 3]
+        assert listing.skipped == 1
+        clear_manifests()
+
+    def test_incremental_relocates_renamed_pages(
+        self, confluence: MagicMock, tmp_path: Path
+    ) -> None:
+        """Test that files of a renamed page and its children are moved and links rewritten."""
+        settings = ConfigModel.model_validate(
+            {"export": {"incremental": True, "output_path": tmp_path}}
+        )
+        files = {
+            2: ("Test Space/Home/Old.md", "# Parent"),
+            3: ("Test Space/Home/Old/Child.md", "[Up](../Old.md) [Macros](../Macros.md)"),
+            5: (
+                "Test Space/Home/Macros.md",
+                "[Child](Old/Child.md#intro) [Web](https://x.org/Old.md)",
+            ),
+        }
+        manifest = load_manifest(tmp_path)
+        for page_id, (path, content) in files.items():
+            manifest.record(page_id, 1, Path(path), content)
+            (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+            (tmp_path / path).write_text(content)
+        confluence.get.return_value = {
+            "results": [{**PAGES[page_id], "version": {"number": 1}} for page_id in files],
+            "totalSize": 3,
+        }
+
+        with patch("confluence_markdown_exporter.confluence.get_settings", return_value=settings):
+            assert list(PageListing(roots=[1])) == []
+
+        home = tmp_path / "Test Space/Home"
+        assert not (home / "Old").exists()
+        assert (home / "Parent.md").read_text() == "# Parent"
+        assert (home / "Parent/Child.md").read_text() == "[Up](../Parent.md) [Macros](../Macros.md)"
+        assert (home / "Macros.md").read_text() == (
+            "[Child](Parent/Child.md#intro) [Web](https://x.org/Old.md)"
+        )
+        assert manifest.pages[3].export_path == "Test Space/Home/Parent/Child.md"
+        clear_manifests()
+
+    def test_links_rewritten_when_listing_is_closed(
+        self, confluence: MagicMock, tmp_path: Path
+    ) -> None:
+        """Test that links to moved files are rewritten if the export stops the listing early."""
+        settings = ConfigModel.model_validate(
+            {"export": {"incremental": True, "output_path": tmp_path}}
+        )
+        files = {
+            2: ("Test Space/Home/Old.md", "# Parent"),
+            5: ("Test Space/Home/Macros.md", "[Parent](Old.md)"),
+        }
+        manifest = load_manifest(tmp_path)
+        for page_id, (path, content) in files.items():
+            manifest.record(page_id, 1, Path(path), content)
+            (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+            (tmp_path / path).write_text(content)
+        confluence.get.return_value = {
+            "results": [
+                {**PAGES[2], "version": {"number": 2}},
+                {**PAGES[5], "version": {"number": 1}},
+            ],
+            "totalSize": 2,
+        }
+
+        with patch("confluence_markdown_exporter.confluence.get_settings", return_value=settings):
+            listing = iter(PageListing(roots=[1]))
+            assert next(listing) == 2
+            listing.close()
+
+        home = tmp_path / "Test Space/Home"
+        assert (home / "Parent.md").read_text() == "# Parent"
+        assert (home / "Macros.md").read_text() == "[Parent](Parent.md)"
+        clear_manifests()
+
+    def test_incremental_relocates_to_listed_position(
+        self, confluence: MagicMock, tmp_path: Path
+    ) -> None:
+        """Test that files are moved to the position of the listing result, not a cached one."""
+        settings = ConfigModel.model_validate(
+            {"export": {"incremental": True, "output_path": tmp_path}}
+        )
+        manifest = load_manifest(tmp_path)
+        manifest.record(3, 1, Path("Test Space/Home/Child.md"), "# Child")
+        (tmp_path / "Test Space/Home").mkdir(parents=True)
+        (tmp_path / "Test Space/Home/Child.md").write_text("# Child")
+        page_cache.put(3, PageStub.from_json(page_json(3, "Child", [1])))
+        confluence.get.return_value = {
+            "results": [{**PAGES[3], "version": {"number": 1}}],
+            "totalSize": 1,
+        }
+
+        with patch("confluence_markdown_exporter.confluence.get_settings", return_value=settings):
+            assert list(PageListing(roots=[1])) == []
+
+        assert (tmp_path / "Test Space/Home/Parent/Child.md").read_text() == "# Child"
+        clear_manifests()
+
+
+TREE = {1: [2, 5], 2: [3]}
+
+
+def child_listing(tree: dict[int, list[int]]) -> Any:  # noqa: ANN401
+    def get(path: str, **_: Any) -> dict[str, Any]:  # noqa: ANN401
+        page_id = int(path.split("/")[-3])
+        return {
+            "results": [
+                {"id": str(child), "title": f"Page {child}"} for child in tree.get(page_id, [])
+            ]
+        }
+
+    return get
+
+
+class TestPageTreeWalker:
+    """Test cases for PageTreeWalker class."""
+
+    def test_walks_level_by_level(self, confluence: MagicMock) -> None:
+        """Test that all descendants are listed level by level in page order."""
+        confluence.get.side_effect = child_listing(TREE)
+        walker = PageTreeWalker(1, max_workers=4)
+
+        page_ids = list(walker)
+
+        assert page_ids == [2, 5, 3]
+        assert walker.results[3]["ancestors"] == [{"id": 1}, {"id": 2}]
+
+    def test_discovered_pages_are_cached_as_stubs(self, confluence: MagicMock) -> None:
+        """Test that the stubs of walked pages resolve without page requests."""
+        confluence.get.side_effect = child_listing(TREE)
+        list(PageTreeWalker(1, max_workers=4))
+        confluence.get_page_by_id.reset_mock()
+
+        stub = PageStub.from_id(3)
+
+        assert stub.title == "Page 3"
+        assert stub.ancestors == PageStub.from_json(PAGES[3]).ancestors
+        confluence.get_page_by_id.assert_not_called()
+
+
+class TestExportPages:
+    """Test cases for export_pages function."""
+
+    @pytest.mark.parametrize("max_concurrency", [1, 2])
+    @patch("confluence_markdown_exporter.confluence.get_settings")
+    def test_tree_walk_shares_request_budget(
+        self, mock_get_settings: MagicMock, max_concurrency: int, confluence: MagicMock
+    ) -> None:
+        """Test that the child listings of a tree walk and the page fetches share the budget."""
+        settings = mock_get_settings.return_value
+        settings.connection_config.max_concurrent_requests = max_concurrency
+        settings.export.page_batch_size = 0
+        settings.export.descendant_listing = "tree"
+        settings.export.incremental = settings.export.resume = False
+        tree = {1: list(range(2, 10)), 2: list(range(10, 16)), 3: [16, 17]}
+        lock = threading.Lock()
+        in_flight = [0]
+        peak = [0]
+
+        def tracked(func: Any) -> Any:  # noqa: ANN401
+            def call(*args: Any, **kwargs: Any) -> Any:  # noqa: ANN401
+                with lock:
+                    in_flight[0] += 1
+                    peak[0] = max(peak[0], in_flight[0])
+                time.sleep(0.005)
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    with lock:
+                        in_flight[0] -= 1
+
+            return call
+
+        confluence.get.side_effect = tracked(child_listing(tree))
+        confluence.get_page_by_id.side_effect = tracked(
+            lambda page_id, **_: page_json(page_id, f"Page {page_id}", [] if page_id == 1 else [1])
+        )
+        exported = []
+
+        async def export_page(_engine: object, page: Page) -> None:
+            exported.append(page.id)
+
+        with patch("confluence_markdown_exporter.confluence._export_page_async", new=export_page):
+            export_pages(PageListing(roots=[1]))
+
+        assert sorted(exported) == list(range(2, 18))
+        assert peak[0] <= max_concurrency
+
+    @pytest.mark.parametrize("batch_size", [0, 50])
+    @patch("confluence_markdown_exporter.confluence.get_settings")
+    def test_listing_error_after_listed_pages(
+        self, mock_get_settings: MagicMock, batch_size: int, confluence: MagicMock
+    ) -> None:
+        """Test that pages listed before an error are exported and the error is raised."""
+        mock_get_settings.return_value.connection_config.max_concurrent_requests = 2
+        mock_get_settings.return_value.export.page_batch_size = batch_size
+        confluence.get.return_value = search_response([PAGES[2], PAGES[3]])
+        exported = []
+
+        async def export_page(_engine: object, page: Page) -> None:
+            exported.append(page.id)
+
+        def listing() -> Iterator[int]:
+            yield 2
+            yield 3
+            msg = "500"
+            raise HTTPError(msg)
+
+        with (
+            patch("confluence_markdown_exporter.confluence._export_page_async", new=export_page),
+            pytest.raises(HTTPError),
+        ):
+            export_pages(listing())
+
+        assert sorted(exported) == [2, 3]
+
+    @patch("confluence_markdown_exporter.confluence.get_settings")
+    def test_page_error_stops_listing(
+        self, mock_get_settings: MagicMock, confluence: MagicMock
+    ) -> None:
+        """Test that a page failing in the middle of a listing stops and closes the listing."""
+        mock_get_settings.return_value.connection_config.max_concurrent_requests = 2
+        mock_get_settings.return_value.export.page_batch_size = 0
+        confluence.get_page_by_id.side_effect = lambda page_id, **_: page_json(
+            page_id, f"Page {page_id}", [1]
+        )
+        failed = threading.Event()
+        closed = threading.Event()
+        listed: list[int] = []
+        exported: list[int] = []
+
+        async def export_page(_engine: object, page: Page) -> None:
+            if page.id == 3:
+                failed.set()
+                msg = "boom 3"
+                raise RuntimeError(msg)
+            exported.append(page.id)
+
+        def listing() -> Iterator[int]:
+            try:
+                for page_id in range(1, 11):
+                    if page_id == 5:
+                        # Keep listing only once the export of page 3 failed
+                        failed.wait(5)
+                    listed.append(page_id)
+                    yield page_id
+            finally:
+                closed.set()
+
+        with (
+            patch("confluence_markdown_exporter.confluence._export_page_async", new=export_page),
+            pytest.raises(RuntimeError, match="boom 3"),
+        ):
+            export_pages(listing())
+
+        assert failed.is_set()
+        assert closed.is_set()
+        assert max(listed) <= 6
+        assert all(page_id < 5 for page_id in exported)
+
+    @patch("confluence_markdown_exporter.confluence.get_settings")
+    def test_stop_requested_starts_no_pages(
+        self, mock_get_settings: MagicMock, confluence: MagicMock
+    ) -> None:
+        """Test that no further pages are exported once Ctrl+C was pressed."""
+        mock_get_settings.return_value.connection_config.max_concurrent_requests = 2
+        mock_get_settings.return_value.export.page_batch_size = 0
+        exported = []
+
+        async def export_page(_engine: object, page: Page) -> None:
+            exported.append(page.id)
+
+        with (
+            patch("confluence_markdown_exporter.confluence._export_page_async", new=export_page),
+            patch("confluence_markdown_exporter.confluence.stop_requested", return_value=True),
+        ):
+            export_pages([2, 3])
+
+        assert exported == []
+        confluence.get_page_by_id.assert_not_called()
+
+
+class TestOrganization:
+    """Test cases for Organization class."""
+
+    def test_from_api_paginates(self, confluence: MagicMock) -> None:
+        """Test that all spaces are listed, following the pagination."""
+        confluence.get_all_spaces.side_effect = [
+            {"results": [SPACE_JSON, SPACE_JSON], "_links": {"next": "/space?start=2"}},
+            {"results": [SPACE_JSON], "_links": {}},
+        ]
+        Organization.from_api.cache_clear()
+
+        org = Organization.from_api()
+
+        assert len(org.spaces) == 3
+        assert confluence.get_all_spaces.call_args.kwargs["start"] == 2
+        Organization.from_api.cache_clear()
+
+    @patch("confluence_markdown_exporter.confluence.get_settings")
+    def test_export_spaces_concurrently(
+        self, mock_get_settings: MagicMock, confluence: MagicMock
+    ) -> None:
+        """Test that spaces are exported concurrently and a failed space does not stop others."""
+        mock_get_settings.return_value.connection_config.max_concurrent_requests = 4
+        mock_get_settings.return_value.export.concurrent_spaces = 2
+        org = Organization(
+            spaces=[Space(key=key, name=key, description="", homepage=0) for key in "ABC"]
+        )
+        running: list[str] = []
+        max_running = 0
+
+        async def export_pages(listing: PageListing, *_: object, **__: object) -> None:
+            nonlocal max_running
+            running.append(listing.spaces[0])
+            max_running = max(max_running, len(running))
+            await asyncio.sleep(0.01)
+            running.remove(listing.spaces[0])
+            if listing.spaces == ["B"]:
+                msg = "B failed"
+                raise RuntimeError(msg)
+
+        with (
+            patch("confluence_markdown_exporter.confluence.export_pages_async", new=export_pages),
+            pytest.raises(RuntimeError, match="B failed"),
+        ):
+            org.export()
+
+        assert max_running == 2
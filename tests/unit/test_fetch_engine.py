@@ -0,0 +1,108 @@
+"""Unit tests for fetch_engine module."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from confluence_markdown_exporter.fetch_engine import FetchEngine
+
+
+class ConcurrencyTracker:
+    """Blocking callable that records how many calls run at the same time."""
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.running = 0
+        self.max_running = 0
+
+    def __call__(self, value: int) -> int:
+        with self.lock:
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        time.sleep(0.02)
+        with self.lock:
+            self.running -= 1
+        return value * 2
+
+
+class TestFetchEngine:
+    """Test cases for FetchEngine class."""
+
+    def test_run_returns_results(self) -> None:
+        """Test that results of the blocking calls are returned in order."""
+
+        async def main() -> list[int]:
+            async with FetchEngine(4) as engine:
+                return await asyncio.gather(*(engine.run(lambda x: x + 1, i) for i in range(5)))
+
+        assert asyncio.run(main()) == [1, 2, 3, 4, 5]
+
+    def test_concurrency_is_bounded(self) -> None:
+        """Test that no more than max_concurrency calls run at the same time."""
+        tracker = ConcurrencyTracker()
+
+        async def main() -> None:
+            async with FetchEngine(3) as engine:
+                await asyncio.gather(*(engine.run(tracker, i) for i in range(12)))
+
+        asyncio.run(main())
+
+        assert tracker.max_running == 3
+
+    def test_calls_run_in_parallel(self) -> None:
+        """Test that blocking calls overlap instead of running one after another."""
+        tracker = ConcurrencyTracker()
+
+        async def main() -> None:
+            async with FetchEngine(8) as engine:
+                await asyncio.gather(*(engine.run(tracker, i) for i in range(8)))
+
+        start = time.perf_counter()
+        asyncio.run(main())
+
+        assert time.perf_counter() - start < 8 * 0.02
+
+    def test_exceptions_are_propagated(self) -> None:
+        """Test that errors raised in a worker thread reach the caller."""
+
+        def fail() -> None:
+            msg = "boom"
+            raise RuntimeError(msg)
+
+        async def main() -> None:
+            async with FetchEngine(2) as engine:
+                await engine.run(fail)
+
+        with pytest.raises(RuntimeError, match="boom"):
+            asyncio.run(main())
+
+    def test_run_outside_context(self) -> None:
+        """Test that the engine cannot be used without entering it."""
+        with pytest.raises(RuntimeError, match="async context manager"):
+            asyncio.run(FetchEngine(2).run(int))
+
+    def test_invalid_concurrency(self) -> None:
+        """Test that a concurrency below one is rejected."""
+        with pytest.raises(ValueError, match="at least 1"):
+            FetchEngine(0)
+
+    def test_submit_shares_the_budget(self) -> None:
+        """Test that calls submitted from other threads count against max_concurrency."""
+        tracker = ConcurrencyTracker()
+
+        def submit_all(engine: FetchEngine) -> list[int]:
+            futures = [engine.submit(tracker, i) for i in range(6)]
+            return [future.result() for future in futures]
+
+        async def main() -> list[int]:
+            async with FetchEngine(2) as engine:
+                submitted = asyncio.to_thread(submit_all, engine)
+                results = await asyncio.gather(
+                    submitted, *(engine.run(tracker, i) for i in range(6))
+                )
+                return results[0]
+
+        assert asyncio.run(main()) == [0, 2, 4, 6, 8, 10]
+        assert tracker.max_running == 2
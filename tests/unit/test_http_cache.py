@@ -0,0 +1,149 @@
+"""Unit tests for http_cache module."""
+
+import os
+import threading
+from collections.abc import Generator
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+from pathlib import Path
+from typing import ClassVar
+
+import pytest
+import requests
+
+from confluence_markdown_exporter.http_cache import HttpCache
+from confluence_markdown_exporter.transport import PooledHTTPAdapter
+
+
+class ETagHandler(BaseHTTPRequestHandler):
+    """Serve a fixed body with an ETag and answer matching conditional requests with 304."""
+
+    body = b'{"id": "123"}'
+    etag = '"v1"'
+    requests_seen: ClassVar[list[dict[str, str]]] = []
+
+    def do_GET(self) -> None:
+        self.requests_seen.append(dict(self.headers))
+        if self.headers.get("If-None-Match") == self.etag:
+            self.send_response(304)
+            self.send_header("ETag", self.etag)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("ETag", self.etag)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(self.body)))
+        self.end_headers()
+        self.wfile.write(self.body)
+
+    def log_message(self, *_args: object) -> None:
+        pass
+
+
+@pytest.fixture
+def server_url() -> Generator[str, None, None]:
+    ETagHandler.requests_seen = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), ETagHandler)
+    thread = threading.Thread(target=server.serve_forever, args=(0.01,), daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}/rest/api/content/123"
+    server.shutdown()
+    server.server_close()
+
+
+def make_response(body: bytes, **headers: str) -> requests.Response:
+    response = requests.Response()
+    response.status_code = 200
+    response.headers.update(headers)
+    response._content = body
+    return response
+
+
+def cached_session(cache: HttpCache) -> requests.Session:
+    session = requests.Session()
+    session.mount("http://", PooledHTTPAdapter(timeout=(5, 5), cache=cache))
+    return session
+
+
+class TestHttpCache:
+    """Test cases for HttpCache class."""
+
+    def test_revalidates_with_etag(self, tmp_path: Path, server_url: str) -> None:
+        """Test that a repeated request is revalidated and answered from the cache."""
+        session = cached_session(HttpCache(tmp_path))
+
+        first = session.get(server_url)
+        second = session.get(server_url)
+
+        assert first.json() == second.json() == {"id": "123"}
+        assert second.status_code == 200
+        assert second.headers["Content-Type"] == "application/json"
+        assert "If-None-Match" not in ETagHandler.requests_seen[0]
+        assert ETagHandler.requests_seen[1]["If-None-Match"] == '"v1"'
+
+    def test_cache_persists_across_sessions(self, tmp_path: Path, server_url: str) -> None:
+        """Test that a new process revalidates instead of downloading again."""
+        cached_session(HttpCache(tmp_path)).get(server_url)
+
+        response = cached_session(HttpCache(tmp_path)).get(server_url)
+
+        assert response.content == ETagHandler.body
+        assert ETagHandler.requests_seen[-1]["If-None-Match"] == '"v1"'
+
+    def test_auth_scope_is_part_of_the_key(self, tmp_path: Path, server_url: str) -> None:
+        """Test that cached responses are not shared between different credentials."""
+        cached_session(HttpCache(tmp_path)).get(server_url, auth=("alice", "secret"))
+
+        cached_session(HttpCache(tmp_path)).get(server_url, auth=("bob", "secret"))
+
+        assert "If-None-Match" not in ETagHandler.requests_seen[-1]
+
+    def test_credentials_are_not_stored(self, tmp_path: Path, server_url: str) -> None:
+        """Test that the cache files do not contain the credentials."""
+        cached_session(HttpCache(tmp_path)).get(server_url, auth=("alice", "secret"))
+
+        stored = b"".join(path.read_bytes() for path in tmp_path.rglob("*") if path.is_file())
+        assert b"YWxpY2U6c2VjcmV0" not in stored  # base64 of alice:secret
+
+    def test_responses_without_validators_are_not_stored(self, tmp_path: Path) -> None:
+        """Test that responses without ETag or Last-Modified are not cached."""
+        cache = HttpCache(tmp_path)
+        request = requests.Request("GET", "https://test.atlassian.net/wiki").prepare()
+        response = requests.Response()
+        response.status_code = 200
+        response._content = b"body"
+
+        cache.store(request, response)
+
+        assert cache.lookup(request) is None
+        assert not any(tmp_path.iterdir())
+
+    @pytest.mark.parametrize("cache_control", ["no-store", "private, max-age=0"])
+    def test_uncacheable_responses_are_not_stored(self, tmp_path: Path, cache_control: str) -> None:
+        """Test that responses marked no-store or private are not cached."""
+        cache = HttpCache(tmp_path)
+        request = requests.Request("GET", "https://test.atlassian.net/wiki").prepare()
+        response = make_response(b"body", ETag='"v1"', **{"Cache-Control": cache_control})
+
+        cache.store(request, response)
+
+        assert cache.lookup(request) is None
+
+    def test_least_recently_used_responses_are_evicted(self, tmp_path: Path) -> None:
+        """Test that the cache is kept below its size bound."""
+        cache = HttpCache(tmp_path, max_bytes=10)
+        requests_by_page = {
+            page: requests.Request("GET", f"https://test.atlassian.net/wiki/{page}").prepare()
+            for page in range(3)
+        }
+        cache.store(requests_by_page[0], make_response(b"1234", ETag='"v1"'))
+        cache.store(requests_by_page[1], make_response(b"1234", ETag='"v1"'))
+        for body_path in tmp_path.rglob("*.body"):
+            os.utime(body_path, (0, 0))
+        assert cache.lookup(requests_by_page[0]) is not None
+
+        cache.store(requests_by_page[2], make_response(b"1234", ETag='"v1"'))
+
+        assert cache.lookup(requests_by_page[0]) is not None
+        assert cache.lookup(requests_by_page[1]) is None
+        assert cache.lookup(requests_by_page[2]) is not None
@@ -0,0 +1,138 @@
+"""Unit tests for http_metrics module."""
+
+from datetime import timedelta
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+import requests
+
+from confluence_markdown_exporter.http_metrics import LATENCY_SAMPLES
+from confluence_markdown_exporter.http_metrics import EndpointStats
+from confluence_markdown_exporter.http_metrics import HttpMetrics
+from confluence_markdown_exporter.http_metrics import endpoint_template
+from confluence_markdown_exporter.http_metrics import percentile
+
+
+def make_response(
+    url: str, status_code: int = 200, elapsed: float = 0.1, body: bytes = b"{}", retries: int = 0
+) -> requests.Response:
+    response = requests.Response()
+    response.url = url
+    response.status_code = status_code
+    response.elapsed = timedelta(seconds=elapsed)
+    response._content = body
+    response.request = requests.Request("GET", url).prepare()
+    response.raw = MagicMock()
+    response.raw.retries.history = [MagicMock()] * retries
+    return response
+
+
+class TestEndpointTemplate:
+    """Test cases for endpoint_template function."""
+
+    @pytest.mark.parametrize(
+        ("url", "expected"),
+        [
+            ("https://x.atlassian.net/wiki/rest/api/content/123", "content/{id}"),
+            (
+                "https://x.atlassian.net/wiki/rest/api/content/123/child/attachment?start=50",
+                "content/{id}/child/attachment",
+            ),
+            ("https://x.atlassian.net/wiki/rest/api/content/search?cql=x", "content/search"),
+            ("https://x.atlassian.net/wiki/rest/api/space/MYSPACE", "space/{key}"),
+            ("https://x.atlassian.net/rest/api/2/issue/PROJ-42", "issue/{key}"),
+            ("https://jira.example.com/rest/api/latest/issue/10001", "issue/{id}"),
+            (
+                "https://x.atlassian.net/wiki/download/attachments/123/My%20File.png?version=1",
+                "download/attachments/{id}/{filename}",
+            ),
+            (
+                "https://api.media.atlassian.com/file/0b6a2b3c-1d2e-4f50-8a9b-0c1d2e3f4a5b/binary",
+                "file/{id}/binary",
+            ),
+        ],
+    )
+    def test_templates(self, url: str, expected: str) -> None:
+        """Test that IDs and keys are replaced by placeholders."""
+        assert endpoint_template(url) == expected
+
+
+class TestHttpMetrics:
+    """Test cases for HttpMetrics class."""
+
+    def test_percentile(self) -> None:
+        """Test the nearest-rank percentile."""
+        values = [float(i) for i in range(1, 101)]
+
+        assert percentile(values, 0.5) == 50
+        assert percentile(values, 0.99) == 99
+        assert percentile([], 0.5) == 0
+
+    def test_latency_samples_are_bounded(self) -> None:
+        """Test that only a bounded sample of latencies is kept, with exact totals."""
+        stats = EndpointStats()
+
+        for latency in range(1, 3 * LATENCY_SAMPLES + 1):
+            stats.add_latency(float(latency))
+
+        summary = stats.summary()
+        assert len(stats.latencies) == LATENCY_SAMPLES
+        assert summary["count"] == 3 * LATENCY_SAMPLES
+        assert summary["latency_seconds"]["max"] == 3 * LATENCY_SAMPLES
+        assert summary["latency_seconds"]["total"] == sum(range(1, 3 * LATENCY_SAMPLES + 1))
+
+    def test_summary_groups_by_endpoint(self) -> None:
+        """Test that requests for different IDs are aggregated per endpoint template."""
+        metrics = HttpMetrics()
+        hook = metrics.response_hook("confluence")
+        base = "https://x.atlassian.net/wiki/rest/api/content"
+        hook(make_response(f"{base}/1", elapsed=0.1, body=b"a" * 10))
+        hook(make_response(f"{base}/2", elapsed=0.3, body=b"b" * 5, retries=2))
+        hook(make_response(f"{base}/3", status_code=404, elapsed=0.2))
+
+        (row,) = metrics.summary()
+
+        assert row["service"] == "confluence"
+        assert row["endpoint"] == "content/{id}"
+        assert row["count"] == 3
+        assert row["status_codes"] == {"200": 2, "404": 1}
+        assert row["latency_seconds"]["p50"] == 0.2
+        assert row["latency_seconds"]["p99"] == 0.3
+        assert row["bytes"] == 17
+        assert row["retries"] == 2
+
+    def test_streamed_body_is_not_read(self) -> None:
+        """Test that streamed responses are measured by their Content-Length header."""
+        metrics = HttpMetrics()
+        response = make_response("https://x.atlassian.net/wiki/download/attachments/1/a.png")
+        response._content = False
+        response.headers["Content-Length"] = "2048"
+
+        metrics.response_hook("confluence")(response, stream=True)
+
+        assert metrics.summary()[0]["bytes"] == 2048
+        assert response._content is False
+
+    def test_slowest_endpoint_first(self) -> None:
+        """Test that the summary is sorted by total latency."""
+        metrics = HttpMetrics()
+        metrics.record("jira", make_response("https://x/rest/api/2/issue/PROJ-1", elapsed=0.1))
+        metrics.record("confluence", make_response("https://x/wiki/rest/api/user", elapsed=2))
+
+        assert [row["endpoint"] for row in metrics.summary()] == ["user", "issue/{key}"]
+
+    def test_write_prometheus(self, tmp_path: Path) -> None:
+        """Test the Prometheus text format output."""
+        metrics = HttpMetrics()
+        metrics.record("confluence", make_response("https://x/wiki/rest/api/content/1"))
+        path = tmp_path / "cme.prom"
+
+        metrics.write_prometheus(path)
+
+        text = path.read_text()
+        labels = 'service="confluence",method="GET",endpoint="content/{id}"'
+        assert f'cme_http_requests_total{{{labels},status="200"}} 1' in text
+        assert f'cme_http_request_duration_seconds{{{labels},quantile="0.95"}} 0.1' in text
+        assert f"cme_http_response_bytes_total{{{labels}}} 2" in text
+        assert "# TYPE cme_http_retries_total counter" in text
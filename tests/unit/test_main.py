@@ -6,6 +6,7 @@ from unittest.mock import patch
 
 import pytest
 import typer
+from typer.testing import CliRunner
 
 from confluence_markdown_exporter.main import app
 from confluence_markdown_exporter.main import config
@@ -16,20 +17,20 @@ from confluence_markdown_exporter.main import version
 class TestOverrideOutputPathConfig:
     """Test cases for override_output_path_config function."""
 
-    @patch("confluence_markdown_exporter.main.set_setting")
-    def test_with_path_value(self, mock_set_setting: MagicMock) -> None:
-        """Test setting output path when value is provided."""
+    @patch("confluence_markdown_exporter.utils.app_data_store.override_setting")
+    def test_with_path_value(self, mock_override_setting: MagicMock) -> None:
+        """Test overriding output path when value is provided."""
         test_path = Path("/test/output")
         override_output_path_config(test_path)
 
-        mock_set_setting.assert_called_once_with("export.output_path", test_path)
+        mock_override_setting.assert_called_once_with("export.output_path", test_path)
 
-    @patch("confluence_markdown_exporter.main.set_setting")
-    def test_with_none_value(self, mock_set_setting: MagicMock) -> None:
-        """Test that None value doesn't call set_setting."""
+    @patch("confluence_markdown_exporter.utils.app_data_store.override_setting")
+    def test_with_none_value(self, mock_override_setting: MagicMock) -> None:
+        """Test that None value doesn't call override_setting."""
         override_output_path_config(None)
 
-        mock_set_setting.assert_not_called()
+        mock_override_setting.assert_not_called()
 
 
 class TestVersionCommand:
@@ -77,7 +78,7 @@ class TestAppConfiguration:
     # and its dependencies. For full test coverage, these should be
     # implemented as integration tests with proper test fixtures.
 
-    @patch("confluence_markdown_exporter.main.get_settings")
+    @patch("confluence_markdown_exporter.utils.app_data_store.get_settings")
     def test_config_show_command(
         self,
         mock_get_settings: MagicMock,
@@ -96,16 +97,78 @@ class TestAppConfiguration:
         assert "```" in captured.out
         mock_settings.model_dump_json.assert_called_once_with(indent=2)
 
-    @patch("confluence_markdown_exporter.main.main_config_menu_loop")
+    @patch("confluence_markdown_exporter.utils.config_interactive.main_config_menu_loop")
     def test_config_interactive_command(self, mock_menu_loop: MagicMock) -> None:
         """Test config command in interactive mode."""
         config(None, show=False)
 
         mock_menu_loop.assert_called_once_with(None)
 
-    @patch("confluence_markdown_exporter.main.main_config_menu_loop")
+    @patch("confluence_markdown_exporter.utils.config_interactive.main_config_menu_loop")
     def test_config_jump_to_option(self, mock_menu_loop: MagicMock) -> None:
         """Test config command with jump_to option."""
         config("auth.confluence", show=False)
 
         mock_menu_loop.assert_called_once_with("auth.confluence")
+
+
+class TestMetricsOptions:
+    """Test cases for the request metrics options."""
+
+    @patch("confluence_markdown_exporter.http_metrics.http_metrics")
+    def test_metrics_written_after_command(self, mock_metrics: MagicMock, tmp_path: Path) -> None:
+        """Test that the metrics files are written when the command finishes."""
+        metrics_file = tmp_path / "metrics.json"
+        prometheus_file = tmp_path / "cme.prom"
+
+        result = CliRunner().invoke(
+            app,
+            [
+                "--metrics-file",
+                str(metrics_file),
+                "--prometheus-file",
+                str(prometheus_file),
+                "version",
+            ],
+        )
+
+        assert result.exit_code == 0
+        mock_metrics.write_json.assert_called_once_with(metrics_file)
+        mock_metrics.write_prometheus.assert_called_once_with(prometheus_file)
+
+    @patch("confluence_markdown_exporter.http_metrics.http_metrics")
+    def test_no_metrics_by_default(self, mock_metrics: MagicMock) -> None:
+        """Test that no metrics are written without the options."""
+        result = CliRunner().invoke(app, ["version"], env={})
+
+        assert result.exit_code == 0
+        mock_metrics.write_json.assert_not_called()
+
+
+class TestFinishExports:
+    """Test cases for dropping the export journal at the end of a command."""
+
+    @patch("confluence_markdown_exporter.confluence.finish_exports")
+    @patch("confluence_markdown_exporter.confluence.Space")
+    def test_journal_dropped_once_per_command(
+        self, mock_space: MagicMock, mock_finish_exports: MagicMock
+    ) -> None:
+        """Test that the journal is dropped once after all spaces of a command."""
+        result = CliRunner().invoke(app, ["spaces", "A", "B"])
+
+        assert result.exit_code == 0
+        assert mock_space.from_key.return_value.export.call_count == 2
+        mock_finish_exports.assert_called_once_with()
+
+    @patch("confluence_markdown_exporter.confluence.finish_exports")
+    @patch("confluence_markdown_exporter.confluence.Space")
+    def test_journal_kept_after_interrupt(
+        self, mock_space: MagicMock, mock_finish_exports: MagicMock
+    ) -> None:
+        """Test that the journal is kept for a resumed command if a space was interrupted."""
+        mock_space.from_key.return_value.export.side_effect = [None, KeyboardInterrupt]
+
+        result = CliRunner().invoke(app, ["spaces", "A", "B"])
+
+        assert result.exit_code != 0
+        mock_finish_exports.assert_not_called()
@@ -0,0 +1,148 @@
+"""Unit tests for manifest module."""
+
+from pathlib import Path
+
+from confluence_markdown_exporter.manifest import JOURNAL_FILENAME
+from confluence_markdown_exporter.manifest import MANIFEST_FILENAME
+from confluence_markdown_exporter.manifest import ExportManifest
+from confluence_markdown_exporter.manifest import ManifestAttachment
+
+
+class TestExportManifest:
+    """Test cases for ExportManifest class."""
+
+    def test_load_without_manifest(self, tmp_path: Path) -> None:
+        """Test that an output directory without manifest starts an empty one."""
+        assert ExportManifest.load(tmp_path).pages == {}
+
+    def test_load_unreadable_manifest(self, tmp_path: Path) -> None:
+        """Test that a corrupt manifest is ignored."""
+        (tmp_path / MANIFEST_FILENAME).write_text("{not json")
+
+        assert ExportManifest.load(tmp_path).pages == {}
+
+    def test_save_and_load(self, tmp_path: Path) -> None:
+        """Test that recorded pages survive a save and load."""
+        manifest = ExportManifest.load(tmp_path)
+        manifest.record(1, 3, Path("TEST/Home.md"), "# Home")
+        manifest.save()
+
+        entry = ExportManifest.load(tmp_path).pages[1]
+        assert entry.version == 3
+        assert entry.export_path == "TEST/Home.md"
+        assert len(entry.content_hash) == 64
+        assert not list(tmp_path.glob("*.tmp"))
+
+    def test_is_current(self, tmp_path: Path) -> None:
+        """Test that only pages exported in the listed version with an existing file are current."""
+        manifest = ExportManifest.load(tmp_path)
+        manifest.record(1, 3, Path("Home.md"), "# Home")
+        manifest.record(2, 1, Path("Deleted.md"), "# Deleted")
+        (tmp_path / "Home.md").write_text("# Home")
+
+        assert manifest.is_current(1, 3)
+        assert not manifest.is_current(1, 4)
+        assert not manifest.is_current(1, None)
+        assert not manifest.is_current(2, 1)
+        assert not manifest.is_current(3, 1)
+
+    def test_relocate_moves_page_and_attachments(self, tmp_path: Path) -> None:
+        """Test that moved files are renamed and the directories left empty are removed."""
+        manifest = ExportManifest.load(tmp_path)
+        attachment = ManifestAttachment(export_path="Old/attachments/a.png")
+        manifest.record(1, 1, Path("Old/Page.md"), "# Page", [attachment])
+        (tmp_path / "Old/attachments").mkdir(parents=True)
+        (tmp_path / "Old/Page.md").write_text("# Page")
+        (tmp_path / "Old/attachments/a.png").write_bytes(b"png")
+
+        moved = manifest.relocate(1, Path("New/Page.md"), [Path("New/attachments/a.png")])
+
+        assert moved == {
+            Path("Old/Page.md"): Path("New/Page.md"),
+            Path("Old/attachments/a.png"): Path("New/attachments/a.png"),
+        }
+        assert (tmp_path / "New/attachments/a.png").read_bytes() == b"png"
+        assert not (tmp_path / "Old").exists()
+        assert manifest.pages[1].attachments[0].export_path == "New/attachments/a.png"
+
+    def test_relocate_keeps_existing_files(self, tmp_path: Path) -> None:
+        """Test that a file at the new path is not overwritten."""
+        manifest = ExportManifest.load(tmp_path)
+        manifest.record(1, 1, Path("Old.md"), "# Old")
+        (tmp_path / "Old.md").write_text("# Old")
+        (tmp_path / "New.md").write_text("# New")
+
+        assert manifest.relocate(1, Path("New.md"), []) == {}
+        assert (tmp_path / "Old.md").exists()
+        assert manifest.pages[1].export_path == "Old.md"
+
+    def test_rewrite_links(self, tmp_path: Path) -> None:
+        """Test that only links to moved files are rewritten in pages that were not moved."""
+        content = "[A](Old%20Page.md) [B](/Old%20Page.md#top) [C](Other.md) ![D](img.png)"
+        manifest = ExportManifest.load(tmp_path)
+        manifest.record(1, 1, Path("Index.md"), content)
+        manifest.record(2, 1, Path("Skipped.md"), "[A](Old%20Page.md)")
+        (tmp_path / "Index.md").write_text(content)
+        (tmp_path / "Skipped.md").write_text("[A](Old%20Page.md)")
+
+        manifest.rewrite_links({Path("Old Page.md"): Path("Topic/New Page.md")}, skip={2})
+
+        assert (tmp_path / "Index.md").read_text() == (
+            "[A](Topic/New%20Page.md) [B](/Topic/New%20Page.md#top) [C](Other.md) ![D](img.png)"
+        )
+        assert (tmp_path / "Skipped.md").read_text() == "[A](Old%20Page.md)"
+        assert manifest.pages[1].content_hash != manifest.pages[2].content_hash
+
+    def test_rewrite_links_with_parentheses(self, tmp_path: Path) -> None:
+        """Test that link targets with parentheses in file names are rewritten whole."""
+        content = "[N](A/Notes%20(2023).md) [W](https://x.org/wiki/A_(b))"
+        manifest = ExportManifest.load(tmp_path)
+        manifest.record(1, 1, Path("S/Index.md"), content)
+        (tmp_path / "S").mkdir()
+        (tmp_path / "S/Index.md").write_text(content)
+
+        manifest.rewrite_links({Path("S/A/Notes (2023).md"): Path("S/B/Notes (2023).md")})
+
+        assert (tmp_path / "S/Index.md").read_text() == (
+            "[N](B/Notes%20(2023).md) [W](https://x.org/wiki/A_(b))"
+        )
+
+    def test_journal_is_replayed(self, tmp_path: Path) -> None:
+        """Test that pages recorded by an export that did not save the manifest are kept."""
+        manifest = ExportManifest.load(tmp_path)
+        manifest.record(1, 2, Path("Home.md"), "# Home")
+        (tmp_path / "Home.md").write_text("# Home")
+        with (tmp_path / JOURNAL_FILENAME).open("a") as journal:
+            journal.write('{"id": 2, "entry": {"vers')
+
+        resumed = ExportManifest.load(tmp_path)
+
+        assert list(resumed.pages) == [1]
+        assert resumed.pages[1].version == 2
+        assert resumed.is_completed(1)
+        assert not resumed.is_completed(2)
+
+    def test_is_written(self, tmp_path: Path) -> None:
+        """Test that only a recorded file with the same content and path counts as written."""
+        manifest = ExportManifest.load(tmp_path)
+        manifest.record(1, 2, Path("Home.md"), "# Home")
+        manifest.record(2, 1, Path("Deleted.md"), "# Deleted")
+        (tmp_path / "Home.md").write_text("# Home")
+
+        assert manifest.is_written(1, Path("Home.md"), "# Home")
+        assert not manifest.is_written(1, Path("Home.md"), "# Changed")
+        assert not manifest.is_written(1, Path("Moved/Home.md"), "# Home")
+        assert not manifest.is_written(2, Path("Deleted.md"), "# Deleted")
+
+    def test_finish_drops_journal(self, tmp_path: Path) -> None:
+        """Test that a finished export keeps its pages in the manifest only."""
+        manifest = ExportManifest.load(tmp_path)
+        manifest.record(1, 2, Path("Home.md"), "# Home")
+        (tmp_path / "Home.md").write_text("# Home")
+
+        manifest.finish()
+
+        assert not (tmp_path / JOURNAL_FILENAME).exists()
+        resumed = ExportManifest.load(tmp_path)
+        assert list(resumed.pages) == [1]
+        assert not resumed.is_completed(1)
@@ -0,0 +1,118 @@
+"""Unit tests for rate_limiter module."""
+
+import pytest
+
+from confluence_markdown_exporter.rate_limiter import RateLimiter
+from confluence_markdown_exporter.rate_limiter import retry_delay
+
+NOW = 1_700_000_000.0
+
+
+class FakeClock:
+    """Manually advanced clock whose sleep moves time forward."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.sleeps: list[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    return FakeClock()
+
+
+class TestRetryDelay:
+    """Test cases for retry_delay function."""
+
+    @pytest.mark.parametrize(
+        ("headers", "expected"),
+        [
+            ({"Retry-After": "5"}, 5),
+            ({"Retry-After": "Tue, 14 Nov 2023 22:13:30 GMT"}, 10),
+            ({"X-RateLimit-Reset": "2023-11-14T22:13:35Z"}, 15),
+            ({"X-RateLimit-Reset": str(NOW + 20)}, 20),
+            ({"Retry-After": "3", "X-RateLimit-Reset": "2023-11-14T22:13:35Z"}, 3),
+            ({"Retry-After": "2023-11-14T22:00:00Z"}, 0),
+        ],
+        ids=["seconds", "http-date", "iso-reset", "epoch-reset", "precedence", "past"],
+    )
+    def test_parse_headers(self, headers: dict[str, str], expected: float) -> None:
+        """Test that delays are parsed from all supported header formats."""
+        assert retry_delay(headers, now=NOW) == pytest.approx(expected)
+
+    def test_no_headers(self) -> None:
+        """Test that None is returned without rate limit headers."""
+        assert retry_delay({"Content-Type": "application/json"}, now=NOW) is None
+
+    def test_invalid_header_falls_back(self) -> None:
+        """Test that an unparsable Retry-After falls back to X-RateLimit-Reset."""
+        headers = {"Retry-After": "soon", "X-RateLimit-Reset": "7"}
+
+        assert retry_delay(headers, now=NOW) == 7
+
+
+class TestRateLimiter:
+    """Test cases for RateLimiter class."""
+
+    def test_token_bucket_spaces_requests(self, clock: FakeClock) -> None:
+        """Test that requests beyond the burst wait for the refill rate."""
+        limiter = RateLimiter(2, clock=clock, sleep=clock.sleep)
+
+        for _ in range(4):
+            limiter.acquire()
+
+        assert clock.now == pytest.approx(1.0)
+
+    def test_unlimited(self, clock: FakeClock) -> None:
+        """Test that a rate of 0 never waits."""
+        limiter = RateLimiter(0, clock=clock, sleep=clock.sleep)
+
+        for _ in range(100):
+            limiter.acquire()
+
+        assert clock.sleeps == []
+
+    def test_pause_blocks_all_requests(self, clock: FakeClock) -> None:
+        """Test that a pause delays the next request even with the bucket disabled."""
+        limiter = RateLimiter(0, clock=clock, sleep=clock.sleep)
+
+        limiter.pause(5)
+        limiter.acquire()
+
+        assert clock.now == pytest.approx(5)
+
+    def test_pause_is_capped(self, clock: FakeClock) -> None:
+        """Test that pauses never exceed max_pause_seconds."""
+        limiter = RateLimiter(0, max_pause_seconds=10, clock=clock, sleep=clock.sleep)
+
+        limiter.pause(3600)
+        limiter.acquire()
+
+        assert clock.now == pytest.approx(10)
+
+    def test_overlapping_pauses_keep_the_latest(self, clock: FakeClock) -> None:
+        """Test that a shorter pause does not cut an active longer pause short."""
+        limiter = RateLimiter(0, clock=clock, sleep=clock.sleep)
+
+        limiter.pause(8)
+        limiter.pause(2)
+        limiter.acquire()
+
+        assert clock.now == pytest.approx(8)
+
+    def test_no_burst_after_pause(self, clock: FakeClock) -> None:
+        """Test that requests are spaced out again right after a pause."""
+        limiter = RateLimiter(4, clock=clock, sleep=clock.sleep)
+
+        limiter.pause(1)
+        limiter.acquire()
+        limiter.acquire()
+
+        assert clock.now == pytest.approx(1.25)
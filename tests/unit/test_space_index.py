@@ -0,0 +1,235 @@
+"""Unit tests for space_index module."""
+
+from collections.abc import Generator
+from pathlib import Path
+from unittest.mock import MagicMock
+from unittest.mock import patch
+
+import pytest
+
+from confluence_markdown_exporter import space_index
+from confluence_markdown_exporter.space_index import SpaceAttachmentIndex
+from confluence_markdown_exporter.space_index import SpaceIndexer
+from confluence_markdown_exporter.space_index import SpaceTreeIndex
+from confluence_markdown_exporter.space_index import attachments_indexed
+from confluence_markdown_exporter.space_index import clear_space_indexes
+from confluence_markdown_exporter.space_index import find_indexed_attachments
+from confluence_markdown_exporter.space_index import find_indexed_page
+from confluence_markdown_exporter.space_index import load_attachment_index
+from confluence_markdown_exporter.space_index import load_space_index
+from confluence_markdown_exporter.utils.app_data_store import ConfigModel
+
+LISTING = [
+    {"id": "1", "title": "Home", "ancestors": []},
+    {"id": "2", "title": "Parent", "ancestors": [{"id": "1"}]},
+    {"id": "3", "title": "Child", "ancestors": [{"id": "1"}, {"id": "2"}]},
+    {"id": "4", "title": "Sibling", "ancestors": [{"id": "1"}, {"id": "2"}]},
+]
+
+ATTACHMENTS = [
+    {"id": "att1", "title": "a.png", "container": {"id": "2"}},
+    {"id": "att2", "title": "b.png", "container": {"id": "3"}},
+    {"id": "att3", "title": "c.png", "container": {"id": "2"}},
+]
+
+
+@pytest.fixture
+def confluence(tmp_path: Path) -> Generator[MagicMock, None, None]:
+    """Patch the Confluence client to list the pages in two batches."""
+    client = MagicMock()
+    client.get.side_effect = [
+        {"results": LISTING[:2], "_links": {"next": "/rest/api/content?start=2"}},
+        {"results": LISTING[2:], "_links": {}},
+    ]
+    clear_space_indexes()
+    with (
+        patch.object(space_index, "get_confluence_instance", return_value=client),
+        patch.object(space_index, "SPACE_INDEX_PATH", tmp_path),
+    ):
+        yield client
+    clear_space_indexes()
+
+
+def settings_with_ttl(ttl_seconds: int) -> ConfigModel:
+    settings = ConfigModel()
+    settings.export.space_index_ttl_seconds = ttl_seconds
+    return settings
+
+
+class TestSpaceTreeIndex:
+    """Test cases for SpaceTreeIndex class."""
+
+    def test_tree_structure(self) -> None:
+        """Test that parents, children and depth are derived from the listing."""
+        index = SpaceTreeIndex.from_listing("TEST", LISTING)
+
+        assert index.pages[2].parent_id == 1
+        assert index.pages[2].children == [3, 4]
+        assert index.pages[3].depth == 2
+        assert index.ancestors(3) == [1, 2]
+        assert index.ancestors(1) == []
+
+    def test_ancestors_of_page_listed_before_its_parent(self) -> None:
+        """Test that the ancestors do not depend on the order in which pages are listed."""
+        index = SpaceTreeIndex(space_key="TEST", built_at=0, pages={})
+        index.add(LISTING[0])
+        index.add(LISTING[2])
+
+        assert index.ancestors(3) == [1, 2]
+        assert index.result(3)["ancestors"] == [{"id": 1}, {"id": 2}]
+
+    def test_from_api_follows_pagination(self, confluence: MagicMock) -> None:
+        """Test that all pages of the space are listed in one paginated request chain."""
+        index = SpaceTreeIndex.from_api("TEST")
+
+        assert sorted(index.pages) == [1, 2, 3, 4]
+        assert confluence.get.call_count == 2
+        assert confluence.get.call_args_list[0].kwargs["params"]["expand"] == "ancestors,version"
+
+
+class TestLoadSpaceIndex:
+    """Test cases for load_space_index function."""
+
+    @patch.object(space_index, "get_settings", return_value=settings_with_ttl(0))
+    def test_registered_for_lookups(
+        self, mock_get_settings: MagicMock, confluence: MagicMock
+    ) -> None:
+        """Test that a loaded index answers page lookups and is built only once."""
+        load_space_index("TEST")
+        load_space_index("TEST")
+
+        found = find_indexed_page(3)
+        assert found is not None
+        assert found[1].title == "Child"
+        assert find_indexed_page(99) is None
+        assert confluence.get.call_count == 2
+
+    @patch.object(space_index, "get_settings", return_value=settings_with_ttl(3600))
+    def test_persisted_index_is_not_reused_for_listing(
+        self, mock_get_settings: MagicMock, confluence: MagicMock, tmp_path: Path
+    ) -> None:
+        """Test that a later run lists the space again and persists the new index."""
+        load_space_index("TEST")
+        clear_space_indexes()
+        confluence.get.reset_mock()
+        confluence.get.side_effect = [{"results": LISTING[:3], "_links": {}}]
+
+        index = load_space_index("TEST")
+
+        assert sorted(index.pages) == [1, 2, 3]
+        assert confluence.get.call_count == 1
+        assert len(list(tmp_path.glob("*.json"))) == 1
+
+
+class TestSpaceIndexer:
+    """Test cases for SpaceIndexer class."""
+
+    @patch.object(space_index, "get_settings", return_value=settings_with_ttl(0))
+    def test_pages_indexed_while_listed(
+        self, mock_get_settings: MagicMock, confluence: MagicMock
+    ) -> None:
+        """Test that listed pages resolve from the index before the listing is complete."""
+        confluence.get.side_effect = [
+            {"results": LISTING[:2], "totalSize": 4, "_links": {"next": "/search?cursor=x"}},
+            {"results": LISTING[2:], "_links": {}},
+        ]
+        indexer = SpaceIndexer("TEST")
+        page_ids = iter(indexer)
+
+        assert [next(page_ids), next(page_ids)] == [1, 2]
+        assert indexer.total == 4
+        assert find_indexed_page(2) is not None
+        assert find_indexed_page(3) is None
+        assert list(page_ids) == [3, 4]
+        assert load_space_index("TEST").pages[2].children == [3, 4]
+        assert confluence.get.call_args_list[0].kwargs["params"]["cql"] == (
+            'space="TEST" AND type=page'
+        )
+
+    @patch.object(space_index, "get_settings", return_value=settings_with_ttl(3600))
+    def test_persisted_index_resolves_unlisted_pages(
+        self, mock_get_settings: MagicMock, confluence: MagicMock
+    ) -> None:
+        """Test that the persisted index only resolves pages that are not listed yet."""
+        load_space_index("TEST")
+        clear_space_indexes()
+        added = {"id": "5", "title": "New", "ancestors": [{"id": "1"}]}
+        confluence.get.side_effect = [
+            {"results": LISTING[:2], "_links": {"next": "/search?cursor=x"}},
+            {"results": [LISTING[2], added], "_links": {}},
+        ]
+        page_ids = iter(SpaceIndexer("TEST"))
+
+        assert [next(page_ids), next(page_ids)] == [1, 2]
+        found = find_indexed_page(3)
+        assert found is not None
+        assert found[1].title == "Child"
+        assert list(page_ids) == [3, 5]
+        assert find_indexed_page(4) is None
+        assert find_indexed_page(5) is not None
+
+    @patch.object(space_index, "get_settings", return_value=settings_with_ttl(0))
+    def test_partial_index_dropped_on_error(
+        self, mock_get_settings: MagicMock, confluence: MagicMock
+    ) -> None:
+        """Test that an index of a failed listing is not used for lookups."""
+        confluence.get.side_effect = [
+            {"results": LISTING[:2], "_links": {"next": "/search?cursor=x"}},
+            ConnectionError("reset"),
+        ]
+
+        with pytest.raises(ConnectionError):
+            list(SpaceIndexer("TEST"))
+
+        assert find_indexed_page(1) is None
+
+
+class TestSpaceAttachmentIndex:
+    """Test cases for SpaceAttachmentIndex class."""
+
+    def test_grouped_by_container(self) -> None:
+        """Test that attachments are grouped by the ID of their page."""
+        index = SpaceAttachmentIndex.from_listing("TEST", ATTACHMENTS)
+
+        assert [att["id"] for att in index.attachments[2]] == ["att1", "att3"]
+        assert [att["id"] for att in index.attachments[3]] == ["att2"]
+
+    def test_from_api_searches_space(self, confluence: MagicMock) -> None:
+        """Test that the attachments are searched with CQL, following the pagination."""
+        confluence.get.side_effect = [
+            {"results": ATTACHMENTS[:1], "_links": {"next": "/rest/api/search?cursor=x"}},
+            {"results": ATTACHMENTS[1:], "_links": {}},
+        ]
+
+        index = SpaceAttachmentIndex.from_api("TEST")
+
+        params = confluence.get.call_args_list[0].kwargs["params"]
+        assert params["cql"] == 'type=attachment AND space="TEST"'
+        assert "container" in params["expand"]
+        assert sorted(index.attachments) == [2, 3]
+
+    def test_find_indexed_attachments(self, confluence: MagicMock) -> None:
+        """Test that pages of an indexed space without attachments get an empty list."""
+        confluence.get.side_effect = [{"results": ATTACHMENTS, "_links": {}}]
+        load_attachment_index("TEST")
+
+        found = find_indexed_attachments("TEST", 3)
+        assert found is not None
+        assert [att["id"] for att in found] == ["att2"]
+        assert find_indexed_attachments("TEST", 4) == []
+        assert find_indexed_attachments("OTHER", 3) is None
+
+    @patch.object(space_index, "get_settings", return_value=settings_with_ttl(0))
+    def test_attachments_indexed(self, mock_get_settings: MagicMock, confluence: MagicMock) -> None:
+        """Test that pages count as attachment-indexed only once their space's index loaded."""
+        confluence.get.side_effect = [
+            {"results": LISTING, "_links": {}},
+            {"results": ATTACHMENTS, "_links": {}},
+        ]
+        load_space_index("TEST")
+        assert not attachments_indexed(3)
+
+        load_attachment_index("TEST")
+
+        assert attachments_indexed(3)
+        assert not attachments_indexed(99)
@@ -0,0 +1,152 @@
+"""Unit tests for transport module."""
+
+from unittest.mock import MagicMock
+from unittest.mock import patch
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
+
+from confluence_markdown_exporter.rate_limiter import RateLimiter
+from confluence_markdown_exporter.transport import HttpTransport
+from confluence_markdown_exporter.transport import PooledHTTPAdapter
+from confluence_markdown_exporter.transport import SharedRetry
+from confluence_markdown_exporter.transport import build_retry
+from confluence_markdown_exporter.transport import get_transport
+from confluence_markdown_exporter.utils.app_data_store import ConnectionConfig
+
+
+class TestPooledHTTPAdapter:
+    """Test cases for PooledHTTPAdapter class."""
+
+    def test_pool_options(self) -> None:
+        """Test that the pool is sized as configured."""
+        adapter = PooledHTTPAdapter(timeout=(1, 2), pool_maxsize=3, pool_block=True)
+
+        assert adapter.poolmanager.connection_pool_kw["maxsize"] == 3
+        assert adapter.poolmanager.connection_pool_kw["block"] is True
+
+    @patch.object(HTTPAdapter, "send")
+    def test_configured_timeout_replaces_request_timeout(self, mock_send: MagicMock) -> None:
+        """Test that the configured connect/read timeouts are used for every request."""
+        adapter = PooledHTTPAdapter(timeout=(5, 30))
+        request = requests.Request("GET", "https://test.atlassian.net/wiki").prepare()
+
+        adapter.send(request, timeout=75)
+
+        assert mock_send.call_args.kwargs["timeout"] == (5, 30)
+
+    @patch.object(HTTPAdapter, "send")
+    def test_rate_limited_response_pauses_limiter(self, mock_send: MagicMock) -> None:
+        """Test that a final 429 response pauses the other workers."""
+        response = requests.Response()
+        response.status_code = 429
+        response.headers["Retry-After"] = "7"
+        mock_send.return_value = response
+        rate_limiter = MagicMock(spec=RateLimiter)
+        adapter = PooledHTTPAdapter(timeout=(5, 30), rate_limiter=rate_limiter)
+
+        adapter.send(requests.Request("GET", "https://test.atlassian.net/wiki").prepare())
+
+        rate_limiter.acquire.assert_called_once()
+        rate_limiter.pause.assert_called_once_with(7)
+
+
+class TestBuildRetry:
+    """Test cases for build_retry function."""
+
+    def test_retry_options(self) -> None:
+        """Test that the retry policy follows the connection config."""
+        config = ConnectionConfig(max_backoff_retries=3, retry_status_codes=[429])
+
+        retry = build_retry(config)
+
+        assert isinstance(retry, Retry)
+        assert retry.status == 3
+        assert retry.status_forcelist == [429]
+        assert retry.respect_retry_after_header
+
+    def test_rate_limiter_is_kept_on_new(self) -> None:
+        """Test that the shared rate limiter survives urllib3 copying the retry state."""
+        rate_limiter = RateLimiter(0)
+        retry = build_retry(ConnectionConfig(), rate_limiter)
+
+        assert isinstance(retry, SharedRetry)
+        assert retry.increment(method="GET", url="/").rate_limiter is rate_limiter
+
+    def test_rate_limited_retry_pauses_all_workers(self) -> None:
+        """Test that a 429 pauses the shared limiter instead of sleeping in one thread."""
+        rate_limiter = MagicMock(spec=RateLimiter)
+        retry = SharedRetry(total=3, rate_limiter=rate_limiter)
+        response = MagicMock(status=429, headers={"Retry-After": "4"})
+
+        with patch("time.sleep") as mock_sleep:
+            retry.sleep(response)
+
+        rate_limiter.pause.assert_called_once_with(4)
+        rate_limiter.acquire.assert_called_once()
+        mock_sleep.assert_not_called()
+
+    def test_other_errors_use_backoff(self) -> None:
+        """Test that non rate limit errors keep the regular per-thread backoff."""
+        rate_limiter = MagicMock(spec=RateLimiter)
+        retry = SharedRetry(total=3, rate_limiter=rate_limiter)
+
+        with patch.object(Retry, "sleep") as mock_sleep:
+            retry.sleep(MagicMock(status=502, headers={}))
+
+        mock_sleep.assert_called_once()
+        rate_limiter.pause.assert_not_called()
+
+    def test_retry_disabled(self) -> None:
+        """Test that no retries are made when backoff and retry is disabled."""
+        assert build_retry(ConnectionConfig(backoff_and_retry=False)) == 0
+
+
+class TestHttpTransport:
+    """Test cases for HttpTransport class."""
+
+    def test_mount_replaces_existing_adapters(self) -> None:
+        """Test that sessions route API and media requests through the shared pools."""
+        transport = HttpTransport(ConnectionConfig())
+        session = requests.Session()
+        session.mount("https://test.atlassian.net", HTTPAdapter())
+
+        transport.mount(session)
+
+        assert session.get_adapter("https://test.atlassian.net/wiki") is transport.api_adapter
+        assert (
+            session.get_adapter("https://api.media.atlassian.com/file/123/binary")
+            is transport.media_adapter
+        )
+        assert session.headers.get("Connection") != "close"
+
+    def test_media_downloads_are_not_cached(self) -> None:
+        """Test that only the API pool uses the HTTP cache."""
+        transport = HttpTransport(ConnectionConfig(http_cache=True))
+
+        assert transport.api_adapter.cache is not None
+        assert transport.media_adapter.cache is None
+
+    def test_sessions_share_adapters(self) -> None:
+        """Test that all mounted sessions share the same connection pools."""
+        transport = HttpTransport(ConnectionConfig())
+        confluence_session = transport.mount(requests.Session())
+        jira_session = transport.mount(requests.Session())
+
+        assert confluence_session.get_adapter("https://a.net") is jira_session.get_adapter(
+            "https://b.net"
+        )
+
+    def test_keep_alive_disabled(self) -> None:
+        """Test that connections are closed after each request if keep-alive is disabled."""
+        transport = HttpTransport(ConnectionConfig(keep_alive=False))
+
+        session = transport.mount(requests.Session())
+
+        assert session.headers["Connection"] == "close"
+
+    def test_get_transport_is_shared_per_config(self) -> None:
+        """Test that the same config yields the same transport."""
+        assert get_transport(ConnectionConfig()) is get_transport(ConnectionConfig())
+        assert get_transport(ConnectionConfig(pool_maxsize=2)).api_adapter._pool_maxsize == 2
@@ -0,0 +1,111 @@
+"""Unit tests for app_data_store module."""
+
+import json
+import os
+from collections.abc import Generator
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from confluence_markdown_exporter.utils import app_data_store
+from confluence_markdown_exporter.utils.app_data_store import ConfigModel
+from confluence_markdown_exporter.utils.app_data_store import clear_overrides
+from confluence_markdown_exporter.utils.app_data_store import get_settings
+from confluence_markdown_exporter.utils.app_data_store import override_setting
+from confluence_markdown_exporter.utils.app_data_store import set_setting
+
+
+@pytest.fixture
+def config_path(tmp_path: Path) -> Generator[Path, None, None]:
+    """Point the app data store at a temporary config file with a fresh snapshot."""
+    path = tmp_path / "app_data.json"
+    with patch.object(app_data_store, "APP_CONFIG_PATH", path):
+        app_data_store._snapshot.invalidate()
+        clear_overrides()
+        yield path
+        clear_overrides()
+    app_data_store._snapshot.invalidate()
+
+
+class TestSettingsSnapshot:
+    """Test cases for the in-memory settings snapshot."""
+
+    def test_defaults_without_config_file(self, config_path: Path) -> None:
+        """Test that defaults are returned when no config file exists."""
+        assert not config_path.exists()
+        assert get_settings() == ConfigModel()
+
+    def test_settings_are_loaded_once(self, config_path: Path) -> None:
+        """Test that repeated calls do not re-read an unchanged config file."""
+        config_path.write_text(json.dumps({"export": {"filename_length": 100}}))
+
+        with patch.object(
+            app_data_store, "_read_config_file", wraps=app_data_store._read_config_file
+        ) as mock_read:
+            first = get_settings()
+            second = get_settings()
+
+        assert first is second
+        assert first.export.filename_length == 100
+        assert mock_read.call_count == 1
+
+    def test_reload_when_file_changes(self, config_path: Path) -> None:
+        """Test that the snapshot is refreshed when the config file is modified."""
+        config_path.write_text(json.dumps({"export": {"filename_length": 100}}))
+        assert get_settings().export.filename_length == 100
+
+        config_path.write_text(json.dumps({"export": {"filename_length": 200}}))
+        stat = config_path.stat()
+        os.utime(config_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        assert get_settings().export.filename_length == 200
+
+    def test_set_setting_updates_snapshot_and_file(self, config_path: Path) -> None:
+        """Test that set_setting persists the value and refreshes the snapshot."""
+        set_setting("export.filename_length", 42)
+
+        assert get_settings().export.filename_length == 42
+        assert json.loads(config_path.read_text())["export"]["filename_length"] == 42
+
+    def test_set_setting_invalid_value(self, config_path: Path) -> None:
+        """Test that invalid values raise ValueError and are not persisted."""
+        with pytest.raises(ValueError, match="filename_length"):
+            set_setting("export.filename_length", "not a number")
+
+        assert not config_path.exists()
+
+
+class TestOverrideSetting:
+    """Test cases for in-memory setting overrides."""
+
+    def test_override_is_not_persisted(self, config_path: Path) -> None:
+        """Test that overrides apply to get_settings without writing the config file."""
+        override_setting("export.output_path", Path("/test/output"))
+
+        assert get_settings().export.output_path == Path("/test/output")
+        assert not config_path.exists()
+
+    def test_override_survives_file_changes(self, config_path: Path) -> None:
+        """Test that overrides are re-applied when the config file is reloaded."""
+        override_setting("export.output_path", Path("/test/output"))
+        set_setting("export.filename_length", 42)
+
+        settings = get_settings()
+        assert settings.export.output_path == Path("/test/output")
+        assert settings.export.filename_length == 42
+        assert "/test/output" not in config_path.read_text()
+
+    def test_invalid_override(self, config_path: Path) -> None:
+        """Test that invalid overrides raise ValueError and leave settings untouched."""
+        with pytest.raises(ValueError, match="filename_length"):
+            override_setting("export.filename_length", "not a number")
+
+        assert get_settings() == ConfigModel()
+
+    def test_clear_overrides(self, config_path: Path) -> None:
+        """Test that clearing overrides restores the persisted settings."""
+        override_setting("export.filename_length", 10)
+        clear_overrides()
+
+        assert get_settings().export.filename_length == ConfigModel().export.filename_length
@@ -110,6 +110,15 @@ class TestSaveFile:
 
             assert file_path.read_text(encoding="utf-8") == new_content
 
+    def test_no_temporary_files_left(self) -> None:
+        """Test that the file is written through a temporary file that is renamed."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_path = Path(temp_dir) / "test.txt"
+
+            save_file(file_path, "Content")
+
+            assert [path.name for path in Path(temp_dir).iterdir()] == ["test.txt"]
+
     def test_invalid_content_type(self) -> None:
         """Test that invalid content type raises TypeError."""
         with tempfile.TemporaryDirectory() as temp_dir:
@@ -122,36 +131,40 @@ class TestSaveFile:
 class TestSanitizeFilename:
     """Test cases for sanitize_filename function."""
 
-    @patch("confluence_markdown_exporter.utils.export.export_options")
-    def test_no_encoding_specified(self, mock_export_options: MagicMock) -> None:
+    @patch("confluence_markdown_exporter.utils.export.get_settings")
+    def test_no_encoding_specified(self, mock_get_settings: MagicMock) -> None:
         """Test sanitizing filename with no encoding specified."""
+        mock_export_options = mock_get_settings.return_value.export
         mock_export_options.filename_encoding = ""
         mock_export_options.filename_length = 255
 
         result = sanitize_filename("Test File.txt")
         assert result == "Test File.txt"
 
-    @patch("confluence_markdown_exporter.utils.export.export_options")
-    def test_with_encoding_mapping(self, mock_export_options: MagicMock) -> None:
+    @patch("confluence_markdown_exporter.utils.export.get_settings")
+    def test_with_encoding_mapping(self, mock_get_settings: MagicMock) -> None:
         """Test sanitizing filename with encoding mapping."""
+        mock_export_options = mock_get_settings.return_value.export
         mock_export_options.filename_encoding = '" ":"_",":":"_"'
         mock_export_options.filename_length = 255
 
         result = sanitize_filename("Test File: Name.txt")
         assert result == "Test_File__Name.txt"
 
-    @patch("confluence_markdown_exporter.utils.export.export_options")
-    def test_trim_trailing_spaces_and_dots(self, mock_export_options: MagicMock) -> None:
+    @patch("confluence_markdown_exporter.utils.export.get_settings")
+    def test_trim_trailing_spaces_and_dots(self, mock_get_settings: MagicMock) -> None:
         """Test that trailing spaces and dots are trimmed."""
+        mock_export_options = mock_get_settings.return_value.export
         mock_export_options.filename_encoding = ""
         mock_export_options.filename_length = 255
 
         result = sanitize_filename("filename . . ")
         assert result == "filename"
 
-    @patch("confluence_markdown_exporter.utils.export.export_options")
-    def test_reserved_windows_names(self, mock_export_options: MagicMock) -> None:
+    @patch("confluence_markdown_exporter.utils.export.get_settings")
+    def test_reserved_windows_names(self, mock_get_settings: MagicMock) -> None:
         """Test that reserved Windows names are handled."""
+        mock_export_options = mock_get_settings.return_value.export
         mock_export_options.filename_encoding = ""
         mock_export_options.filename_length = 255
 
@@ -164,9 +177,10 @@ class TestSanitizeFilename:
             result = sanitize_filename(name.lower())
             assert result == f"{name.lower()}_"
 
-    @patch("confluence_markdown_exporter.utils.export.export_options")
-    def test_filename_length_limit(self, mock_export_options: MagicMock) -> None:
+    @patch("confluence_markdown_exporter.utils.export.get_settings")
+    def test_filename_length_limit(self, mock_get_settings: MagicMock) -> None:
         """Test that filename length is limited."""
+        mock_export_options = mock_get_settings.return_value.export
         mock_export_options.filename_encoding = ""
         mock_export_options.filename_length = 10
 
@@ -175,9 +189,10 @@ class TestSanitizeFilename:
         assert len(result) == 10
         assert result == long_filename[:10]
 
-    @patch("confluence_markdown_exporter.utils.export.export_options")
-    def test_complex_filename_sanitization(self, mock_export_options: MagicMock) -> None:
+    @patch("confluence_markdown_exporter.utils.export.get_settings")
+    def test_complex_filename_sanitization(self, mock_get_settings: MagicMock) -> None:
         """Test complex filename sanitization with multiple rules."""
+        mock_export_options = mock_get_settings.return_value.export
         mock_export_options.filename_encoding = '" ":"_","?":"_",":":"_"'
         mock_export_options.filename_length = 50
 
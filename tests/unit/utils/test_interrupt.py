@@ -0,0 +1,50 @@
+"""Unit tests for interrupt module."""
+
+import signal
+
+import pytest
+
+from confluence_markdown_exporter.utils.interrupt import graceful_interrupt
+from confluence_markdown_exporter.utils.interrupt import stop_requested
+
+
+def run_interrupted(interrupts: int, steps: list[str]) -> None:
+    """Press Ctrl+C the given number of times in a block that records how far it got."""
+    with graceful_interrupt():
+        for _ in range(interrupts):
+            signal.raise_signal(signal.SIGINT)
+        steps.append("stopping" if stop_requested() else "running")
+
+
+class TestGracefulInterrupt:
+    """Test cases for graceful_interrupt context manager."""
+
+    def test_first_interrupt_lets_block_finish(self) -> None:
+        """Test that the block runs to the end and KeyboardInterrupt is raised afterwards."""
+        steps: list[str] = []
+
+        with pytest.raises(KeyboardInterrupt):
+            run_interrupted(1, steps)
+
+        assert steps == ["stopping"]
+        assert not stop_requested()
+        assert signal.getsignal(signal.SIGINT) is signal.default_int_handler
+
+    def test_second_interrupt_aborts(self) -> None:
+        """Test that a second Ctrl+C raises KeyboardInterrupt right away."""
+        steps: list[str] = []
+
+        with pytest.raises(KeyboardInterrupt):
+            run_interrupted(2, steps)
+
+        assert steps == []
+        assert signal.getsignal(signal.SIGINT) is signal.default_int_handler
+
+    def test_without_interrupt(self) -> None:
+        """Test that the block is not affected without Ctrl+C."""
+        steps: list[str] = []
+
+        run_interrupted(0, steps)
+
+        assert steps == ["running"]
+        assert signal.getsignal(signal.SIGINT) is signal.default_int_handler
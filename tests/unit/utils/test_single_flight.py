@@ -0,0 +1,110 @@
+"""Unit tests for single_flight module."""
+
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from confluence_markdown_exporter.utils.single_flight import SingleFlight
+from confluence_markdown_exporter.utils.single_flight import single_flight
+
+
+class BlockingLookup:
+    """Lookup that blocks until released and counts how often it actually ran."""
+
+    def __init__(self) -> None:
+        self.release = threading.Event()
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, key: int) -> dict[str, int]:
+        with self.lock:
+            self.calls += 1
+        self.release.wait(timeout=5)
+        return {"key": key}
+
+
+def run_concurrently(func: functools.partial, count: int, lookup: BlockingLookup) -> list:
+    with ThreadPoolExecutor(max_workers=count) as executor:
+        futures = [executor.submit(func) for _ in range(count)]
+        # Give all threads the chance to join the in-flight call before releasing it
+        threading.Event().wait(0.05)
+        lookup.release.set()
+        return [future.result() for future in futures]
+
+
+class TestSingleFlight:
+    """Test cases for SingleFlight class."""
+
+    def test_concurrent_calls_share_one_call(self) -> None:
+        """Test that concurrent callers for one key receive the result of a single call."""
+        group: SingleFlight[dict[str, int]] = SingleFlight()
+        lookup = BlockingLookup()
+
+        results = run_concurrently(functools.partial(group.do, 1, lambda: lookup(1)), 8, lookup)
+
+        assert lookup.calls == 1
+        assert all(result is results[0] for result in results)
+
+    def test_different_keys_run_separately(self) -> None:
+        """Test that calls for different keys are not coalesced."""
+        group: SingleFlight[int] = SingleFlight()
+
+        assert group.do(1, lambda: 1) == 1
+        assert group.do(2, lambda: 2) == 2
+
+    def test_finished_calls_are_not_cached(self) -> None:
+        """Test that a key is looked up again once its call has finished."""
+        group: SingleFlight[int] = SingleFlight()
+        calls = []
+
+        group.do(1, lambda: calls.append(1))
+        group.do(1, lambda: calls.append(1))
+
+        assert len(calls) == 2
+
+    def test_errors_are_shared(self) -> None:
+        """Test that waiting callers receive the exception of the in-flight call."""
+        group: SingleFlight[None] = SingleFlight()
+        lookup = BlockingLookup()
+
+        def failing_lookup() -> None:
+            lookup(1)
+            msg = "not found"
+            raise LookupError(msg)
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = [executor.submit(group.do, 1, failing_lookup) for _ in range(4)]
+            threading.Event().wait(0.05)
+            lookup.release.set()
+            for future in futures:
+                with pytest.raises(LookupError, match="not found"):
+                    future.result()
+
+        assert lookup.calls == 1
+
+    def test_nested_call_for_same_key(self) -> None:
+        """Test that a nested call for the same key in the same thread does not deadlock."""
+        group: SingleFlight[int] = SingleFlight()
+
+        assert group.do(1, lambda: group.do(1, lambda: 2) + 1) == 3
+
+
+class TestSingleFlightDecorator:
+    """Test cases for single_flight decorator."""
+
+    def test_below_lru_cache(self) -> None:
+        """Test that concurrent cache misses result in a single lookup."""
+        lookup = BlockingLookup()
+
+        @functools.lru_cache(maxsize=10)
+        @single_flight
+        def cached_lookup(key: int) -> dict[str, int]:
+            return lookup(key)
+
+        results = run_concurrently(functools.partial(cached_lookup, 7), 8, lookup)
+
+        assert lookup.calls == 1
+        assert results == [{"key": 7}] * 8
+        assert cached_lookup.cache_info().currsize == 1
@@ -0,0 +1,54 @@
+"""Unit tests for sized_cache module."""
+
+from confluence_markdown_exporter.utils.sized_cache import SizedCache
+
+
+class TestSizedCache:
+    """Test cases for SizedCache class."""
+
+    def test_get_counts_hits_and_misses(self) -> None:
+        """Test that lookups are counted."""
+        cache: SizedCache[str, str] = SizedCache(100, len)
+        cache.put("a", "value")
+
+        assert cache.get("a") == "value"
+        assert cache.get("b") is None
+        assert cache.info()[:2] == (1, 1)
+
+    def test_get_with_kind(self) -> None:
+        """Test that values of another type count as missing."""
+        cache: SizedCache[str, object] = SizedCache(100, lambda _: 1)
+        cache.put("a", "value")
+
+        assert cache.get("a", int) is None
+        assert cache.get("a", str) == "value"
+        assert cache.info()[:2] == (1, 1)
+
+    def test_evicts_least_recently_used(self) -> None:
+        """Test that the least recently used values are evicted to stay within the budget."""
+        cache: SizedCache[str, str] = SizedCache(10, len)
+        cache.put("a", "aaaa")
+        cache.put("b", "bbbb")
+        cache.get("a")
+        cache.put("c", "cccc")
+
+        assert cache.get("b") is None
+        assert cache.get("a") == "aaaa"
+        assert cache.info().size == 8
+
+    def test_replacing_value_updates_size(self) -> None:
+        """Test that putting a key again accounts for the new size only."""
+        cache: SizedCache[str, str] = SizedCache(10, len)
+        cache.put("a", "aaaaaaaa")
+        cache.put("a", "a")
+
+        assert cache.info().size == 1
+        assert cache.info().entries == 1
+
+    def test_value_larger_than_budget_is_not_cached(self) -> None:
+        """Test that a value exceeding the budget is dropped."""
+        cache: SizedCache[str, str] = SizedCache(3, len)
+        cache.put("a", "aaaa")
+
+        assert cache.get("a") is None
+        assert cache.info().size == 0